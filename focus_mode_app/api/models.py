@@ -20,7 +20,10 @@ class BlockedItem(BaseModel):
     )
     type: str = Field(
         ...,
-        description="The category type: 'app' or 'webapp'.",
+        description=(
+            "The rule type: 'app', 'webapp', 'comm', 'glob', 'regex', 'exe', "
+            "'appid' or 'argv'."
+        ),
         json_schema_extra={"example": "app"},
     )
 
@@ -149,3 +152,32 @@ class RestoreResponse(BaseModel):
 
     enabled: bool = Field(..., description="The resulting auto-restore state.")
     message: str = Field(..., description="Human readable context message.")
+
+
+class BatchRequest(BaseModel):
+    """
+    Payload for editing many blocklist items in a single request.
+    """
+
+    add: List[BlockedItem] = Field(
+        default_factory=list, description="Items to add to the blocklist."
+    )
+    remove: List[BlockedItem] = Field(
+        default_factory=list, description="Items to remove from the blocklist."
+    )
+    replace: Optional[List[BlockedItem]] = Field(
+        None,
+        description="If set, the whole blocklist is replaced by these items "
+        "(cannot be combined with 'add' or 'remove').",
+    )
+
+
+class BatchResponse(BaseModel):
+    """
+    Result of a batch edit of the blocklist.
+    """
+
+    added: int = Field(..., description="Number of items actually added.")
+    removed: int = Field(..., description="Number of items actually removed.")
+    total: int = Field(..., description="Number of items in the blocklist afterwards.")
+    message: str = Field(..., description="Human readable context message.")
@@ -10,6 +10,7 @@ Endpoint disponibili:
   POST /api/lock    — attiva focus lock (timer, target time, o HA lock indefinito)
   DELETE /api/lock  — rimuove il focus lock attivo
   POST /api/restore — abilita/disabilita il ripristino automatico app
+  POST /api/items:batch — aggiunge/rimuove/sostituisce più elementi in un colpo solo
 """
 
 from typing import Any
@@ -25,11 +26,17 @@ from focus_mode_app.api.models import (
     LockResponse,
     RestoreRequest,
     RestoreResponse,
+    BatchRequest,
+    BatchResponse,
 )
 from focus_mode_app.api.auth import verify_token
 from focus_mode_app.api.signals import api_action_queue
 from focus_mode_app.api.notifier import notify_state_change
-from focus_mode_app.core.storage import blocked_items
+from focus_mode_app.core.storage import (
+    blocked_items,
+    apply_batch,
+    replace_all,
+)
 from focus_mode_app.core.blocker import get_blocking_stats, is_restore_enabled
 
 
@@ -232,3 +239,49 @@ def set_restore(request: RestoreRequest) -> Any:
         enabled=request.enabled,
         message=f"Auto-restore {'abilitato' if request.enabled else 'disabilitato'}.",
     )
+
+
+# ---------------------------------------------------------------------------- #
+# BLOCKLIST BATCH
+# ---------------------------------------------------------------------------- #
+
+
+@app.post(
+    "/api/items:batch",
+    response_model=BatchResponse,
+    summary="Batch Edit Blocklist",
+    description=(
+        "Aggiunge e rimuove più elementi, oppure sostituisce l'intera blocklist, "
+        "salvando su disco una sola volta."
+    ),
+    dependencies=[Depends(verify_token)],
+)
+def batch_items(request: BatchRequest) -> Any:
+    """
+    Applica la modifica direttamente alla blocklist (thread-safe) e accoda
+    l'aggiornamento della lista mostrata dalla GUI.
+    """
+    if request.replace is not None and (request.add or request.remove):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'replace' non può essere combinato con 'add' o 'remove'.",
+        )
+
+    if request.replace is not None:
+        before = {entry.key for entry in blocked_items}
+        total = replace_all(item.model_dump() for item in request.replace)
+        after = {entry.key for entry in blocked_items}
+        added, removed = len(after - before), len(before - after)
+        message = f"Blocklist sostituita: {total} elementi."
+    else:
+        added, removed = apply_batch(
+            (item.model_dump() for item in request.add),
+            (item.model_dump() for item in request.remove),
+        )
+        total = len(blocked_items)
+        message = f"Aggiunti {added}, rimossi {removed} elementi."
+
+    api_action_queue.put({"action": "refresh_items"})
+    notify_state_change("items_changed", added=added, removed=removed, total=total)
+
+    return BatchResponse(added=added, removed=removed, total=total, message=message)
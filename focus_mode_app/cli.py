@@ -15,7 +15,7 @@ Usage:
     study-mode-cli toggle                  Toggle blocking state
 
     study-mode-cli list-restore            List apps for auto-restore
-    study-mode-cli add-restore <app>       Add an app to auto-restore
+    study-mode-cli add-restore <app> [prio] Add an app to auto-restore
     study-mode-cli remove-restore <app>    Remove an app from auto-restore
     study-mode-cli restore                 Manually restore apps
     study-mode-cli toggle-restore          Toggle auto-restore functionality
@@ -26,14 +26,18 @@ Usage:
     study-mode-cli clear-lock              Manually unlock
 
     study-mode-cli clear                   Clear the blocklist
+    study-mode-cli import <file> [type]    Import a .json/.txt blocklist
+    study-mode-cli export [file]           Export the blocklist (stdout by default)
 """
 
 import sys
 import argparse
+import contextlib
 from rich.console import Console
 
 from focus_mode_app.config import load_config
 from focus_mode_app.core.storage import load_blocked_items
+from focus_mode_app.core.session import session_tracker
 from focus_mode_app.cli.commands import (
     cmd_status,
     cmd_list,
@@ -52,6 +56,8 @@ from focus_mode_app.cli.commands import (
     cmd_lock_status,
     cmd_clear_lock,
     cmd_clear,
+    cmd_import,
+    cmd_export,
 )
 
 console = Console()
@@ -65,9 +71,11 @@ def print_help() -> None:
 [bold]📋 BASIC COMMANDS:[/]
   [green]status[/]              Show current block status
   [green]list[/]                List all blocked elements
-  [green]add[/] <name> <type>   Add element (type: app/webapp)
+  [green]add[/] <name> <type>   Add element (type: app/webapp/comm/glob/regex/exe/appid/argv)
   [green]remove[/] <id|name>    Remove element by index or name
   [green]clear[/]               Clear the blocklist
+  [green]import[/] <file> [type]  Import a .json/.txt list (--replace to overwrite)
+  [green]export[/] [file]        Export the list as .json/.txt (stdout by default)
 
 [bold]🔒 BLOCK COMMANDS:[/]
   [green]start[/]               Activate the block
@@ -76,7 +84,7 @@ def print_help() -> None:
 
 [bold]♻️  RESTORE COMMANDS:[/]
   [green]list-restore[/]        List apps configured for restore
-  [green]add-restore[/] <app>   Add app to auto-restore
+  [green]add-restore[/] <app> \\[priority]  Add app to auto-restore (higher priority first)
   [green]remove-restore[/] <app>  Remove app from auto-restore
   [green]restore[/]             Manually restore apps
   [green]toggle-restore[/]      Enable/disable auto-restore
@@ -90,6 +98,8 @@ def print_help() -> None:
 [bold]📚 EXAMPLES:[/]
   study-mode-cli add firefox app
   study-mode-cli add web.whatsapp.com webapp
+  study-mode-cli add "steam*" glob
+  study-mode-cli add com.discordapp.Discord appid
   study-mode-cli list
   study-mode-cli remove 1
   study-mode-cli start
@@ -98,6 +108,8 @@ def print_help() -> None:
   study-mode-cli set-timer 25
   study-mode-cli set-target-time 14 30
   study-mode-cli lock-status
+  study-mode-cli import team-blocklist.txt webapp
+  study-mode-cli export blocklist.json
 
 [dim]💡 For the graphical interface run: python main.py[/]
     """)
@@ -109,16 +121,25 @@ def main() -> None:
     Loads configuration, parses command-line arguments, and delegates
     work to the respective CLI command functions.
     """
-    load_config()
-    load_blocked_items()
-
     parser = argparse.ArgumentParser(description="Focus Mode App - CLI", add_help=False)
     parser.add_argument("command", nargs="?", help="Command to execute")
     parser.add_argument("args", nargs="*", help="Command arguments")
     parser.add_argument("-h", "--help", action="store_true", help="Show help menu")
+    parser.add_argument(
+        "--replace", action="store_true", help="import: replace the whole list"
+    )
 
     args = parser.parse_args()
 
+    # An export to stdout must contain only the list: startup logs go to stderr
+    to_stdout = (args.command or "").lower() == "export" and (
+        not args.args or args.args[0] == "-"
+    )
+    with contextlib.redirect_stdout(sys.stderr if to_stdout else sys.stdout):
+        load_config()
+        load_blocked_items()
+        session_tracker.load_session()
+
     if args.help or not args.command:
         print_help()
         sys.exit(0)
@@ -176,14 +197,21 @@ def main() -> None:
 
         elif command == "add-restore":
             if len(args.args) < 1:
-                console.print("\n[red]❌ Usage: study-mode-cli add-restore <app>[/]")
+                console.print(
+                    "\n[red]❌ Usage: study-mode-cli add-restore <app> \\[priority][/]"
+                )
                 console.print(
                     "[yellow]Example: study-mode-cli add-restore firefox[/]\n"
                 )
                 sys.exit(1)
 
             app_name = args.args[0]
-            cmd_add_restore(app_name)
+            try:
+                priority = int(args.args[1]) if len(args.args) > 1 else 0
+            except ValueError:
+                console.print("\n[red]❌ Priority must be an integer[/]\n")
+                sys.exit(1)
+            cmd_add_restore(app_name, priority)
 
         elif command == "remove-restore":
             if len(args.args) < 1:
@@ -249,6 +277,22 @@ def main() -> None:
         elif command == "clear":
             cmd_clear()
 
+        elif command == "import":
+            if len(args.args) < 1:
+                console.print(
+                    "\n[red]❌ Usage: study-mode-cli import <file> [type] [--replace][/]"
+                )
+                console.print(
+                    "[yellow]Example: study-mode-cli import team-blocklist.txt webapp[/]\n"
+                )
+                sys.exit(1)
+
+            default_type = args.args[1].lower() if len(args.args) > 1 else "webapp"
+            cmd_import(args.args[0], default_type, replace=args.replace)
+
+        elif command == "export":
+            cmd_export(args.args[0] if args.args else None)
+
         else:
             console.print(f"\n[red]❌ Unknown command: {command}[/]\n")
             print_help()
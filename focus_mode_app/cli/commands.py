@@ -5,16 +5,27 @@ Command-line interface to manage blocked apps, sessions, restore, and focus lock
 Supports both countdown timers and target times for the focus lock.
 """
 
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, Optional, TextIO
+
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import box
 
 from focus_mode_app.core.storage import (
+    blocked_items,
     add_blocked_item,
+    add_many,
+    migrate_old_format,
+    replace_all,
     remove_blocked_item,
+    remove_blocked_item_by_name,
     get_blocked_items,
 )
+from focus_mode_app.core.matcher import RULE_TYPES, validate_rule
 from focus_mode_app.core.blocker import (
     is_blocking_active,
     set_blocking_active,
@@ -89,8 +100,12 @@ def cmd_list() -> None:
     table.add_column("Name/URL", style="white")
 
     for idx, item in enumerate(items, 1):
-        emoji = "📱" if item["type"] == "app" else "🌐"
-        tipo = f"{emoji} App" if item["type"] == "app" else f"{emoji} Webapp"
+        if item["type"] == "app":
+            tipo = "📱 App"
+        elif item["type"] == "webapp":
+            tipo = "🌐 Webapp"
+        else:
+            tipo = f"🎯 {item['type']}"
         table.add_row(str(idx), tipo, item["name"])
 
     console.print()
@@ -116,8 +131,11 @@ def cmd_list_restore() -> None:
         table.add_column("#", style="dim", width=4)
         table.add_column("App", style="cyan")
 
+        table.add_column("Priority", style="magenta", justify="right")
+
         for idx, app_name in enumerate(restore_list.keys(), 1):
-            table.add_row(str(idx), f"♻️ {app_name}")
+            priority = session_tracker.restore_priority(app_name)
+            table.add_row(str(idx), f"♻️ {app_name}", str(priority))
 
         console.print()
         console.print(table)
@@ -136,12 +154,14 @@ def cmd_add(name: str, item_type: str) -> None:
     """Add an element to the blocklist.
 
     Args:
-        name (str): App name or webapp URL.
-        item_type (str): Element type ('app' or 'webapp').
+        name (str): App name, webapp URL or pattern (for the rule types).
+        item_type (str): Element type ('app', 'webapp' or a rule type such
+            as 'comm', 'glob', 'regex', 'exe', 'appid', 'argv').
     """
-    if item_type not in ["app", "webapp"]:
-        console.print(f"\n[red]❌ Invalid type: {item_type}[/]")
-        console.print("[yellow]Use 'app' or 'webapp'[/]\n")
+    error = validate_rule(name, item_type)
+    if error is not None:
+        console.print(f"\n[red]❌ {error}[/]")
+        console.print(f"[yellow]Types: {', '.join(RULE_TYPES)}[/]\n")
         return
 
     if add_blocked_item(name, item_type):
@@ -175,11 +195,9 @@ def cmd_remove(identifier: str) -> None:
     except ValueError:
         pass
 
-    for idx, item in enumerate(items):
-        if item["name"] == identifier:
-            if remove_blocked_item(idx):
-                console.print(f"\n[green]✅ '{identifier}' removed![/]\n")
-                return
+    if remove_blocked_item_by_name(identifier):
+        console.print(f"\n[green]✅ '{identifier}' removed![/]\n")
+        return
 
     console.print(f"\n[red]❌ Element '{identifier}' not found[/]\n")
 
@@ -252,6 +270,10 @@ def cmd_toggle() -> None:
         console.print("\n[green]🔒 Block ACTIVATED[/]\n")
     else:
         console.print("\n[red]🔓 Block DEACTIVATED[/]\n")
+        from focus_mode_app.core.restore import wait_for_restore
+
+        # Auto-restore runs in the background: let it finish before exiting
+        wait_for_restore()
 
 
 # ============================================================================
@@ -259,18 +281,19 @@ def cmd_toggle() -> None:
 # ============================================================================
 
 
-def cmd_add_restore(app_name: str) -> None:
+def cmd_add_restore(app_name: str, priority: int = 0) -> None:
     """Add an app to the automatic restore list.
 
     The app will be restored when the block is deactivated.
 
     Args:
         app_name (str): Name of the app to add to the restore list.
+        priority (int, optional): Apps with a higher priority are restored first.
     """
     try:
         from focus_mode_app.core.session import session_tracker
 
-        session_tracker.add_to_restore(app_name)
+        session_tracker.add_to_restore(app_name, priority)
         console.print(f"\n[green]✅ '{app_name}' added to auto-restore![/]\n")
     except Exception as e:
         console.print(f"\n[red]❌ Error: {e}[/]\n")
@@ -297,7 +320,7 @@ def cmd_restore() -> None:
     Useful to force restore without waiting for block deactivation.
     """
     try:
-        from focus_mode_app.core.restore import restore_all_apps
+        from focus_mode_app.core.restore import start_restore
         from focus_mode_app.core.session import session_tracker
 
         apps = session_tracker.get_killed_apps()
@@ -307,8 +330,40 @@ def cmd_restore() -> None:
             return
 
         console.print(f"\n[cyan]♻️  Restoring {len(apps)} apps...[/]")
-        restored = restore_all_apps()
-        console.print(f"[green]✅ Restored {restored} apps![/]\n")
+        scheduler = start_restore()
+        if scheduler is None:
+            console.print("[yellow]ℹ️  A restore is already running[/]\n")
+            return
+        scheduler.wait()
+
+        table = Table(title="♻️ Restore Report", box=box.ROUNDED)
+        table.add_column("App", style="cyan")
+        table.add_column("Status")
+        table.add_column("Attempts", justify="right")
+        table.add_column("Ready in", justify="right")
+        table.add_column("Details", style="dim")
+
+        styles = {"alive": "green", "crashed": "red", "failed": "red"}
+        for report in scheduler.report():
+            style = styles.get(report.status, "yellow")
+            ready_in = (
+                f"{report.time_to_ready:.1f}s"
+                if report.time_to_ready is not None
+                else "-"
+            )
+            table.add_row(
+                report.name,
+                f"[{style}]{report.status}[/]",
+                str(report.attempts),
+                ready_in,
+                report.message,
+            )
+
+        console.print()
+        console.print(table)
+        console.print(
+            f"[green]✅ Restored {scheduler.restored}/{scheduler.total} apps![/]\n"
+        )
 
     except Exception as e:
         console.print(f"\n[red]❌ Error: {e}[/]\n")
@@ -465,6 +520,110 @@ def cmd_clear() -> None:
         console.print("\n[yellow]Operation cancelled[/]\n")
 
 
+def _iter_text_items(path: Path, default_type: str) -> Iterator[Dict[str, str]]:
+    """Yield the items of a text blocklist, one line at a time.
+
+    Each line holds a name, optionally followed by its type; empty lines and
+    lines starting with '#' are skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split()
+            item_type = parts[1].lower() if len(parts) > 1 else default_type
+            yield {"name": parts[0], "type": item_type}
+
+
+def _iter_json_items(path: Path) -> Iterator[Dict[str, str]]:
+    """Yield the items of a JSON blocklist (current or legacy format)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        data = migrate_old_format(data)
+    if not isinstance(data, list):
+        raise ValueError("a JSON blocklist must be a list of items")
+
+    for item in data:
+        if isinstance(item, dict):
+            yield item
+
+
+def cmd_import(path: str, default_type: str = "webapp", replace: bool = False) -> None:
+    """Import a blocklist from a .json or .txt file.
+
+    The items go straight from the file into the blocklist, which is saved
+    once at the end regardless of their number.
+
+    Args:
+        path (str): The file to import.
+        default_type (str, optional): Type of the .txt lines without one.
+        replace (bool, optional): Replace the blocklist instead of merging.
+    """
+    file_path = Path(path).expanduser()
+    if not file_path.is_file():
+        console.print(f"\n[red]❌ File not found: {file_path}[/]\n")
+        return
+
+    if default_type not in RULE_TYPES:
+        console.print(f"\n[red]❌ Invalid type: {default_type}[/]")
+        console.print(f"[yellow]Types: {', '.join(RULE_TYPES)}[/]\n")
+        return
+
+    if file_path.suffix.lower() == ".json":
+        items = _iter_json_items(file_path)
+    else:
+        items = _iter_text_items(file_path, default_type)
+
+    if replace:
+        count = replace_all(items)
+        console.print(f"\n[green]✅ Blocklist replaced: {count} elements[/]\n")
+    else:
+        count = add_many(items)
+        console.print(f"\n[green]✅ {count} new elements imported[/]\n")
+
+
+def cmd_export(path: Optional[str] = None) -> None:
+    """Export the blocklist as JSON (or as text for a .txt file).
+
+    Items are written one at a time, without building the whole document
+    in memory. Without a path (or with "-") the list goes to stdout.
+
+    Args:
+        path (Optional[str], optional): The destination file.
+    """
+    as_text = path is not None and path.lower().endswith(".txt")
+
+    if path is None or path == "-":
+        _write_items(sys.stdout, as_text)
+        return
+
+    file_path = Path(path).expanduser()
+    with open(file_path, "w", encoding="utf-8") as f:
+        count = _write_items(f, as_text)
+    console.print(f"\n[green]✅ {count} elements exported to {file_path}[/]\n")
+
+
+def _write_items(stream: TextIO, as_text: bool) -> int:
+    """Stream the blocklist to `stream` and return the number of items."""
+    count = 0
+    if as_text:
+        for item in blocked_items:
+            stream.write(f"{item['name']} {item['type']}\n")
+            count += 1
+        return count
+
+    stream.write("[")
+    for item in blocked_items:
+        stream.write(",\n    " if count else "\n    ")
+        stream.write(json.dumps(item.to_dict(), ensure_ascii=False))
+        count += 1
+    stream.write("\n]\n" if count else "]\n")
+    return count
+
+
 # ============================================================================
 # EXPORT
 # ============================================================================
@@ -487,4 +646,6 @@ __all__ = [
     "cmd_lock_status",
     "cmd_clear_lock",
     "cmd_clear",
+    "cmd_import",
+    "cmd_export",
 ]
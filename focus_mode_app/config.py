@@ -42,6 +42,26 @@ RESTORE_CONFIG_FILE = DATA_DIR / "restore_config.json"
 # JSON file for tracking the active session's killed apps (runtime backup)
 SESSION_FILE = DATA_DIR / "session_backup.json"
 
+# Append-only JSON Lines journal of killed apps, folded into SESSION_FILE
+# on compaction
+SESSION_JOURNAL_FILE = DATA_DIR / "session_journal.jsonl"
+
+# Keep a .bak copy of the previous version of every JSON store, used to
+# recover from a corrupted file
+JSON_BACKUP_ENABLED = True
+
+# Repeated writes to the same JSON store within this window (in seconds)
+# are coalesced into a single write at the end of the window
+JSON_WRITE_COALESCE_WINDOW = 0.5
+
+# Storage engine for blocklist, restore list and session:
+# "json" (one file per store) or "sqlite" (single WAL database, migrated
+# automatically from the JSON files on first use)
+STORAGE_BACKEND = "json"
+
+# SQLite database used when STORAGE_BACKEND is "sqlite"
+SQLITE_DB_FILE = DATA_DIR / "focus_mode.db"
+
 # ============================================================================
 # BLOCKING CONFIGURATIONS
 # ============================================================================
@@ -49,9 +69,34 @@ SESSION_FILE = DATA_DIR / "session_backup.json"
 # Process scanning interval (in seconds)
 BLOCKING_INTERVAL = 2
 
+# Adaptive scanning bounds (in seconds): the interval drops to the minimum
+# right after a kill and backs off towards the maximum when nothing matches
+BLOCKING_INTERVAL_MIN = 0.5
+BLOCKING_INTERVAL_MAX = 10
+
+# How long the minimum interval is kept after a kill (in seconds)
+BLOCKING_BOOST_DURATION = 30
+
+# Time without any match before the interval starts backing off (in seconds)
+BLOCKING_IDLE_BACKOFF_AFTER = 60
+
+# Multiplier applied to the interval on each idle back-off step
+BLOCKING_BACKOFF_FACTOR = 1.5
+
 # Initial blocking state on startup (True = active, False = deactivated)
 BLOCKING_ACTIVE_ON_STARTUP = False
 
+# Use Linux process exec events (netlink proc connector) instead of polling.
+# Needs CAP_NET_ADMIN; the polling loop is used automatically when unavailable.
+EVENT_DRIVEN_BLOCKING = True
+
+# In event-driven mode, interval between safety full scans (in seconds)
+EVENT_FULL_SCAN_INTERVAL = 30
+
+# Read the process table straight from /proc instead of building a psutil
+# Process object per PID (psutil is still used to kill matched processes)
+PROCFS_FAST_PATH = True
+
 # ============================================================================
 # SESSION RESTORE CONFIGURATIONS
 # ============================================================================
@@ -63,9 +108,35 @@ AUTO_RESTORE_ENABLED = True
 # Allows the blocker to completely halt before restoration begins
 RESTORE_DELAY_MS = 500
 
-# Interval between consecutive app restorations (seconds)
+# Minimum interval between two app launches of the restore scheduler (seconds)
 RESTORE_INTERVAL = 0.3
 
+# Maximum number of apps launched concurrently by the restore scheduler
+RESTORE_MAX_PARALLEL = 3
+
+# Seconds a restored app must stay alive to be considered ready when no
+# window of its own is detected first; the next app waiting for a launch slot
+# starts then
+RESTORE_READY_TIMEOUT = 2.0
+
+# Seconds after launch a restored app must survive to count as restored;
+# an app exiting with an error code before then is relaunched
+RESTORE_GRACE_PERIOD = 5.0
+
+# Relaunches of an app that crashed during its grace period
+RESTORE_MAX_RETRIES = 2
+
+# Delay before the first relaunch (seconds), doubled on every further retry
+RESTORE_RETRY_BACKOFF = 1.0
+
+# Maximum number of killed-app records waiting to be written by the session
+# worker; when full the blocker records them synchronously
+SESSION_CAPTURE_QUEUE_SIZE = 256
+
+# Number of journal records after which the session journal is compacted
+# into SESSION_FILE
+SESSION_JOURNAL_COMPACT_AFTER = 500
+
 # ============================================================================
 # GUI CONFIGURATIONS
 # ============================================================================
@@ -104,6 +175,29 @@ NOTIFICATION_ICON = "dialog-information"
 # Notification urgency (low, normal, critical)
 NOTIFICATION_URGENCY = "normal"
 
+# Desktop notification backend: "dbus" talks to the notification server over a
+# persistent session-bus connection (requires jeepney), "notify-send" spawns
+# the notify-send tool, "auto" uses D-Bus and falls back to notify-send
+NOTIFICATION_BACKEND = "auto"
+
+# Show a desktop notification when a blocked app is killed or frozen (opt-in)
+NOTIFY_ON_BLOCK = False
+
+# Repeated events within this window (seconds) are merged into one notification,
+# e.g. "Blocked discord x7 in last 10s"
+NOTIFICATION_COALESCE_WINDOW = 10.0
+
+# Token bucket of each notification category: at most NOTIFICATION_BURST
+# notifications at once, then one every NOTIFICATION_REFILL_INTERVAL seconds
+NOTIFICATION_BURST = 3
+
+# Seconds for a notification category to regain one token
+NOTIFICATION_REFILL_INTERVAL = 5.0
+
+# Minimum interval between two state pushes to Home Assistant (seconds); the
+# pushes requested in between are merged into one sent at the end of it
+HA_PUSH_COALESCE_WINDOW = 1.0
+
 # ============================================================================
 # LOGGING CONFIGURATIONS
 # ============================================================================
@@ -127,6 +221,22 @@ PROCESS_KILL_TIMEOUT = 1
 # Maximum number of attempts to kill a specific process
 MAX_KILL_ATTEMPTS = 3
 
+# Kill the whole process tree of a matched webapp (renderer, GPU and utility
+# children included) instead of a single process per scan
+WEBAPP_TREE_KILL = True
+
+# Terminate every process of a matched Flatpak/Snap/app-id scope, then sweep
+# the scope with a single cgroup.kill write (Linux >= 5.14)
+CGROUP_SCOPE_KILL = False
+
+# How matched apps are blocked: "kill" terminates them (restored by relaunching),
+# "freeze" suspends them in a cgroup v2 freezer (SIGSTOP where cgroups are not
+# delegated) and resumes them, state intact, when blocking is turned off
+BLOCKING_MODE = "kill"
+
+# Name of the cgroup created next to our own, holding one child cgroup per frozen app
+FREEZE_CGROUP_NAME = "focus-mode-freeze"
+
 # Platform detected (for debugging/diagnostics)
 # Values: "wayland", "x11", "unknown"
 DETECTED_PLATFORM = "unknown"
@@ -184,17 +294,41 @@ def load_config() -> Dict[str, Any]:
         "data_file": DATA_FILE,
         "restore_config_file": RESTORE_CONFIG_FILE,
         "session_file": SESSION_FILE,
+        "session_journal_file": SESSION_JOURNAL_FILE,
+        "json_backup_enabled": JSON_BACKUP_ENABLED,
+        "json_write_coalesce_window": JSON_WRITE_COALESCE_WINDOW,
+        "storage_backend": STORAGE_BACKEND,
+        "sqlite_db_file": SQLITE_DB_FILE,
         "assets_dir": ASSETS_DIR,
         "log_file": LOG_FILE,
         # Blocking
         "blocking_interval": BLOCKING_INTERVAL,
+        "blocking_interval_min": BLOCKING_INTERVAL_MIN,
+        "blocking_interval_max": BLOCKING_INTERVAL_MAX,
+        "blocking_boost_duration": BLOCKING_BOOST_DURATION,
+        "blocking_idle_backoff_after": BLOCKING_IDLE_BACKOFF_AFTER,
+        "blocking_backoff_factor": BLOCKING_BACKOFF_FACTOR,
         "blocking_active_on_startup": BLOCKING_ACTIVE_ON_STARTUP,
+        "event_driven_blocking": EVENT_DRIVEN_BLOCKING,
+        "event_full_scan_interval": EVENT_FULL_SCAN_INTERVAL,
+        "procfs_fast_path": PROCFS_FAST_PATH,
         "process_kill_timeout": PROCESS_KILL_TIMEOUT,
         "max_kill_attempts": MAX_KILL_ATTEMPTS,
+        "webapp_tree_kill": WEBAPP_TREE_KILL,
+        "cgroup_scope_kill": CGROUP_SCOPE_KILL,
+        "blocking_mode": BLOCKING_MODE,
+        "freeze_cgroup_name": FREEZE_CGROUP_NAME,
         # Session Restore
         "auto_restore_enabled": AUTO_RESTORE_ENABLED,
         "restore_delay_ms": RESTORE_DELAY_MS,
         "restore_interval": RESTORE_INTERVAL,
+        "restore_max_parallel": RESTORE_MAX_PARALLEL,
+        "restore_ready_timeout": RESTORE_READY_TIMEOUT,
+        "restore_grace_period": RESTORE_GRACE_PERIOD,
+        "restore_max_retries": RESTORE_MAX_RETRIES,
+        "restore_retry_backoff": RESTORE_RETRY_BACKOFF,
+        "session_capture_queue_size": SESSION_CAPTURE_QUEUE_SIZE,
+        "session_journal_compact_after": SESSION_JOURNAL_COMPACT_AFTER,
         # GUI
         "window_width": WINDOW_WIDTH,
         "window_height": WINDOW_HEIGHT,
@@ -207,6 +341,12 @@ def load_config() -> Dict[str, Any]:
         "desktop_notifications_enabled": DESKTOP_NOTIFICATIONS_ENABLED,
         "notification_icon": NOTIFICATION_ICON,
         "notification_urgency": NOTIFICATION_URGENCY,
+        "notification_backend": NOTIFICATION_BACKEND,
+        "notify_on_block": NOTIFY_ON_BLOCK,
+        "notification_coalesce_window": NOTIFICATION_COALESCE_WINDOW,
+        "notification_burst": NOTIFICATION_BURST,
+        "notification_refill_interval": NOTIFICATION_REFILL_INTERVAL,
+        "ha_push_coalesce_window": HA_PUSH_COALESCE_WINDOW,
         # Logging
         "console_logging": CONSOLE_LOGGING,
         "file_logging": FILE_LOGGING,
@@ -270,16 +410,40 @@ __all__ = [
     "DATA_FILE",
     "RESTORE_CONFIG_FILE",
     "SESSION_FILE",
+    "SESSION_JOURNAL_FILE",
+    "JSON_BACKUP_ENABLED",
+    "JSON_WRITE_COALESCE_WINDOW",
+    "STORAGE_BACKEND",
+    "SQLITE_DB_FILE",
     "ASSETS_DIR",
     # Blocking configurations
     "BLOCKING_INTERVAL",
+    "BLOCKING_INTERVAL_MIN",
+    "BLOCKING_INTERVAL_MAX",
+    "BLOCKING_BOOST_DURATION",
+    "BLOCKING_IDLE_BACKOFF_AFTER",
+    "BLOCKING_BACKOFF_FACTOR",
     "BLOCKING_ACTIVE_ON_STARTUP",
+    "EVENT_DRIVEN_BLOCKING",
+    "EVENT_FULL_SCAN_INTERVAL",
+    "PROCFS_FAST_PATH",
     "PROCESS_KILL_TIMEOUT",
     "MAX_KILL_ATTEMPTS",
+    "WEBAPP_TREE_KILL",
+    "CGROUP_SCOPE_KILL",
+    "BLOCKING_MODE",
+    "FREEZE_CGROUP_NAME",
     # Session Restore
     "AUTO_RESTORE_ENABLED",
     "RESTORE_DELAY_MS",
     "RESTORE_INTERVAL",
+    "RESTORE_MAX_PARALLEL",
+    "RESTORE_READY_TIMEOUT",
+    "RESTORE_GRACE_PERIOD",
+    "RESTORE_MAX_RETRIES",
+    "RESTORE_RETRY_BACKOFF",
+    "SESSION_CAPTURE_QUEUE_SIZE",
+    "SESSION_JOURNAL_COMPACT_AFTER",
     # GUI
     "WINDOW_WIDTH",
     "WINDOW_HEIGHT",
@@ -292,6 +456,12 @@ __all__ = [
     "DESKTOP_NOTIFICATIONS_ENABLED",
     "NOTIFICATION_ICON",
     "NOTIFICATION_URGENCY",
+    "NOTIFICATION_BACKEND",
+    "NOTIFY_ON_BLOCK",
+    "NOTIFICATION_COALESCE_WINDOW",
+    "NOTIFICATION_BURST",
+    "NOTIFICATION_REFILL_INTERVAL",
+    "HA_PUSH_COALESCE_WINDOW",
     # Logging
     "CONSOLE_LOGGING",
     "FILE_LOGGING",
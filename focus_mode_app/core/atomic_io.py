@@ -0,0 +1,256 @@
+"""
+core/atomic_io.py
+Scrittura atomica e a prova di crash dei file JSON dell'applicazione.
+Il contenuto viene scritto in un file temporaneo nella stessa directory,
+sincronizzato con fsync e poi rinominato sopra il file di destinazione: un
+crash a metà scrittura lascia sempre la versione precedente integra.
+Opzionalmente la versione precedente viene conservata in un file .bak, usato
+in lettura se il file principale risulta corrotto. Scritture ravvicinate sullo
+stesso file vengono accorpate in un'unica scrittura.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from focus_mode_app.config import JSON_BACKUP_ENABLED
+
+# Pending coalesced writes: path -> (text, backup, file_mode)
+_pending: Dict[Path, Tuple[str, bool, Optional[int]]] = {}
+_last_write: Dict[Path, float] = {}
+_lock = threading.RLock()
+
+
+def backup_path(path: Path) -> Path:
+    """Return the path of the .bak copy of `path`.
+
+    Args:
+        path (Path): The JSON store.
+
+    Returns:
+        Path: `path` with ".bak" appended to its name.
+    """
+    return path.with_name(path.name + ".bak")
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist the directory entry changes (rename, link) of `directory`."""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def _current_umask() -> int:
+    """Return the process umask without changing it, where /proc allows."""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+
+    # Fallback: os.umask() can only be read by setting it
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def _target_mode(path: Path) -> int:
+    """Return the permissions a replacement of `path` must keep.
+
+    mkstemp() creates files with mode 0600: without this, every atomic write
+    would silently change the permissions a plain open(path, "w") gives.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_current_umask()
+
+
+def write_text_atomic(
+    path: Path,
+    text: str,
+    backup: bool = False,
+    file_mode: Optional[int] = None,
+) -> None:
+    """Atomically replace `path` with `text`.
+
+    Args:
+        path (Path): The destination file.
+        text (str): The new content.
+        backup (bool, optional): Keep the previous version as `<name>.bak`.
+        file_mode (Optional[int], optional): Permissions applied to the new file
+            before it becomes visible (e.g. 0o600 for secrets). By default the
+            file keeps its current permissions, or gets the umask default.
+
+    Raises:
+        OSError: If the file cannot be written; the previous version is untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            os.fchmod(
+                f.fileno(), file_mode if file_mode is not None else _target_mode(path)
+            )
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if backup and path.exists():
+            bak = backup_path(path)
+            try:
+                # A hard link keeps the old version without copying it
+                bak.unlink(missing_ok=True)
+                os.link(path, bak)
+            except OSError:
+                pass
+
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    _fsync_dir(path.parent)
+
+
+def write_json_atomic(
+    path: Path,
+    data: Any,
+    indent: Optional[int] = 4,
+    backup: bool = JSON_BACKUP_ENABLED,
+    file_mode: Optional[int] = None,
+    coalesce: float = 0.0,
+) -> bool:
+    """Serialize `data` and atomically replace `path` with it.
+
+    With `coalesce` the first write goes to disk immediately, while further
+    writes to the same file within `coalesce` seconds are merged into a single
+    write of the latest data at the end of the window.
+
+    Args:
+        path (Path): The destination file.
+        data (Any): JSON-serializable content, serialized right away.
+        indent (Optional[int], optional): JSON indentation. Defaults to 4.
+        backup (bool, optional): Keep the previous version as `<name>.bak`.
+        file_mode (Optional[int], optional): Permissions of the new file.
+        coalesce (float, optional): Coalescing window in seconds; 0 disables it.
+
+    Returns:
+        bool: True if the data was written (or scheduled to be written).
+
+    Raises:
+        OSError: If an immediate write fails.
+    """
+    path = Path(path)
+    text = json.dumps(data, indent=indent, ensure_ascii=False)
+
+    with _lock:
+        if coalesce > 0:
+            if path in _pending:
+                # A write is already scheduled: it will pick up this data
+                _pending[path] = (text, backup, file_mode)
+                return True
+
+            elapsed = time.monotonic() - _last_write.get(path, float("-inf"))
+            if elapsed < coalesce:
+                _pending[path] = (text, backup, file_mode)
+                timer = threading.Timer(coalesce - elapsed, _write_pending, (path,))
+                timer.daemon = True
+                timer.start()
+                return True
+
+        write_text_atomic(path, text, backup=backup, file_mode=file_mode)
+        _last_write[path] = time.monotonic()
+        return True
+
+
+def _write_pending(path: Path) -> None:
+    """Write the latest coalesced data of `path`, if still pending."""
+    with _lock:
+        pending = _pending.pop(path, None)
+        if pending is None:
+            return
+
+        text, backup, file_mode = pending
+        try:
+            write_text_atomic(path, text, backup=backup, file_mode=file_mode)
+            _last_write[path] = time.monotonic()
+        except Exception as e:
+            print(f"[ERROR] Scrittura differita di {path} fallita: {e}")
+
+
+def flush_pending_writes() -> None:
+    """Write every coalesced write still waiting for its window to end."""
+    with _lock:
+        for path in list(_pending):
+            _write_pending(path)
+
+
+def read_json(path: Path, backup: bool = JSON_BACKUP_ENABLED) -> Any:
+    """Load a JSON store, falling back to its .bak copy if it is corrupted.
+
+    Args:
+        path (Path): The JSON store.
+        backup (bool, optional): Try `<name>.bak` when the file cannot be parsed.
+
+    Returns:
+        Any: The decoded content.
+
+    Raises:
+        FileNotFoundError: If `path` does not exist.
+        json.JSONDecodeError: If both the file and its backup are corrupted.
+    """
+    path = Path(path)
+
+    # A coalesced write not yet on disk is newer than the file
+    with _lock:
+        if path in _pending:
+            _write_pending(path)
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        bak = backup_path(path)
+        if not backup or not bak.exists():
+            raise
+
+        print(f"[WARNING] {path.name} corrotto, ripristino dal backup {bak.name}")
+        text = bak.read_text(encoding="utf-8")
+        data = json.loads(text)
+        # Restore the main file, so the next backup does not keep the corrupted one
+        write_text_atomic(path, text)
+        return data
+
+
+atexit.register(flush_pending_writes)
+
+
+__all__ = [
+    "backup_path",
+    "write_text_atomic",
+    "write_json_atomic",
+    "flush_pending_writes",
+    "read_json",
+]
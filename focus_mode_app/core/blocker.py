@@ -7,19 +7,49 @@ Integra focus lock per impedire disattivazione prematura.
 """
 
 import os
+import threading
 import time
 import psutil
-from typing import Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from focus_mode_app.config import (
     BLOCKING_INTERVAL,
     BLOCKING_ACTIVE_ON_STARTUP,
     AUTO_RESTORE_ENABLED,
+    EVENT_DRIVEN_BLOCKING,
+    EVENT_FULL_SCAN_INTERVAL,
+    PROCFS_FAST_PATH,
+    WEBAPP_TREE_KILL,
+    CGROUP_SCOPE_KILL,
+    BLOCKING_MODE,
+    NOTIFY_ON_BLOCK,
 )
+from focus_mode_app.core import cgroups
+from focus_mode_app.core.freezer import freezer
+from focus_mode_app.core.killer import terminate_processes
+from focus_mode_app.core.matcher import get_matcher
+from focus_mode_app.core.proc_events import ProcExecListener
+from focus_mode_app.core.scanner import ProcessScanner, ProcessVerdict
+from focus_mode_app.core.scheduler import AdaptiveInterval, WakeupSignal
 
 blocking_active = BLOCKING_ACTIVE_ON_STARTUP
 
-_killed_pids: Set[int] = set()
+# Mirrors blocking_active so the loop can sleep until blocking is turned on
+_blocking_enabled = threading.Event()
+if blocking_active:
+    _blocking_enabled.set()
+
+# Sleep time between scans, adapted to recent kills
+_interval = AdaptiveInterval()
+
+# Interrupts the sleep between scans so that changes take effect immediately
+_wakeup = WakeupSignal()
+
+# Verdict cache of the process table, keyed by (pid, create_time)
+_scanner = ProcessScanner(
+    use_procfs=PROCFS_FAST_PATH,
+    read_cgroups=CGROUP_SCOPE_KILL or BLOCKING_MODE == "freeze",
+)
 
 _restore_enabled_this_session = AUTO_RESTORE_ENABLED
 
@@ -49,9 +79,23 @@ def set_blocking_active(active: bool) -> None:
 
     if active:
         print("[INFO] Blocco ATTIVATO")
-        _killed_pids.clear()
+        _scanner.reset()
+        _blocking_enabled.set()
     else:
         print("[INFO] Blocco DISATTIVATO")
+        _blocking_enabled.clear()
+        freezer.thaw_all()
+
+    _wakeup.set()
+
+
+def request_scan() -> None:
+    """Ask the blocking loop to scan right away instead of at the next tick.
+
+    Called when the blocklist changes, so that a newly added item is enforced
+    immediately while blocking is active. Safe to call from any thread.
+    """
+    _wakeup.set()
 
 
 def can_disable_blocking() -> Tuple[bool, str]:
@@ -101,12 +145,18 @@ def toggle_blocking() -> bool:
 
     if blocking_active:
         print("[INFO] Blocco ATTIVATO")
-        _killed_pids.clear()
+        _scanner.reset()
+        _blocking_enabled.set()
     else:
         print("[INFO] Blocco DISATTIVATO")
+        _blocking_enabled.clear()
+        # Frozen apps resume right away, whatever the auto-restore setting
+        freezer.thaw_all()
 
-        if old_state and not blocking_active:
-            _handle_auto_restore()
+    _wakeup.set()
+
+    if old_state and not blocking_active:
+        _handle_auto_restore()
 
     return blocking_active
 
@@ -115,6 +165,8 @@ def _handle_auto_restore() -> None:
     """Handle automatic restoration of killed applications.
 
     Triggered when the blocker is disabled, provided auto-restore is enabled.
+    The apps are restored in the background: the caller (usually the GUI
+    thread) returns immediately.
     """
     if not _restore_enabled_this_session:
         print("[INFO] Auto-restore disabilitato per questa sessione")
@@ -122,7 +174,7 @@ def _handle_auto_restore() -> None:
 
     try:
         from focus_mode_app.core.session import session_tracker
-        from focus_mode_app.core.restore import restore_all_apps
+        from focus_mode_app.core.restore import start_restore
         from focus_mode_app.core.notifications import notify_restore_complete
 
         killed_apps = session_tracker.get_killed_apps()
@@ -132,9 +184,11 @@ def _handle_auto_restore() -> None:
 
         print(f"[INFO] Avvio auto-restore: {len(killed_apps)} app")
 
-        restored_count = restore_all_apps()
+        def on_event(event) -> None:
+            if event.kind == "finished":
+                notify_restore_complete(event.restored)
 
-        notify_restore_complete(restored_count)
+        start_restore(on_event)
 
     except Exception as e:
         print(f"[ERROR] Errore durante auto-restore: {e}")
@@ -167,143 +221,468 @@ def is_restore_enabled() -> bool:
 # ============================================================================
 
 
-def kill_blocked_apps() -> int:
-    """Iterate through native system processes and kill those in the blocklist.
+def _scan(pids: Optional[Iterable[int]] = None) -> List[ProcessVerdict]:
+    """Return the processes matching the current blocklist.
 
-    Tracks successfully killed applications for future session restoration.
+    Args:
+        pids (Optional[Iterable[int]], optional): Restrict the scan to these PIDs.
 
     Returns:
-        int: The number of application processes successfully killed.
+        List[ProcessVerdict]: Verdicts of matching processes.
     """
-    if not blocking_active:
-        return 0
-
     from focus_mode_app.core.storage import blocked_items
 
-    if not blocked_items:
-        return 0
+    return _scanner.scan(get_matcher(blocked_items), pids)
 
-    killed_count = 0
-    current_pid = os.getpid()
 
-    for item in blocked_items:
-        if item["type"] != "app":
-            continue
+def _capture_killed_app(proc: psutil.Process, rule_name: str) -> None:
+    """Record the state of a process about to be killed for session restore.
+
+    Only a oneshot snapshot is taken here; the session file is updated by the
+    session worker thread, so the kill does not wait for the disk.
 
-        app_name = item["name"].lower()
+    Args:
+        proc (psutil.Process): The process to capture.
+        rule_name (str): The blocklist entry that matched, used as restore key.
+    """
+    try:
+        from focus_mode_app.core.session import session_tracker
 
+        # Apps outside the restore list are never tracked: skip the snapshot
+        if rule_name not in session_tracker.restore_list:
+            return
+
+        app_state = session_tracker.capture_app_state(proc)
+        if app_state:
+            session_tracker.record_killed_app(rule_name, app_state)
+    except Exception as e:
+        print(f"[WARNING] Session capture error: {e}")
+
+
+def _prepare_kill(
+    verdict: ProcessVerdict, rule_name: str, label: str
+) -> psutil.Process:
+    """Capture session state for a matched process (first time only).
+
+    Args:
+        verdict (ProcessVerdict): The cached verdict of the matched process.
+        rule_name (str): The blocklist entry that matched, used as restore key.
+        label (str): Human readable rule kind for logging ("app" or "webapp").
+
+    Returns:
+        psutil.Process: The process to terminate.
+    """
+    proc = verdict.proc
+    if not verdict.captured:
+        print(f"[INFO] Killing {label}: {rule_name} (PID {verdict.pid})")
+        verdict.captured = True
+        _capture_killed_app(proc, rule_name)
+
+    return proc
+
+
+def _find_webapp_root(proc: psutil.Process, webapp_string: str) -> psutil.Process:
+    """Walk up the process tree to the topmost ancestor launched for a webapp.
+
+    Chromium app windows spawn renderer, GPU and utility children that carry
+    the same URL in their arguments; the root is the highest ancestor whose
+    cmdline still contains the webapp string, so the regular browser is never
+    selected unless it was itself launched for the webapp.
+
+    Args:
+        proc (psutil.Process): A process whose cmdline matched the webapp.
+        webapp_string (str): The matching webapp rule.
+
+    Returns:
+        psutil.Process: The root of the webapp process tree.
+    """
+    root = proc
+    own_pid = os.getpid()
+
+    while True:
         try:
-            for proc in psutil.process_iter(["name", "pid"]):
-                try:
-                    proc_name = proc.info["name"].lower()
-                    proc_pid = proc.info["pid"]
+            parent = root.parent()
+            if parent is None or parent.pid <= 1 or parent.pid == own_pid:
+                break
+            if webapp_string not in " ".join(parent.cmdline()):
+                break
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            break
+        root = parent
 
-                    if app_name in proc_name and proc_pid != current_pid:
-                        if proc_pid not in _killed_pids:
-                            print(f"[INFO] Killing app: {app_name} (PID {proc_pid})")
-                            _killed_pids.add(proc_pid)
+    return root
 
-                            try:
-                                from focus_mode_app.core.session import session_tracker
 
-                                app_state = session_tracker.capture_app_state(proc)
-                                if app_state:
-                                    session_tracker.add_killed_app(app_name, app_state)
-                            except Exception as e:
-                                print(f"[WARNING] Session capture error: {e}")
+def _prepare_webapp_tree(
+    verdict: ProcessVerdict, webapp_string: str
+) -> List[psutil.Process]:
+    """Resolve the whole process tree of a matched webapp.
 
-                        proc.kill()
-                        killed_count += 1
+    Args:
+        verdict (ProcessVerdict): The cached verdict of a matching process.
+        webapp_string (str): The matching webapp rule.
 
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+    Returns:
+        List[psutil.Process]: The tree root followed by all of its descendants.
+    """
+    root = _find_webapp_root(verdict.proc, webapp_string)
+    try:
+        tree = [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        tree = [root]
+
+    if not verdict.captured:
+        print(
+            f"[INFO] Killing webapp: {webapp_string} "
+            f"(PID {root.pid}, {len(tree)} processi)"
+        )
+        verdict.captured = True
+        _capture_killed_app(root, webapp_string)
+
+    return tree
 
+
+def _collect_app_targets(matches: List[ProcessVerdict]) -> List[psutil.Process]:
+    """Select the processes matching an "app" entry of the blocklist.
+
+    Args:
+        matches (List[ProcessVerdict]): Matching processes from a scan.
+
+    Returns:
+        List[psutil.Process]: The processes to terminate.
+    """
+    targets: List[psutil.Process] = []
+
+    for verdict in matches:
+        app_name = verdict.app_rule
+        if app_name is None:
+            continue
+
+        try:
+            targets.append(_prepare_kill(verdict, app_name, "app"))
+        except psutil.NoSuchProcess:
+            _scanner.forget(verdict)
+        except psutil.AccessDenied:
+            continue
         except Exception as e:
             print(f"[ERROR] Errore durante blocco app '{app_name}': {e}")
 
-    return killed_count
+    return targets
 
 
-def kill_blocked_webapps() -> int:
-    """Iterate through process command lines to find and kill blocked web applications.
+def _collect_webapp_targets(matches: List[ProcessVerdict]) -> List[psutil.Process]:
+    """Select the processes matching a "webapp" entry of the blocklist.
 
-    Useful for stopping specific sub-processes of browsers (like Chrome/Firefox tabs)
-    by searching for the webapp URL in the launch arguments.
+    With `WEBAPP_TREE_KILL` the whole process tree of each match is selected;
+    otherwise at most one process per webapp entry.
+
+    Args:
+        matches (List[ProcessVerdict]): Matching processes from a scan.
 
     Returns:
-        int: The number of web application processes successfully killed.
+        List[psutil.Process]: The processes to terminate.
     """
-    if not blocking_active:
-        return 0
+    targets: List[psutil.Process] = []
+    handled: Set[str] = set()
+    selected_pids: Set[int] = set()
+
+    for verdict in matches:
+        if verdict.pid in selected_pids:
+            continue
+
+        for webapp_string in verdict.webapp_rules:
+            if not WEBAPP_TREE_KILL and webapp_string in handled:
+                continue
+
+            try:
+                if WEBAPP_TREE_KILL:
+                    tree = _prepare_webapp_tree(verdict, webapp_string)
+                else:
+                    tree = [_prepare_kill(verdict, webapp_string, "webapp")]
+
+                for proc in tree:
+                    if proc.pid not in selected_pids:
+                        selected_pids.add(proc.pid)
+                        targets.append(proc)
+                handled.add(webapp_string)
+            except psutil.NoSuchProcess:
+                _scanner.forget(verdict)
+            except psutil.AccessDenied:
+                pass
+            except Exception as e:
+                print(f"[ERROR] Errore durante blocco webapp '{webapp_string}': {e}")
+            break
+
+    return targets
+
+
+def _scope_of(verdict: ProcessVerdict) -> Optional[cgroups.AppIdentity]:
+    """Return the app scope to kill as a whole for a matched process, if any.
+
+    Only scopes that hold a single app qualify: sandboxed apps (Flatpak, Snap)
+    and scopes whose app-id is targeted by an "appid" rule. A terminal scope
+    matched through one of its shells is never killed as a whole.
+    """
+    if verdict.app_rule is None:
+        return None
+
+    identity = verdict.identity
+    if identity is None or not identity.is_scope:
+        return None
+
+    if identity.kind in cgroups.SANDBOX_KINDS:
+        return identity
 
     from focus_mode_app.core.storage import blocked_items
 
-    if not blocked_items:
-        return 0
+    if get_matcher(blocked_items).match_app_id(identity.app_id) is not None:
+        return identity
+    return None
+
+
+def _collect_scope_targets(
+    matches: List[ProcessVerdict],
+) -> Tuple[List[cgroups.AppIdentity], List[ProcessVerdict], List[psutil.Process]]:
+    """Select every process of the app scopes of the matched processes.
+
+    The processes of the scope join the regular SIGTERM batch, so sandboxed
+    apps still get their grace period to shut down cleanly; `_sweep_scopes`
+    then kills whatever is left in the scope with cgroup.kill.
+
+    Args:
+        matches (List[ProcessVerdict]): Matching processes from a scan.
+
+    Returns:
+        Tuple[List[cgroups.AppIdentity], List[ProcessVerdict], List[psutil.Process]]:
+        The scopes to sweep, the matches left to the per-process path and
+        every process of the scopes.
+    """
+    if not CGROUP_SCOPE_KILL:
+        return [], matches, []
+
+    scopes: Dict[str, List[ProcessVerdict]] = {}
+    remaining: List[ProcessVerdict] = []
+    for verdict in matches:
+        identity = _scope_of(verdict)
+        if identity is None:
+            remaining.append(verdict)
+        else:
+            scopes.setdefault(identity.cgroup, []).append(verdict)
+
+    identities: List[cgroups.AppIdentity] = []
+    targets: List[psutil.Process] = []
+    for cgroup, verdicts in scopes.items():
+        identity = cgroups.identify(cgroup)
+        first = verdicts[0]
+
+        if not first.captured:
+            print(f"[INFO] Killing app scope: {first.app_rule} ({identity.unit})")
+            try:
+                _capture_killed_app(first.proc, first.app_rule)
+            except psutil.Error:
+                pass
+        for verdict in verdicts:
+            verdict.captured = True
+
+        identities.append(identity)
+        for pid in cgroups.scope_pids(identity):
+            try:
+                targets.append(psutil.Process(pid))
+            except psutil.Error:
+                continue
+
+    return identities, remaining, targets
+
+
+def _sweep_scopes(scopes: List[cgroups.AppIdentity]) -> int:
+    """Kill what is left of app scopes once their processes were terminated.
+
+    Catches processes forked while the app was shutting down with a single
+    write to cgroup.kill (Linux >= 5.14).
+
+    Args:
+        scopes (List[cgroups.AppIdentity]): Scopes from `_collect_scope_targets`.
 
-    killed_count = 0
+    Returns:
+        int: The number of processes still in the scopes when they were killed.
+    """
+    killed = 0
+    for identity in scopes:
+        pids = cgroups.scope_pids(identity)
+        if pids and cgroups.kill_scope(identity):
+            killed += len(pids)
+    return killed
+
+
+def _freeze_matches(matches: List[ProcessVerdict]) -> int:
+    """Freeze the matched processes instead of killing them ("freeze" mode).
+
+    Scopes that hold a single app are frozen in place; other matches are
+    grouped by rule into per-app freezer cgroups (see `core/freezer.py`).
+    Nothing is recorded for restore: thawing brings the apps back.
+
+    Args:
+        matches (List[ProcessVerdict]): Matching processes from a scan.
+
+    Returns:
+        int: The number of processes newly frozen.
+    """
+    frozen = 0
+    groups: Dict[str, List[psutil.Process]] = {}
 
-    for item in blocked_items:
-        if item["type"] != "webapp":
+    for verdict in matches:
+        if freezer.is_frozen(verdict.pid):
             continue
 
-        webapp_string = item["name"]
+        rule = verdict.app_rule or verdict.webapp_rules[0]
+        identity = _scope_of(verdict)
+        if identity is not None:
+            count = freezer.freeze_scope(rule, identity)
+            if count:
+                frozen += count
+                continue
 
         try:
-            for proc in psutil.process_iter(["cmdline", "pid"]):
-                try:
-                    cmdline_list = proc.info["cmdline"]
-                    if not cmdline_list:
-                        continue
-
-                    cmdline_str = " ".join(cmdline_list)
-                    proc_pid = proc.info["pid"]
-
-                    if webapp_string in cmdline_str:
-                        if proc_pid not in _killed_pids:
-                            print(
-                                f"[INFO] Killing webapp: {webapp_string} (PID {proc_pid})"
-                            )
-                            _killed_pids.add(proc_pid)
-
-                            try:
-                                from focus_mode_app.core.session import session_tracker
-
-                                app_state = session_tracker.capture_app_state(proc)
-                                if app_state:
-                                    session_tracker.add_killed_app(
-                                        webapp_string, app_state
-                                    )
-                            except Exception as e:
-                                print(f"[WARNING] Session capture error: {e}")
-
-                        proc.kill()
-                        killed_count += 1
-                        break
-
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            groups.setdefault(rule, []).append(verdict.proc)
+        except psutil.NoSuchProcess:
+            _scanner.forget(verdict)
+        except psutil.AccessDenied:
+            continue
 
-        except Exception as e:
-            print(f"[ERROR] Errore durante blocco webapp '{webapp_string}': {e}")
+    for rule, procs in groups.items():
+        frozen += freezer.freeze(rule, procs)
+    return frozen
+
+
+def _terminate(targets: List[psutil.Process]) -> int:
+    """Terminate the selected processes as a single batch.
+
+    Args:
+        targets (List[psutil.Process]): The processes to terminate; duplicates
+            (the same PID selected by several rules) are signalled once.
+
+    Returns:
+        int: The number of processes that exited.
+    """
+    unique = list({proc.pid: proc for proc in targets}.values())
+    if not unique:
+        return 0
+
+    gone, _ = terminate_processes(unique)
+    return len(gone)
+
+
+def kill_blocked_apps(matches: Optional[List[ProcessVerdict]] = None) -> int:
+    """Kill native processes whose name matches an "app" entry of the blocklist.
 
-    return killed_count
+    Tracks successfully killed applications for future session restoration.
+    Processes get SIGTERM first and SIGKILL if they do not exit in time
+    (see `core/killer.py`). With `CGROUP_SCOPE_KILL` every process of a
+    sandboxed or app-id-targeted app scope is terminated, and the scope is
+    then swept with cgroup.kill.
+
+    Args:
+        matches (Optional[List[ProcessVerdict]], optional): Matching processes
+            from a previous scan. A fresh scan is performed when omitted.
+
+    Returns:
+        int: The number of application processes successfully killed.
+    """
+    if not blocking_active:
+        return 0
+
+    if matches is None:
+        matches = _scan()
+
+    scopes, matches, targets = _collect_scope_targets(matches)
+    killed = _terminate(targets + _collect_app_targets(matches))
+    return killed + _sweep_scopes(scopes)
+
+
+def kill_blocked_webapps(matches: Optional[List[ProcessVerdict]] = None) -> int:
+    """Kill processes whose command line contains a "webapp" entry of the blocklist.
+
+    Useful for stopping specific sub-processes of browsers (like Chrome/Firefox tabs)
+    by searching for the webapp URL in the launch arguments. With
+    `WEBAPP_TREE_KILL` the whole process tree of each match is killed at once;
+    otherwise at most one process is killed per webapp entry on each pass.
+
+    Args:
+        matches (Optional[List[ProcessVerdict]], optional): Matching processes
+            from a previous scan. A fresh scan is performed when omitted.
+
+    Returns:
+        int: The number of web application processes successfully killed.
+    """
+    if not blocking_active:
+        return 0
 
+    if matches is None:
+        matches = _scan()
 
-def kill_all_blocked_items() -> int:
+    return _terminate(_collect_webapp_targets(matches))
+
+
+def kill_all_blocked_items(pids: Optional[Iterable[int]] = None) -> int:
     """Execute the killing routine for both native apps and web applications.
 
+    The process table is scanned once and every matching process is terminated
+    in a single batch, so the scan waits at most `MAX_KILL_ATTEMPTS *
+    PROCESS_KILL_TIMEOUT` seconds however many processes are involved.
+    With `BLOCKING_MODE = "freeze"` the matches are frozen instead, and
+    resumed when blocking is turned off.
+
+    Args:
+        pids (Optional[Iterable[int]], optional): Restrict the scan to these PIDs.
+            Defaults to a full scan of the process table.
+
     Returns:
-        int: Total number of processes killed across all categories.
+        int: Total number of processes killed (or newly frozen) across all categories.
     """
     if not blocking_active:
         return 0
 
-    total_killed = 0
-    total_killed += kill_blocked_apps()
-    total_killed += kill_blocked_webapps()
+    from focus_mode_app.core.storage import blocked_items
+
+    if not blocked_items:
+        return 0
+
+    matches = _scan(pids)
+    if not matches:
+        return 0
 
-    return total_killed
+    if BLOCKING_MODE == "freeze":
+        # Apps frozen by an earlier scan are not blocked again
+        matches = [v for v in matches if not freezer.is_frozen(v.pid)]
+        count = _freeze_matches(matches)
+    else:
+        scopes, remaining, targets = _collect_scope_targets(matches)
+        targets += _collect_app_targets(remaining)
+        targets += _collect_webapp_targets(remaining)
+        count = _terminate(targets) + _sweep_scopes(scopes)
+
+    if count and NOTIFY_ON_BLOCK:
+        _notify_blocked(matches)
+    return count
+
+
+def _notify_blocked(matches: List[ProcessVerdict]) -> None:
+    """Queue a "Blocked <app>" notification per matched rule.
+
+    Repeated blocks of the same app are coalesced by the notification
+    dispatcher, so a relaunch loop shows a single notification.
+    """
+    from focus_mode_app.core.notifications import notify_blocked
+
+    rules: Dict[str, None] = {}
+    for verdict in matches:
+        rule = verdict.app_rule or (
+            verdict.webapp_rules[0] if verdict.webapp_rules else None
+        )
+        if rule is not None:
+            rules[rule] = None
+    for rule in rules:
+        notify_blocked(rule)
 
 
 # ============================================================================
@@ -315,20 +694,49 @@ def start_blocking_loop() -> None:
     """Start an infinite loop to monitor and block active processes.
 
     This function should be executed in a separate daemon thread to avoid blocking
-    the main GUI loop. It continuously checks running processes at intervals
-    defined by `BLOCKING_INTERVAL`.
+    the main GUI loop. When `EVENT_DRIVEN_BLOCKING` is enabled and the netlink
+    proc connector is available, only newly exec'd processes are checked;
+    otherwise running processes are polled at an adaptive interval between
+    `BLOCKING_INTERVAL_MIN` and `BLOCKING_INTERVAL_MAX`. While blocking is
+    inactive the thread sleeps until it is turned back on.
     """
     print(f"[INFO] Loop di blocco avviato (intervallo: {BLOCKING_INTERVAL}s)")
 
+    if BLOCKING_MODE == "freeze":
+        # Resume apps left frozen by a previous run that did not exit cleanly
+        freezer.thaw_all()
+
+    listener = ProcExecListener.open() if EVENT_DRIVEN_BLOCKING else None
+
+    if listener is not None:
+        _run_event_loop(listener)
+    else:
+        _run_polling_loop()
+
+
+def _wait_until_active() -> None:
+    """Block the calling thread until blocking is activated."""
+    _blocking_enabled.wait()
+    _wakeup.consume()
+    _interval.reset()
+
+
+def _run_polling_loop() -> None:
+    """Scan the whole process table, sleeping for the adaptive interval."""
     while True:
         try:
-            if blocking_active:
-                killed = kill_all_blocked_items()
+            if not blocking_active:
+                _wait_until_active()
+                continue
 
-                if killed > 0:
-                    print(f"[DEBUG] Processi killati in questo ciclo: {killed}")
+            killed = kill_all_blocked_items()
 
-            time.sleep(BLOCKING_INTERVAL)
+            if killed > 0:
+                print(f"[DEBUG] Processi killati in questo ciclo: {killed}")
+
+            # Activation and blocklist changes interrupt the sleep
+            if _wakeup.wait(_interval.update(killed)):
+                _wakeup.consume()
 
         except KeyboardInterrupt:
             print("\n[INFO] Loop di blocco interrotto dall'utente")
@@ -339,15 +747,75 @@ def start_blocking_loop() -> None:
             time.sleep(BLOCKING_INTERVAL)
 
 
+def _run_event_loop(listener: ProcExecListener) -> None:
+    """Check only processes reported by the proc connector.
+
+    A full scan is still performed when blocking is (re)activated, when the
+    blocklist changes, when events were lost, and every
+    `EVENT_FULL_SCAN_INTERVAL` seconds as a safety net.
+
+    Args:
+        listener (ProcExecListener): Subscribed exec event source.
+    """
+    from focus_mode_app.core import storage
+
+    last_full_scan = 0.0
+    last_matcher = None
+    # None means "events may have been missed": do a full scan
+    pids: Optional[Set[int]] = None
+
+    try:
+        while True:
+            try:
+                if not blocking_active:
+                    _wait_until_active()
+                    pids = None
+                    continue
+
+                matcher = get_matcher(storage.blocked_items)
+                now = time.monotonic()
+
+                if (
+                    pids is None
+                    or matcher is not last_matcher
+                    or now - last_full_scan >= EVENT_FULL_SCAN_INTERVAL
+                ):
+                    killed = kill_all_blocked_items()
+                    last_full_scan = now
+                    last_matcher = matcher
+                elif pids:
+                    killed = kill_all_blocked_items(pids)
+                else:
+                    killed = 0
+
+                if killed > 0:
+                    print(f"[DEBUG] Processi killati in questo ciclo: {killed}")
+
+                # Activation and blocklist changes interrupt the wait
+                pids = listener.read_exec_pids(_interval.update(killed), _wakeup)
+                _wakeup.consume()
+
+            except KeyboardInterrupt:
+                print("\n[INFO] Loop di blocco interrotto dall'utente")
+                break
+
+            except Exception as e:
+                print(f"[ERROR] Errore nel loop di blocco: {e}")
+                pids = None
+                time.sleep(BLOCKING_INTERVAL)
+    finally:
+        listener.close()
+
+
 def cleanup_killed_pids() -> None:
-    """Clear the set of actively tracked PIDs.
+    """Clear the verdict cache of tracked processes.
 
-    Useful for resetting the internal state and cleaning up memory
-    between completely different blocking sessions.
+    Useful for resetting the internal state between completely different
+    blocking sessions: every process is re-read and re-classified on the
+    next scan.
     """
-    global _killed_pids
-    _killed_pids.clear()
-    print("[DEBUG] Set PID killati resettato")
+    _scanner.reset()
+    print("[DEBUG] Cache verdetti processi resettata")
 
 
 # ============================================================================
@@ -382,8 +850,10 @@ def get_blocking_stats() -> dict:
     return {
         "blocking_active": blocking_active,
         "blocked_items_count": len(blocked_items),
-        "killed_pids_tracked": len(_killed_pids),
-        "blocking_interval": BLOCKING_INTERVAL,
+        "killed_pids_tracked": _scanner.tracked_matches,
+        "blocking_mode": BLOCKING_MODE,
+        "frozen_processes": freezer.frozen_count,
+        "blocking_interval": _interval.current,
         "auto_restore_enabled": _restore_enabled_this_session,
         "apps_to_restore_count": restore_list_count,
         "killed_apps_in_session": killed_apps_count,
@@ -403,6 +873,7 @@ __all__ = [
     "can_disable_blocking",
     "set_restore_enabled",
     "is_restore_enabled",
+    "request_scan",
     "kill_blocked_apps",
     "kill_blocked_webapps",
     "kill_all_blocked_items",
@@ -0,0 +1,404 @@
+"""
+core/blocklist.py
+Struttura dati indicizzata della blocklist.
+Gli elementi sono tenuti in un dizionario ordinato per (name, type): ricerca,
+controllo duplicati e rimozione per nome costano O(1), e le viste per tipo
+vengono ricostruite solo quando la lista cambia. Ogni modifica assegna un nuovo
+numero di versione, così matcher e cache possono accorgersi dei cambiamenti
+senza confrontare l'intera lista.
+Verso l'esterno la lista continua a comportarsi come una lista di dict.
+"""
+
+import itertools
+import threading
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from focus_mode_app.core.matcher import RULE_TYPES
+
+# Shared by every BlockList, so a version never identifies two different lists
+_versions = itertools.count(1)
+
+_Key = Tuple[str, str]
+
+
+class BlockEntry:
+    """A single blocklist item, read like the {"name", "type"} dict it replaces.
+
+    Entries are immutable: their (name, type) pair is the index key.
+
+    Attributes:
+        name (str): Name of the application or URL of the web application.
+        type (str): The rule type, one of `RULE_TYPES` (e.g. "app", "webapp").
+    """
+
+    __slots__ = ("name", "type")
+
+    def __init__(self, name: str, item_type: str) -> None:
+        """Create an entry.
+
+        Args:
+            name (str): Name of the application or URL of the web application.
+            item_type (str): The rule type (e.g. "app", "webapp").
+        """
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "type", item_type)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        raise AttributeError("BlockEntry is immutable")
+
+    @property
+    def key(self) -> _Key:
+        """The (name, type) pair identifying the entry."""
+        return (self.name, self.type)
+
+    def __getitem__(self, field: str) -> str:
+        if field == "name":
+            return self.name
+        if field == "type":
+            return self.type
+        raise KeyError(field)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """dict.get() compatibility."""
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self) -> Tuple[str, str]:
+        """dict.keys() compatibility, so that dict(entry) works."""
+        return ("name", "type")
+
+    def to_dict(self) -> Dict[str, str]:
+        """Return the entry as a plain, JSON-serializable dict."""
+        return {"name": self.name, "type": self.type}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BlockEntry):
+            return self.key == other.key
+        if isinstance(other, dict):
+            return other == self.to_dict()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"BlockEntry(name={self.name!r}, type={self.type!r})"
+
+
+_Item = Union[BlockEntry, Dict[str, str]]
+
+
+def _as_entry(item: _Item) -> BlockEntry:
+    """Convert a {"name", "type"} dict (or an entry) to a BlockEntry."""
+    if isinstance(item, BlockEntry):
+        return item
+    return BlockEntry(item["name"], item["type"])
+
+
+class BlockList(MutableSequence):
+    """Ordered blocklist without duplicates, indexed by (name, type).
+
+    Positional access (`items[i]`, `pop(i)`) is kept for the GUI and the CLI,
+    which address items by their position in the list.
+
+    Iterating is safe while another thread edits the list: it walks a
+    snapshot of the entries taken when the iteration starts.
+    """
+
+    def __init__(self, items: Iterable[_Item] = ()) -> None:
+        """Create a blocklist.
+
+        Args:
+            items (Iterable[_Item], optional): Initial items; duplicates are dropped.
+        """
+        self._lock = threading.RLock()
+        self._index: Dict[_Key, BlockEntry] = {}
+        self._version = next(_versions)
+        self._snapshot: Tuple[int, List[BlockEntry]] = (0, [])
+        self._views: Dict[str, Tuple[int, List[str]]] = {}
+        for item in items:
+            entry = _as_entry(item)
+            self._index.setdefault(entry.key, entry)
+
+    # ------------------------------------------------------------------
+    # Versioning and snapshots
+    # ------------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """A number that changes on every modification of the list."""
+        return self._version
+
+    def _touch(self) -> None:
+        """Mark the list as modified (call with the lock held)."""
+        self._version = next(_versions)
+
+    def _entries(self) -> List[BlockEntry]:
+        """Return the entries in order, rebuilt only after a modification."""
+        version, entries = self._snapshot
+        if version != self._version:
+            with self._lock:
+                entries = list(self._index.values())
+                self._snapshot = (self._version, entries)
+        return entries
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[BlockEntry]:
+        return iter(self._entries())
+
+    def __getitem__(self, index):
+        return self._entries()[index]
+
+    def __setitem__(self, index: int, item: _Item) -> None:
+        entry = _as_entry(item)
+        with self._lock:
+            entries = list(self._entries())
+            old = entries[index]
+            if entry.key != old.key and entry.key in self._index:
+                raise ValueError(f"Elemento già presente: {entry.name} ({entry.type})")
+            entries[index] = entry
+            self._rebuild(entries)
+
+    def __delitem__(self, index) -> None:
+        with self._lock:
+            targets = self._entries()[index]
+            if isinstance(targets, BlockEntry):
+                targets = [targets]
+            for entry in targets:
+                del self._index[entry.key]
+            self._touch()
+
+    def insert(self, index: int, item: _Item) -> None:
+        """Insert an item at `index`; an item already in the list is ignored.
+
+        Args:
+            index (int): Position of the new item.
+            item (_Item): The item, as a dict or a BlockEntry.
+        """
+        entry = _as_entry(item)
+        with self._lock:
+            if entry.key in self._index:
+                return
+            if index >= len(self._index):
+                # append(): no reordering needed
+                self._index[entry.key] = entry
+                self._touch()
+                return
+            entries = list(self._entries())
+            entries.insert(index, entry)
+            self._rebuild(entries)
+
+    def _rebuild(self, entries: List[BlockEntry]) -> None:
+        """Replace the content with `entries` (call with the lock held)."""
+        self._index = {entry.key: entry for entry in entries}
+        self._touch()
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self.replace_all(())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BlockList):
+            return list(self._index) == list(other._index)
+        if isinstance(other, (list, tuple)):
+            entries = self._entries()
+            return len(other) == len(entries) and all(
+                entry == item for entry, item in zip(entries, other, strict=True)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"BlockList({self.to_dicts()!r})"
+
+    # ------------------------------------------------------------------
+    # Indexed operations
+    # ------------------------------------------------------------------
+
+    def add(self, name: str, item_type: str) -> bool:
+        """Append an item unless it is already in the list.
+
+        Args:
+            name (str): Name of the application or URL of the web application.
+            item_type (str): The rule type (e.g. "app", "webapp").
+
+        Returns:
+            bool: True if added, False if already present.
+        """
+        entry = BlockEntry(name, item_type)
+        with self._lock:
+            if entry.key in self._index:
+                return False
+            self._index[entry.key] = entry
+            self._touch()
+            return True
+
+    def discard(self, name: str, item_type: str) -> Optional[BlockEntry]:
+        """Remove an item by name and type.
+
+        Args:
+            name (str): Name of the item.
+            item_type (str): The rule type (e.g. "app", "webapp").
+
+        Returns:
+            Optional[BlockEntry]: The removed entry, or None if not present.
+        """
+        with self._lock:
+            entry = self._index.pop((name, item_type), None)
+            if entry is not None:
+                self._touch()
+            return entry
+
+    def add_many(self, items: Iterable[_Item]) -> List[BlockEntry]:
+        """Append several items, skipping the ones already present.
+
+        Args:
+            items (Iterable[_Item]): The items, as dicts or BlockEntry.
+
+        Returns:
+            List[BlockEntry]: The entries actually added, in order.
+        """
+        return self.apply_batch(items, ())[0]
+
+    def discard_many(self, items: Iterable[_Item]) -> List[BlockEntry]:
+        """Remove several items by name and type.
+
+        Args:
+            items (Iterable[_Item]): The items, as dicts or BlockEntry.
+
+        Returns:
+            List[BlockEntry]: The entries actually removed.
+        """
+        return self.apply_batch((), items)[1]
+
+    def apply_batch(
+        self, add: Iterable[_Item], remove: Iterable[_Item]
+    ) -> Tuple[List[BlockEntry], List[BlockEntry]]:
+        """Remove and append items as a single modification of the list.
+
+        Removals are applied first: an item in both lists ends up appended.
+
+        Args:
+            add (Iterable[_Item]): The items to append; present ones are skipped.
+            remove (Iterable[_Item]): The items to remove.
+
+        Returns:
+            Tuple[List[BlockEntry], List[BlockEntry]]: The entries actually
+            added and the entries actually removed.
+        """
+        entries = [_as_entry(item) for item in add]
+        keys = [_as_entry(item).key for item in remove]
+        added: List[BlockEntry] = []
+        removed: List[BlockEntry] = []
+        with self._lock:
+            for key in keys:
+                entry = self._index.pop(key, None)
+                if entry is not None:
+                    removed.append(entry)
+            for entry in entries:
+                if entry.key not in self._index:
+                    self._index[entry.key] = entry
+                    added.append(entry)
+            if added or removed:
+                self._touch()
+        return added, removed
+
+    def contains(self, name: str, item_type: str) -> bool:
+        """Check whether an item is in the list.
+
+        Args:
+            name (str): Name of the item.
+            item_type (str): The rule type (e.g. "app", "webapp").
+
+        Returns:
+            bool: True if present.
+        """
+        return (name, item_type) in self._index
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, (BlockEntry, dict)):
+            try:
+                return _as_entry(item).key in self._index  # type: ignore[arg-type]
+            except KeyError:
+                return False
+        return False
+
+    def find(self, name: str, item_type: Optional[str] = None) -> Optional[BlockEntry]:
+        """Look up an item by name, optionally restricted to one type.
+
+        Args:
+            name (str): Name of the item.
+            item_type (Optional[str], optional): The rule type; None tries
+                every type in `RULE_TYPES` order ("app" first).
+
+        Returns:
+            Optional[BlockEntry]: The entry, or None if not present.
+        """
+        types = (item_type,) if item_type is not None else RULE_TYPES
+        for candidate in types:
+            entry = self._index.get((name, candidate))
+            if entry is not None:
+                return entry
+        return None
+
+    def names(self, item_type: str) -> List[str]:
+        """Return the names of the items of one type, in list order.
+
+        The view is cached until the next modification: callers must not
+        modify the returned list.
+
+        Args:
+            item_type (str): The rule type (e.g. "app", "webapp").
+
+        Returns:
+            List[str]: The names of the matching items.
+        """
+        version, names = self._views.get(item_type, (0, []))
+        if version != self._version:
+            current = self._version
+            names = [e.name for e in self._entries() if e.type == item_type]
+            self._views[item_type] = (current, names)
+        return names
+
+    def replace_all(self, items: Iterable[_Item]) -> None:
+        """Replace the whole content, keeping the same BlockList object.
+
+        Modules that imported the list keep seeing the current content.
+
+        Args:
+            items (Iterable[_Item]): The new items; duplicates are dropped.
+        """
+        entries = [_as_entry(item) for item in items]
+        with self._lock:
+            self._index = {}
+            for entry in entries:
+                self._index.setdefault(entry.key, entry)
+            self._touch()
+
+    # ------------------------------------------------------------------
+    # List-of-dicts compatibility
+    # ------------------------------------------------------------------
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        """Return the items as a list of plain, JSON-serializable dicts."""
+        return [entry.to_dict() for entry in self._entries()]
+
+    def copy(self) -> List[Dict[str, str]]:
+        """list.copy() compatibility: an independent list of dicts."""
+        return self.to_dicts()
+
+
+__all__ = [
+    "BlockEntry",
+    "BlockList",
+]
@@ -0,0 +1,264 @@
+"""
+core/cgroups.py
+Identificazione delle app tramite il cgroup dei processi.
+Sui desktop moderni ogni app gira in uno scope systemd dedicato
+(app-flatpak-com.discordapp.Discord-1234.scope, snap.spotify.spotify-<uuid>.scope,
+app-gnome-firefox-5678.scope): il cgroup identifica l'app anche quando il
+binario è rinominato o avviato da un wrapper. Uno scope intero può essere
+terminato con una sola scrittura su cgroup.kill (Linux >= 5.14) o congelato
+con cgroup.freeze (Linux >= 5.2).
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from focus_mode_app.core import procfs
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# app[-<launcher>]-<app id>[-<random>].scope or app[-<launcher>]-<app id>[@<random>].service
+_APP_UNIT = re.compile(
+    r"app-(?:(?P<launcher>flatpak|gnome|kde|dbus|xdg|systemd)-)?(?P<app_id>.+?)"
+    r"(?:-[0-9a-f]+)?(?:@[^.]*)?\.(?:scope|service)$"
+)
+
+# snap.<snap name>.<app name>[-<uuid>].scope (or .service)
+_SNAP_UNIT = re.compile(
+    r"snap\.(?P<snap>[^.]+)\.(?P<app>.+?)(?:-[0-9a-f-]{36}|-\d+)?\.(?:scope|service)$"
+)
+
+# Kinds of scope that hold exactly one sandboxed app
+SANDBOX_KINDS = ("flatpak", "snap")
+
+
+class AppIdentity:
+    """The app a process belongs to, derived from its cgroup.
+
+    Attributes:
+        cgroup (str): The cgroup v2 path of the process.
+        unit (str): The systemd unit (last path component).
+        app_id (Optional[str]): The desktop app-id (or snap name), if any.
+        kind (Optional[str]): "flatpak", "snap" or "app" (other launchers);
+            None when the process is not in an app unit.
+    """
+
+    __slots__ = ("cgroup", "unit", "app_id", "kind")
+
+    def __init__(
+        self, cgroup: str, unit: str, app_id: Optional[str], kind: Optional[str]
+    ) -> None:
+        self.cgroup = cgroup
+        self.unit = unit
+        self.app_id = app_id
+        self.kind = kind
+
+    @property
+    def is_scope(self) -> bool:
+        """True if the process lives in a transient app scope that can be killed."""
+        return self.kind is not None and self.unit.endswith(".scope")
+
+    def __repr__(self) -> str:
+        return f"AppIdentity(app_id={self.app_id!r}, kind={self.kind!r}, unit={self.unit!r})"
+
+
+@lru_cache(maxsize=1024)
+def identify(cgroup: str) -> AppIdentity:
+    """Map a cgroup path to the app it belongs to.
+
+    Many processes share the same scope, so results are cached by path.
+
+    Args:
+        cgroup (str): The cgroup path from /proc/<pid>/cgroup.
+
+    Returns:
+        AppIdentity: The identity; `app_id` is None outside app units.
+    """
+    unit = cgroup.rsplit("/", 1)[-1]
+
+    match = _APP_UNIT.match(unit)
+    if match:
+        kind = "flatpak" if match.group("launcher") == "flatpak" else "app"
+        return AppIdentity(cgroup, unit, match.group("app_id"), kind)
+
+    match = _SNAP_UNIT.match(unit)
+    if match:
+        return AppIdentity(cgroup, unit, match.group("snap"), "snap")
+
+    return AppIdentity(cgroup, unit, None, None)
+
+
+def app_id_from_cgroup(cgroup: Optional[str]) -> Optional[str]:
+    """Extract the desktop app-id from a process cgroup path.
+
+    Args:
+        cgroup (Optional[str]): The cgroup path, e.g. ".../app-flatpak-
+            com.discordapp.Discord-12345.scope".
+
+    Returns:
+        Optional[str]: The app-id, or None if the process is not in an app unit.
+    """
+    if not cgroup:
+        return None
+    return identify(cgroup).app_id
+
+
+def identify_pid(pid: int) -> Optional[AppIdentity]:
+    """Read the cgroup of a process and identify its app.
+
+    Args:
+        pid (int): The process identifier.
+
+    Returns:
+        Optional[AppIdentity]: The identity, or None if the cgroup is unreadable.
+    """
+    cgroup = procfs.read_cgroup(pid)
+    return identify(cgroup) if cgroup else None
+
+
+def cgroup_dir(cgroup: str) -> Path:
+    """Return the cgroupfs directory of a cgroup path.
+
+    Args:
+        cgroup (str): The cgroup path from /proc/<pid>/cgroup.
+
+    Returns:
+        Path: The directory under `CGROUP_ROOT`.
+    """
+    return CGROUP_ROOT / cgroup.lstrip("/")
+
+
+def _scope_dir(identity: AppIdentity) -> Optional[Path]:
+    """Return the cgroupfs directory of an app scope, if it exists."""
+    if not identity.is_scope:
+        return None
+    path = cgroup_dir(identity.cgroup)
+    return path if path.is_dir() else None
+
+
+def _write_control(path: Path, value: str) -> bool:
+    """Write a value to a cgroup control file.
+
+    Returns:
+        bool: True if the kernel accepted the write.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CLOEXEC)
+    except OSError:
+        return False
+    try:
+        os.write(fd, value.encode())
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+def scope_pids(identity: AppIdentity) -> List[int]:
+    """List the processes currently in the scope of an app.
+
+    Args:
+        identity (AppIdentity): The app identity.
+
+    Returns:
+        List[int]: The PIDs in the scope; empty if it cannot be read.
+    """
+    path = _scope_dir(identity)
+    if path is None:
+        return []
+    return read_pids(path)
+
+
+def read_pids(directory: Path) -> List[int]:
+    """List the processes of a cgroup directory.
+
+    Args:
+        directory (Path): The cgroupfs directory.
+
+    Returns:
+        List[int]: The PIDs in cgroup.procs; empty if it cannot be read.
+    """
+    try:
+        with open(directory / "cgroup.procs", "r") as f:
+            return [int(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return []
+
+
+def kill_scope(identity: AppIdentity) -> bool:
+    """SIGKILL every process of an app scope with a single cgroup.kill write.
+
+    Args:
+        identity (AppIdentity): The app identity.
+
+    Returns:
+        bool: True if the kernel accepted the write; False if the scope is
+        not an app scope, cgroup.kill is missing (Linux < 5.14) or not writable.
+    """
+    path = _scope_dir(identity)
+    if path is None:
+        return False
+    return _write_control(path / "cgroup.kill", "1")
+
+
+def freeze_scope(identity: AppIdentity, frozen: bool = True) -> bool:
+    """Freeze (or thaw) every process of an app scope in place.
+
+    Args:
+        identity (AppIdentity): The app identity.
+        frozen (bool, optional): True to freeze, False to thaw.
+
+    Returns:
+        bool: True if the kernel accepted the write.
+    """
+    path = _scope_dir(identity)
+    if path is None:
+        return False
+    return set_frozen(path, frozen)
+
+
+def set_frozen(directory: Path, frozen: bool) -> bool:
+    """Write cgroup.freeze of a cgroup directory (Linux >= 5.2).
+
+    Args:
+        directory (Path): The cgroupfs directory.
+        frozen (bool): True to freeze, False to thaw.
+
+    Returns:
+        bool: True if the kernel accepted the write.
+    """
+    return _write_control(directory / "cgroup.freeze", "1" if frozen else "0")
+
+
+def move_process(directory: Path, pid: int) -> bool:
+    """Move a process (with all its threads) into a cgroup.
+
+    Args:
+        directory (Path): The destination cgroupfs directory.
+        pid (int): The process identifier.
+
+    Returns:
+        bool: True if the kernel accepted the move; False when the cgroup
+        tree is not delegated to us or the process exited.
+    """
+    return _write_control(directory / "cgroup.procs", str(pid))
+
+
+__all__ = [
+    "CGROUP_ROOT",
+    "SANDBOX_KINDS",
+    "AppIdentity",
+    "identify",
+    "identify_pid",
+    "app_id_from_cgroup",
+    "cgroup_dir",
+    "read_pids",
+    "scope_pids",
+    "kill_scope",
+    "freeze_scope",
+    "set_frozen",
+    "move_process",
+]
@@ -0,0 +1,301 @@
+"""
+core/freezer.py
+Modalità "freeze": blocco delle app senza terminarle.
+I processi bloccati vengono spostati in un cgroup v2 dedicato all'app e
+congelati con cgroup.freeze; le app già isolate in uno scope (Flatpak, Snap,
+regole appid) vengono congelate sul posto. Alla fine del blocco i processi
+vengono scongelati e riportati nel cgroup di origine: il ripristino è
+istantaneo e senza perdita di stato. Dove i cgroup non sono delegati
+all'utente si usa SIGSTOP/SIGCONT.
+"""
+
+import atexit
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import psutil
+
+from focus_mode_app.config import FREEZE_CGROUP_NAME
+from focus_mode_app.core import cgroups, procfs
+
+
+class FrozenApp:
+    """The processes frozen for a single blocklist rule.
+
+    Attributes:
+        rule (str): The blocklist rule that matched.
+        procs (List[psutil.Process]): The frozen processes.
+        directory (Optional[Path]): The frozen cgroup, None with SIGSTOP.
+        in_place (bool): True if `directory` is the app's own scope, which is
+            thawed but neither emptied nor removed.
+        origins (Dict[int, str]): Original cgroup of every moved process.
+    """
+
+    __slots__ = ("rule", "procs", "directory", "in_place", "origins")
+
+    def __init__(self, rule: str) -> None:
+        self.rule = rule
+        self.procs: List[psutil.Process] = []
+        self.directory: Optional[Path] = None
+        self.in_place = False
+        self.origins: Dict[int, str] = {}
+
+
+def _group_name(rule: str) -> str:
+    """Turn a rule into a valid cgroup directory name."""
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", rule).strip("._")[:64]
+    return name or "app"
+
+
+class Freezer:
+    """Freezes matched processes and thaws them all at once.
+
+    Thread-safe: the blocking loop freezes while the GUI thread may thaw.
+    """
+
+    def __init__(self, group_name: str = FREEZE_CGROUP_NAME) -> None:
+        """Create a freezer.
+
+        Args:
+            group_name (str, optional): Name of the parent cgroup of the
+                per-app freezer cgroups, created next to our own cgroup.
+        """
+        self._group_name = group_name
+        self._apps: Dict[str, FrozenApp] = {}
+        self._frozen_pids: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def frozen_count(self) -> int:
+        """Number of processes currently frozen."""
+        return len(self._frozen_pids)
+
+    def is_frozen(self, pid: int) -> bool:
+        """Check whether a process was frozen by this freezer.
+
+        Args:
+            pid (int): The process identifier.
+
+        Returns:
+            bool: True if the process is frozen.
+        """
+        return pid in self._frozen_pids
+
+    def _base_dir(self) -> Optional[Path]:
+        """Return the parent cgroup of the per-app freezers, next to our own."""
+        own = procfs.read_cgroup(os.getpid())
+        if not own or own == "/":
+            return None
+        return cgroups.cgroup_dir(own).parent / self._group_name
+
+    # ------------------------------------------------------------------
+    # Freeze
+    # ------------------------------------------------------------------
+
+    def freeze_scope(self, rule: str, identity: cgroups.AppIdentity) -> int:
+        """Freeze a whole app scope in place.
+
+        Args:
+            rule (str): The blocklist rule that matched.
+            identity (cgroups.AppIdentity): The scope of the app.
+
+        Returns:
+            int: The number of processes frozen; 0 if the scope cannot be
+            frozen (the caller then freezes the processes one by one).
+        """
+        with self._lock:
+            pids = cgroups.scope_pids(identity)
+            if not pids or all(pid in self._frozen_pids for pid in pids):
+                return 0
+            if not cgroups.freeze_scope(identity):
+                return 0
+
+            app = self._apps.setdefault(identity.cgroup, FrozenApp(rule))
+            app.directory = cgroups.cgroup_dir(identity.cgroup)
+            app.in_place = True
+            for pid in pids:
+                try:
+                    app.procs.append(psutil.Process(pid))
+                except psutil.Error:
+                    continue
+                self._frozen_pids.add(pid)
+
+        print(
+            f"[INFO] Freezing app scope: {rule} ({identity.unit}, {len(pids)} processi)"
+        )
+        return len(pids)
+
+    def freeze(self, rule: str, procs: List[psutil.Process]) -> int:
+        """Freeze processes matched by a rule.
+
+        The processes are moved into the per-app freezer cgroup; if that is
+        not possible they are stopped with SIGSTOP.
+
+        Args:
+            rule (str): The blocklist rule that matched.
+            procs (List[psutil.Process]): The processes to freeze; the ones
+                already frozen are skipped.
+
+        Returns:
+            int: The number of processes newly frozen.
+        """
+        with self._lock:
+            new = [proc for proc in procs if proc.pid not in self._frozen_pids]
+            if not new:
+                return 0
+
+            app = self._apps.setdefault(rule, FrozenApp(rule))
+            frozen = self._freeze_in_cgroup(app, new)
+            if frozen is None:
+                frozen = self._stop(app, new)
+
+            for proc in frozen:
+                self._frozen_pids.add(proc.pid)
+            app.procs.extend(frozen)
+
+        if frozen:
+            method = "cgroup" if app.directory is not None else "SIGSTOP"
+            print(f"[INFO] Freezing: {rule} ({len(frozen)} processi, {method})")
+        return len(frozen)
+
+    def _freeze_in_cgroup(
+        self, app: FrozenApp, procs: List[psutil.Process]
+    ) -> Optional[List[psutil.Process]]:
+        """Move processes into the app's freezer cgroup and freeze it.
+
+        Returns:
+            Optional[List[psutil.Process]]: The processes frozen, or None if
+            cgroups cannot be used (nothing has been changed then).
+        """
+        if app.directory is None:
+            base = self._base_dir()
+            if base is None:
+                return None
+            directory = base / _group_name(app.rule)
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                return None
+        elif app.in_place:
+            return None
+        else:
+            directory = app.directory
+
+        moved: List[psutil.Process] = []
+        for proc in procs:
+            origin = procfs.read_cgroup(proc.pid)
+            if origin is None:
+                continue
+            if not cgroups.move_process(directory, proc.pid):
+                continue
+            app.origins[proc.pid] = origin
+            moved.append(proc)
+
+        if not moved or not cgroups.set_frozen(directory, True):
+            # Not delegated to us: undo and let the caller use SIGSTOP
+            self._move_back(app, moved)
+            if app.directory is None:
+                _remove_dir(directory)
+            return None
+
+        app.directory = directory
+        return moved
+
+    @staticmethod
+    def _stop(app: FrozenApp, procs: List[psutil.Process]) -> List[psutil.Process]:
+        """Stop processes with SIGSTOP."""
+        stopped: List[psutil.Process] = []
+        for proc in procs:
+            try:
+                proc.suspend()
+                stopped.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return stopped
+
+    # ------------------------------------------------------------------
+    # Thaw
+    # ------------------------------------------------------------------
+
+    def thaw_all(self) -> int:
+        """Resume every frozen process and remove the freezer cgroups.
+
+        Returns:
+            int: The number of processes resumed.
+        """
+        with self._lock:
+            apps = list(self._apps.values())
+            self._apps.clear()
+            self._frozen_pids.clear()
+
+            thawed = 0
+            for app in apps:
+                thawed += self._thaw(app)
+
+            self._thaw_leftovers()
+
+        if thawed:
+            print(f"[INFO] Scongelati {thawed} processi")
+        return thawed
+
+    def _thaw(self, app: FrozenApp) -> int:
+        """Resume the processes of a single app."""
+        alive = [proc for proc in app.procs if proc.is_running()]
+
+        if app.directory is None:
+            for proc in alive:
+                try:
+                    proc.resume()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return len(alive)
+
+        cgroups.set_frozen(app.directory, False)
+        if not app.in_place:
+            self._move_back(app, alive)
+            _remove_dir(app.directory)
+        return len(alive)
+
+    @staticmethod
+    def _move_back(app: FrozenApp, procs: List[psutil.Process]) -> None:
+        """Return moved processes to their original cgroup, where it still exists."""
+        for proc in procs:
+            origin = app.origins.pop(proc.pid, None)
+            if origin is not None:
+                cgroups.move_process(cgroups.cgroup_dir(origin), proc.pid)
+
+    def _thaw_leftovers(self) -> None:
+        """Thaw freezer cgroups left behind by a previous run that crashed."""
+        base = self._base_dir()
+        if base is None or not base.is_dir():
+            return
+
+        for directory in base.iterdir():
+            if directory.is_dir():
+                cgroups.set_frozen(directory, False)
+                _remove_dir(directory)
+        _remove_dir(base)
+
+
+def _remove_dir(directory: Path) -> None:
+    """Remove a cgroup directory; it stays if processes are still inside."""
+    try:
+        directory.rmdir()
+    except OSError:
+        pass
+
+
+freezer = Freezer()
+
+# Never leave apps frozen when the application exits
+atexit.register(freezer.thaw_all)
+
+
+__all__ = [
+    "FrozenApp",
+    "Freezer",
+    "freezer",
+]
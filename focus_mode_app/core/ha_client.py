@@ -23,7 +23,7 @@ from typing import Any
 
 import requests
 
-from focus_mode_app.config import DATA_DIR
+from focus_mode_app.config import DATA_DIR, HA_PUSH_COALESCE_WINDOW
 from focus_mode_app.api.signals import api_action_queue
 
 _LOGGER = logging.getLogger(__name__)
@@ -347,10 +347,26 @@ def push_current_state() -> bool:
     """
     Push current daemon state to HA using the native client.
     Returns True if sent, False if client not configured.
+
+    Pushes are coalesced: at most one every HA_PUSH_COALESCE_WINDOW seconds,
+    the ones requested in between are merged into a single push of the
+    state at the end of the window.
     """
     if _client is None or not _client.webhook_id:
         return False
 
+    from focus_mode_app.core.notifications import dispatcher
+
+    dispatcher.throttle("ha_push", _push_state_now, HA_PUSH_COALESCE_WINDOW)
+    return True
+
+
+def _push_state_now() -> None:
+    """Read the daemon state and push it to HA."""
+    client = _client
+    if client is None or not client.webhook_id:
+        return
+
     from focus_mode_app.core.blocker import get_blocking_stats, is_restore_enabled
     from focus_mode_app.core.storage import blocked_items
 
@@ -361,8 +377,7 @@ def push_current_state() -> bool:
         "blocked_items": blocked_items,
         "focus_lock": stats.get("focus_lock", {}),
     }
-    _client.push_state(state)
-    return True
+    client.push_state(state)
 
 
 def _stable_device_id() -> str:
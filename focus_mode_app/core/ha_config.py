@@ -6,19 +6,31 @@ Gestisce il salvataggio e il caricamento di:
 - URL del webhook "dying gasp" (notifica spegnimento app → HA)
 - URL del webhook eventi di stato (push real-time cambio stato → HA)
 - Long-Lived Access Token HA (per future chiamate API verso HA)
+
+La configurazione viene tenuta in cache (`get_ha_config()`): il file viene
+riletto solo quando inode, mtime o dimensione cambiano, e lo stat stesso è
+limitato a uno ogni HA_CONFIG_RECHECK_INTERVAL secondi, così i percorsi caldi
+di API e notifier non fanno I/O su file.
 """
 
 import json
 import logging
 import os
+import threading
+import time
 from pathlib import Path
+from typing import Optional, Tuple
 
 from focus_mode_app.config import DATA_DIR
+from focus_mode_app.core.atomic_io import read_json, write_json_atomic
 
 _LOGGER = logging.getLogger(__name__)
 
 HA_CONFIG_FILE: Path = DATA_DIR / "ha_config.json"
 
+# Minimo intervallo (secondi) tra due controlli di modifica del file
+HA_CONFIG_RECHECK_INTERVAL: float = 1.0
+
 _DEFAULTS: dict = {
     "ha_url": "",
     "llat": "",
@@ -29,9 +41,100 @@ _DEFAULTS: dict = {
 }
 
 
+class HAConfig:
+    """
+    Configurazione HA immutabile, con accessori tipizzati.
+
+    Gli URL webhook legacy sono già risolti: se ha_url e webhook_id sono
+    configurati puntano al webhook del dispositivo registrato.
+    """
+
+    __slots__ = (
+        "ha_url",
+        "llat",
+        "webhook_id",
+        "dying_gasp_url",
+        "state_event_url",
+        "_data",
+    )
+
+    def __init__(self, data: dict) -> None:
+        """
+        Args:
+            data: Configurazione completa (default inclusi), come da load_ha_config().
+        """
+        self._data = dict(data)
+        self.ha_url: str = data.get("ha_url", "") or ""
+        self.llat: str = data.get("llat", "") or ""
+        self.webhook_id: str = data.get("webhook_id", "") or ""
+
+        if self.ha_url and self.webhook_id:
+            webhook = f"{self.ha_url.rstrip('/')}/api/webhook/{self.webhook_id}"
+            self.dying_gasp_url: str = webhook
+            self.state_event_url: str = webhook
+        else:
+            self.dying_gasp_url = data.get("dying_gasp_url", "") or ""
+            self.state_event_url = data.get("state_event_url", "") or ""
+
+    def as_dict(self) -> dict:
+        """Copia della configurazione grezza, nel formato di load_ha_config()."""
+        return dict(self._data)
+
+
+# (inode, mtime_ns, size) del file letto, None se il file non esisteva
+_FileStamp = Optional[Tuple[int, int, int]]
+
+_cache: Optional[HAConfig] = None
+_cache_stamp: _FileStamp = None
+_cache_checked_at: float = float("-inf")
+_cache_lock = threading.Lock()
+
+
+def _file_stamp() -> _FileStamp:
+    try:
+        st = os.stat(HA_CONFIG_FILE)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def get_ha_config() -> HAConfig:
+    """
+    Configurazione HA in cache.
+
+    Il file viene riletto solo se è cambiato (inode, mtime o dimensione), e il
+    controllo avviene al più una volta ogni HA_CONFIG_RECHECK_INTERVAL secondi.
+
+    Returns:
+        HAConfig con i valori correnti (default se il file manca o è corrotto).
+    """
+    global _cache, _cache_stamp, _cache_checked_at
+
+    now = time.monotonic()
+    cached = _cache
+    if cached is not None and now - _cache_checked_at < HA_CONFIG_RECHECK_INTERVAL:
+        return cached
+
+    with _cache_lock:
+        stamp = _file_stamp()
+        if _cache is None or stamp != _cache_stamp:
+            _cache = HAConfig(load_ha_config())
+            _cache_stamp = stamp
+        _cache_checked_at = now
+        return _cache
+
+
+def invalidate_ha_config() -> None:
+    """Forza la rilettura del file alla prossima get_ha_config()."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
 def load_ha_config() -> dict:
     """
-    Carica la configurazione HA dal file JSON.
+    Carica la configurazione HA dal file JSON (sempre dal disco; per i
+    percorsi caldi usare get_ha_config()).
 
     Returns:
         dict con chiavi dying_gasp_url, state_event_url, llat.
@@ -42,8 +145,7 @@ def load_ha_config() -> dict:
         return dict(_DEFAULTS)
 
     try:
-        with open(HA_CONFIG_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(HA_CONFIG_FILE)
         cfg = {**_DEFAULTS, **data}
         _LOGGER.debug(
             "Config loaded: ha_url=%s webhook_id=%s llat=%s",
@@ -91,13 +193,9 @@ def save_ha_config(
             "state_event_url": state_event_url or existing.get("state_event_url", ""),
         }
 
-        with open(HA_CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=4, ensure_ascii=False)
-
-        try:
-            os.chmod(HA_CONFIG_FILE, 0o600)
-        except OSError:
-            pass
+        # The token must never be readable by others, not even briefly
+        write_json_atomic(HA_CONFIG_FILE, payload, indent=4, file_mode=0o600)
+        invalidate_ha_config()
 
         _LOGGER.info(
             "Config saved → %s  ha_url=%s  webhook_id=%s  llat=%s",
@@ -115,47 +213,40 @@ def save_ha_config(
 
 def get_ha_url() -> str:
     """URL base di Home Assistant. Stringa vuota se non configurato."""
-    return load_ha_config().get("ha_url", "")
+    return get_ha_config().ha_url
 
 
 def get_webhook_id() -> str:
     """Webhook ID ricevuto dopo la registrazione. Stringa vuota se non registrato."""
-    return load_ha_config().get("webhook_id", "")
+    return get_ha_config().webhook_id
 
 
 def save_webhook_id(webhook_id: str) -> bool:
     """Salva solo il webhook_id (dopo registrazione)."""
-    existing = load_ha_config()
-    return save_ha_config(
-        llat=existing.get("llat", ""),
-        ha_url=existing.get("ha_url", ""),
-        webhook_id=webhook_id,
-    )
+    cfg = get_ha_config()
+    return save_ha_config(llat=cfg.llat, ha_url=cfg.ha_url, webhook_id=webhook_id)
 
 
 def get_dying_gasp_url() -> str:
     """URL webhook dying gasp (legacy). Stringa vuota se non configurato."""
-    cfg = load_ha_config()
-    if cfg.get("ha_url") and cfg.get("webhook_id"):
-        return f"{cfg['ha_url'].rstrip('/')}/api/webhook/{cfg['webhook_id']}"
-    return cfg.get("dying_gasp_url", "")
+    return get_ha_config().dying_gasp_url
 
 
 def get_state_event_url() -> str:
     """URL webhook eventi di stato (legacy). Stringa vuota se non configurato."""
-    cfg = load_ha_config()
-    if cfg.get("ha_url") and cfg.get("webhook_id"):
-        return f"{cfg['ha_url'].rstrip('/')}/api/webhook/{cfg['webhook_id']}"
-    return cfg.get("state_event_url", "")
+    return get_ha_config().state_event_url
 
 
 def get_llat() -> str:
     """Home Assistant Long-Lived Access Token. Stringa vuota se non configurato."""
-    return load_ha_config().get("llat", "")
+    return get_ha_config().llat
 
 
 __all__ = [
     "HA_CONFIG_FILE",
+    "HAConfig",
+    "get_ha_config",
+    "invalidate_ha_config",
     "load_ha_config",
     "save_ha_config",
     "save_webhook_id",
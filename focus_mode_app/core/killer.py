@@ -0,0 +1,278 @@
+"""
+core/killer.py
+Pipeline di terminazione dei processi bloccati.
+Invia SIGTERM a tutto il batch, attende tutti i processi insieme e passa a
+SIGKILL per quelli ancora vivi, fino a MAX_KILL_ATTEMPTS tentativi. Le app hanno
+così modo di salvare il proprio stato, e un processo lento non blocca la
+scansione più di PROCESS_KILL_TIMEOUT secondi per tentativo.
+Dove il kernel lo supporta (Linux >= 5.3) ogni processo viene agganciato a un
+pidfd: i segnali non possono raggiungere un PID riciclato nel frattempo e
+l'uscita di tutto il batch viene attesa con un unico selector.
+"""
+
+import errno
+import os
+import selectors
+import signal
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+import psutil
+
+from focus_mode_app.config import PROCESS_KILL_TIMEOUT, MAX_KILL_ATTEMPTS
+
+_Handle = TypeVar("_Handle")
+
+# Cleared on the first ENOSYS/EPERM from pidfd_open (old kernel, seccomp filter)
+_pidfd_supported = hasattr(os, "pidfd_open") and hasattr(signal, "pidfd_send_signal")
+
+
+def _escalate(
+    handles: List[_Handle],
+    send: Callable[[List[_Handle], bool], Tuple[List[_Handle], List[_Handle]]],
+    wait: Callable[[List[_Handle], float], Tuple[List[_Handle], List[_Handle]]],
+    timeout: float,
+    attempts: int,
+) -> Tuple[List[_Handle], List[_Handle]]:
+    """Run the SIGTERM-then-SIGKILL sequence over a batch of process handles.
+
+    Args:
+        handles (List[_Handle]): The processes to terminate.
+        send (Callable): Signals the batch (SIGKILL when the flag is True) and
+            returns the handles signalled and the ones that had already exited.
+        wait (Callable): Waits up to the given seconds and returns the handles
+            that exited and the ones still alive.
+        timeout (float): Seconds to wait for the batch on each attempt.
+        attempts (int): Maximum number of signals sent to each process.
+
+    Returns:
+        Tuple[List[_Handle], List[_Handle]]: Exited and surviving handles.
+    """
+    # Processes already gone before the first signal were not killed by us
+    alive, _ = send(handles, False)
+    gone: List[_Handle] = []
+
+    for attempt in range(1, max(attempts, 1) + 1):
+        if not alive:
+            break
+
+        if attempt > 1:
+            alive, vanished = send(alive, True)
+            gone.extend(vanished)
+
+        exited, alive = wait(alive, timeout)
+        gone.extend(exited)
+
+    return gone, alive
+
+
+# ============================================================================
+# PSUTIL
+# ============================================================================
+
+
+def _signal_all(
+    procs: List[psutil.Process], force: bool
+) -> Tuple[List[psutil.Process], List[psutil.Process]]:
+    """Send SIGTERM (or SIGKILL) to every process of the batch.
+
+    Args:
+        procs (List[psutil.Process]): The processes to signal.
+        force (bool): Send SIGKILL instead of SIGTERM.
+
+    Returns:
+        Tuple[List[psutil.Process], List[psutil.Process]]: The processes that
+        were signalled and the ones that had already exited.
+    """
+    signalled: List[psutil.Process] = []
+    vanished: List[psutil.Process] = []
+    for proc in procs:
+        try:
+            if force:
+                proc.kill()
+            else:
+                proc.terminate()
+            signalled.append(proc)
+        except psutil.NoSuchProcess:
+            vanished.append(proc)
+        except psutil.AccessDenied:
+            continue
+    return signalled, vanished
+
+
+def _wait_procs(
+    procs: List[psutil.Process], timeout: float
+) -> Tuple[List[psutil.Process], List[psutil.Process]]:
+    """Wait for the whole batch at once with psutil.wait_procs."""
+    gone, alive = psutil.wait_procs(procs, timeout=timeout)
+    return list(gone), list(alive)
+
+
+# ============================================================================
+# PIDFD
+# ============================================================================
+
+
+def _open_pidfd(proc: psutil.Process) -> Optional[int]:
+    """Open a pidfd bound to `proc`.
+
+    Args:
+        proc (psutil.Process): The process to pin.
+
+    Returns:
+        Optional[int]: The descriptor, or None if the process already exited or
+        its PID now belongs to a different process.
+
+    Raises:
+        OSError: If the kernel does not support pidfds.
+    """
+    try:
+        fd = os.pidfd_open(proc.pid)
+    except ProcessLookupError:
+        return None
+
+    # The pidfd pins the process it was opened on: if that is still the one
+    # psutil knows (same create_time), every later signal reaches it and no
+    # recycled PID can be hit.
+    if not proc.is_running():
+        os.close(fd)
+        return None
+    return fd
+
+
+def _pidfd_signal_all(fds: List[int], force: bool) -> Tuple[List[int], List[int]]:
+    """Send SIGTERM (or SIGKILL) through every pidfd of the batch.
+
+    Args:
+        fds (List[int]): The pidfds to signal.
+        force (bool): Send SIGKILL instead of SIGTERM.
+
+    Returns:
+        Tuple[List[int], List[int]]: The pidfds signalled and the ones whose
+        process had already exited.
+    """
+    sig = signal.SIGKILL if force else signal.SIGTERM
+    signalled: List[int] = []
+    vanished: List[int] = []
+    for fd in fds:
+        try:
+            signal.pidfd_send_signal(fd, sig)
+            signalled.append(fd)
+        except ProcessLookupError:
+            vanished.append(fd)
+        except PermissionError:
+            continue
+    return signalled, vanished
+
+
+def _pidfd_wait(fds: List[int], timeout: float) -> Tuple[List[int], List[int]]:
+    """Wait for the processes of the batch to exit by polling their pidfds.
+
+    A pidfd becomes readable when its process terminates, so the whole batch
+    is awaited by a single selector, without a thread or a busy loop per process.
+
+    Args:
+        fds (List[int]): The pidfds to watch.
+        timeout (float): Maximum seconds to wait.
+
+    Returns:
+        Tuple[List[int], List[int]]: The pidfds whose process exited and the
+        ones still alive.
+    """
+    exited: List[int] = []
+    deadline = time.monotonic() + timeout
+
+    with selectors.DefaultSelector() as selector:
+        for fd in fds:
+            selector.register(fd, selectors.EVENT_READ)
+
+        while len(exited) < len(fds):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                selector.unregister(key.fd)
+                exited.append(key.fd)
+
+    done = set(exited)
+    return exited, [fd for fd in fds if fd not in done]
+
+
+def _terminate_with_pidfds(
+    procs: List[psutil.Process], timeout: float, attempts: int
+) -> Tuple[List[psutil.Process], List[psutil.Process]]:
+    """Pin every process to a pidfd, then run the escalation through them.
+
+    Raises:
+        OSError: If pidfds are not supported; no signal has been sent yet.
+    """
+    pidfds: Dict[int, psutil.Process] = {}
+    try:
+        for proc in procs:
+            fd = _open_pidfd(proc)
+            if fd is not None:
+                pidfds[fd] = proc
+
+        gone, alive = _escalate(
+            list(pidfds), _pidfd_signal_all, _pidfd_wait, timeout, attempts
+        )
+        return [pidfds[fd] for fd in gone], [pidfds[fd] for fd in alive]
+    finally:
+        for fd in pidfds:
+            os.close(fd)
+
+
+# ============================================================================
+# API
+# ============================================================================
+
+
+def terminate_processes(
+    procs: Iterable[psutil.Process],
+    timeout: float = PROCESS_KILL_TIMEOUT,
+    attempts: int = MAX_KILL_ATTEMPTS,
+) -> Tuple[List[psutil.Process], List[psutil.Process]]:
+    """Terminate a batch of processes, escalating from SIGTERM to SIGKILL.
+
+    The first attempt sends SIGTERM, every following one SIGKILL to the
+    survivors. Each attempt waits for the whole batch at once, so the total
+    time is bounded by `attempts * timeout` regardless of the batch size.
+    Signals go through pidfds when available, else through psutil.
+
+    Args:
+        procs (Iterable[psutil.Process]): The processes to terminate.
+        timeout (float, optional): Seconds to wait for the batch on each attempt.
+        attempts (int, optional): Maximum number of signals sent to each process.
+
+    Returns:
+        Tuple[List[psutil.Process], List[psutil.Process]]: The processes that
+        exited and the ones still alive after the last attempt. Processes that
+        were already gone or could not be signalled are in neither list.
+    """
+    global _pidfd_supported
+
+    procs = list(procs)
+    result: Optional[Tuple[List[psutil.Process], List[psutil.Process]]] = None
+
+    if _pidfd_supported:
+        try:
+            result = _terminate_with_pidfds(procs, timeout, attempts)
+        except OSError as e:
+            if e.errno in (errno.ENOSYS, errno.EPERM):
+                print(f"[INFO] pidfd non disponibile ({e}), uso psutil")
+                _pidfd_supported = False
+            else:
+                print(f"[WARNING] Errore pidfd ({e}), uso psutil per questo batch")
+
+    if result is None:
+        result = _escalate(procs, _signal_all, _wait_procs, timeout, attempts)
+
+    for proc in result[1]:
+        print(f"[WARNING] Processo {proc.pid} ancora attivo dopo {attempts} tentativi")
+
+    return result
+
+
+__all__ = [
+    "terminate_processes",
+]
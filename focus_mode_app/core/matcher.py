@@ -0,0 +1,373 @@
+"""
+core/matcher.py
+Indice compilato delle regole della blocklist.
+Tutte le regole "app" vengono compilate in un'unica regex, e lo stesso per le
+regole "webapp"; i tipi di regola precisi (nome esatto, glob, regex, percorso
+dell'eseguibile, app-id del cgroup, argv[N]) sono indicizzati per tipo, così il
+costo di matching per processo non dipende dal numero di elementi bloccati.
+L'indice viene ricostruito solo quando la blocklist cambia, cosa che per una
+BlockList si verifica confrontando il solo numero di versione.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from focus_mode_app.core.cgroups import app_id_from_cgroup
+
+# Every rule type a blocklist item may have
+RULE_TYPES = ("app", "webapp", "comm", "glob", "regex", "exe", "appid", "argv")
+
+# Rule types matched against a single process (everything except "webapp")
+PROCESS_RULE_TYPES = tuple(t for t in RULE_TYPES if t != "webapp")
+
+# argv rules are written "N:<glob>", e.g. "1:*.jar"
+_ARGV_RULE = re.compile(r"(\d+):(.+)", re.DOTALL)
+
+
+def validate_rule(name: str, item_type: str) -> Optional[str]:
+    """Check that a blocklist item can be compiled.
+
+    Args:
+        name (str): The rule (name, pattern, path...).
+        item_type (str): One of `RULE_TYPES`.
+
+    Returns:
+        Optional[str]: A description of the problem, or None if the rule is valid.
+    """
+    if item_type not in RULE_TYPES:
+        return f"Tipo non valido: {item_type}"
+    if not name:
+        return "Nome vuoto"
+
+    if item_type == "regex":
+        try:
+            re.compile(name)
+        except re.error as e:
+            return f"Regex non valida: {e}"
+    elif item_type == "exe" and not name.startswith("/"):
+        return f"Il percorso dell'eseguibile deve essere assoluto: {name}"
+    elif item_type == "argv" and not _ARGV_RULE.fullmatch(name):
+        return f"Regola argv non valida (formato 'N:pattern'): {name}"
+
+    return None
+
+
+def _compile_literals(literals: Iterable[str]) -> Optional[Pattern[str]]:
+    """Compile a set of literal strings into a single alternation regex.
+
+    Longer literals come first so that, at a given position, the most
+    specific rule wins (e.g. "codex" before "code").
+
+    Args:
+        literals (Iterable[str]): The literal strings to search for.
+
+    Returns:
+        Optional[Pattern[str]]: The compiled pattern, or None if there are no literals.
+    """
+    unique = sorted({lit for lit in literals if lit}, key=len, reverse=True)
+    if not unique:
+        return None
+    return re.compile("|".join(re.escape(lit) for lit in unique))
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a shell glob (*, ?, [...]) into an unanchored regex body.
+
+    fnmatch.translate() is not used because its output contains named groups,
+    which cannot be repeated in a combined alternation.
+    """
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            out.append(".*")
+        elif c == "?":
+            out.append(".")
+        elif c == "[":
+            j = pattern.find("]", i + 1 if i < n and pattern[i] in "!]" else i)
+            if j == -1:
+                out.append("\\[")
+                continue
+            body = pattern[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            out.append(f"[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _compile_globs(
+    globs: Iterable[str], flags: int = 0
+) -> Tuple[Optional[Pattern[str]], List[str]]:
+    """Compile several globs into one full-match regex with a group per glob.
+
+    Args:
+        globs (Iterable[str]): The glob patterns.
+        flags (int, optional): Regex flags (e.g. re.IGNORECASE).
+
+    Returns:
+        Tuple[Optional[Pattern[str]], List[str]]: The pattern (None without
+        globs) and the globs indexed by group number minus one.
+    """
+    rules = list(dict.fromkeys(g for g in globs if g))
+    if not rules:
+        return None, []
+    body = "|".join(f"({_glob_to_regex(g)})" for g in rules)
+    return re.compile(f"(?s:{body})", flags), rules
+
+
+def _glob_match(
+    compiled: Tuple[Optional[Pattern[str]], List[str]], text: str
+) -> Optional[str]:
+    """Return the glob of a compiled set that matches the whole `text`, if any."""
+    pattern, rules = compiled
+    if pattern is None:
+        return None
+    match = pattern.fullmatch(text)
+    return rules[match.lastindex - 1] if match else None
+
+
+class BlocklistMatcher:
+    """Precompiled matcher for every rule type of a blocklist.
+
+    "app" rules are substrings of the process name and "webapp" rules
+    substrings of the command line, each compiled into a single regex. The
+    precise rule types are indexed so that a process costs at most one lookup
+    or one regex per type:
+
+    - "comm": exact process name (case-insensitive), hash lookup;
+    - "glob": shell pattern over the whole process name (case-insensitive);
+    - "regex": regular expression searched in the process name;
+    - "exe": absolute executable path, or a directory when ending with "/";
+    - "appid": desktop app-id (Flatpak, systemd app scope) from the cgroup;
+    - "argv": "N:<glob>", a glob over the N-th launch argument.
+
+    Attributes:
+        signature (Tuple[Tuple[str, str], ...]): The (name, type) pairs the matcher
+            was built from, used to detect blocklist changes.
+    """
+
+    def __init__(self, items: Iterable[Dict[str, str]]) -> None:
+        """Build the matcher from a list of blocklist items.
+
+        Args:
+            items (Iterable[Dict[str, str]]): Blocklist entries ({"name", "type"}).
+        """
+        self.signature: Tuple[Tuple[str, str], ...] = _signature(items)
+
+        rules: Dict[str, List[str]] = {item_type: [] for item_type in RULE_TYPES}
+        for name, item_type in self.signature:
+            if item_type in rules and validate_rule(name, item_type) is None:
+                rules[item_type].append(name)
+
+        # The matched text is the rule itself, so no capture groups are needed
+        self._app_re = _compile_literals(name.lower() for name in rules["app"])
+        self._webapp_re = _compile_literals(rules["webapp"])
+
+        self._comm = {name.lower(): name for name in reversed(rules["comm"])}
+        self._globs = _compile_globs(rules["glob"], re.IGNORECASE)
+
+        # One combined regex rejects most processes in a single search; the
+        # rule that matched is then found among the individual patterns
+        self._regexes = [re.compile(name) for name in rules["regex"]]
+        self._regex_any: Optional[Pattern[str]] = None
+        if len(self._regexes) > 1:
+            try:
+                self._regex_any = re.compile(
+                    "|".join(f"(?:{name})" for name in rules["regex"])
+                )
+            except re.error:
+                # Group names or backreferences clash once combined
+                self._regex_any = None
+
+        self._exe_paths = {
+            name: name for name in rules["exe"] if not name.endswith("/")
+        }
+        self._exe_dirs = tuple(name for name in rules["exe"] if name.endswith("/"))
+
+        self._app_ids = {name.lower(): name for name in reversed(rules["appid"])}
+
+        argv_globs: Dict[int, List[str]] = {}
+        self._argv_rules: Dict[Tuple[int, str], str] = {}
+        for name in rules["argv"]:
+            index, pattern = _ARGV_RULE.fullmatch(name).groups()
+            argv_globs.setdefault(int(index), []).append(pattern)
+            self._argv_rules.setdefault((int(index), pattern), name)
+        self._argv = {
+            index: _compile_globs(patterns) for index, patterns in argv_globs.items()
+        }
+
+    @property
+    def has_app_rules(self) -> bool:
+        """True if at least one "app" rule is compiled."""
+        return self._app_re is not None
+
+    @property
+    def has_webapp_rules(self) -> bool:
+        """True if at least one "webapp" rule is compiled."""
+        return self._webapp_re is not None
+
+    @property
+    def needs_exe(self) -> bool:
+        """True if "exe" rules require the executable path of each new process."""
+        return bool(self._exe_paths or self._exe_dirs)
+
+    @property
+    def needs_cgroup(self) -> bool:
+        """True if "appid" rules require the cgroup of each new process."""
+        return bool(self._app_ids)
+
+    def match_app(self, proc_name: str) -> Optional[str]:
+        """Return the "app" rule contained in a process name, if any.
+
+        Args:
+            proc_name (str): The process name (comm).
+
+        Returns:
+            Optional[str]: The lowercased rule name that matched, or None.
+        """
+        if self._app_re is None or not proc_name:
+            return None
+
+        match = self._app_re.search(proc_name.lower())
+        return match.group(0) if match else None
+
+    def match_app_id(self, app_id: Optional[str]) -> Optional[str]:
+        """Return the "appid" rule naming an app-id, if any.
+
+        Args:
+            app_id (Optional[str]): The app-id of a process (see core/cgroups.py).
+
+        Returns:
+            Optional[str]: The matching rule name, or None.
+        """
+        if not app_id or not self._app_ids:
+            return None
+        return self._app_ids.get(app_id.lower())
+
+    def match_process(
+        self,
+        proc_name: str,
+        cmdline: List[str],
+        exe: Optional[str] = None,
+        cgroup: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return the first process rule (any type but "webapp") matching a process.
+
+        The precise rule types are tried first, "app" substrings last.
+
+        Args:
+            proc_name (str): The process name.
+            cmdline (List[str]): The process launch arguments.
+            exe (Optional[str], optional): The executable path; only needed
+                when `needs_exe` is True.
+            cgroup (Optional[str], optional): The cgroup v2 path; only needed
+                when `needs_cgroup` is True.
+
+        Returns:
+            Optional[str]: The matching rule name, or None.
+        """
+        if proc_name:
+            rule = self._comm.get(proc_name.lower())
+            if rule is not None:
+                return rule
+
+        if self._app_ids:
+            rule = self.match_app_id(app_id_from_cgroup(cgroup))
+            if rule is not None:
+                return rule
+
+        if exe:
+            rule = self._exe_paths.get(exe)
+            if rule is not None:
+                return rule
+            for directory in self._exe_dirs:
+                if exe.startswith(directory):
+                    return directory
+
+        for index, compiled in self._argv.items():
+            if index < len(cmdline):
+                pattern = _glob_match(compiled, cmdline[index])
+                if pattern is not None:
+                    return self._argv_rules[(index, pattern)]
+
+        if proc_name:
+            rule = _glob_match(self._globs, proc_name)
+            if rule is not None:
+                return rule
+
+            if self._regexes and (
+                self._regex_any is None or self._regex_any.search(proc_name)
+            ):
+                for regex in self._regexes:
+                    if regex.search(proc_name):
+                        return regex.pattern
+
+        return self.match_app(proc_name)
+
+    def match_webapps(self, cmdline: List[str]) -> List[str]:
+        """Return every "webapp" rule contained in a process command line.
+
+        Args:
+            cmdline (List[str]): The process launch arguments.
+
+        Returns:
+            List[str]: The distinct rule strings that matched, in order of appearance.
+        """
+        if self._webapp_re is None or not cmdline:
+            return []
+
+        found: List[str] = []
+        for match in self._webapp_re.finditer(" ".join(cmdline)):
+            rule = match.group(0)
+            if rule not in found:
+                found.append(rule)
+        return found
+
+
+def _signature(items: Iterable[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((item["name"], item["type"]) for item in items)
+
+
+_matcher: Optional[BlocklistMatcher] = None
+_matcher_version: Optional[int] = None
+
+
+def get_matcher(items: Iterable[Dict[str, str]]) -> BlocklistMatcher:
+    """Return the compiled matcher for a blocklist, rebuilding it only on change.
+
+    Args:
+        items (Iterable[Dict[str, str]]): The current blocklist.
+
+    Returns:
+        BlocklistMatcher: A matcher reflecting exactly the given items.
+    """
+    global _matcher, _matcher_version
+
+    # A BlockList exposes a version: if it is unchanged there is nothing to compare
+    version = getattr(items, "version", None)
+    if _matcher is not None and version is not None and version == _matcher_version:
+        return _matcher
+
+    signature = _signature(items)
+    if _matcher is None or _matcher.signature != signature:
+        _matcher = BlocklistMatcher(items)
+        print(f"[DEBUG] Matcher ricompilato ({len(signature)} regole)")
+    _matcher_version = version
+
+    return _matcher
+
+
+__all__ = [
+    "RULE_TYPES",
+    "PROCESS_RULE_TYPES",
+    "BlocklistMatcher",
+    "validate_rule",
+    "get_matcher",
+]
@@ -1,64 +1,551 @@
 """
 core/notifications.py
 System for desktop and GUI notifications.
+Le notifiche desktop vengono accodate e inviate da un thread dedicato, così
+chi le emette (thread GUI, blocker, restore) non resta mai bloccato. Il
+backend principale parla direttamente con org.freedesktop.Notifications su
+una connessione al session bus aperta una sola volta (jeepney) e riusa
+replaces_id per aggiornare le notifiche dello stesso tipo invece di
+accumularle; senza bus o senza jeepney si ripiega su notify-send.
 """
 
-import os
+import atexit
 import subprocess
-from typing import Optional, Any
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
+from focus_mode_app.config import (
+    NOTIFICATION_BACKEND,
+    NOTIFICATION_BURST,
+    NOTIFICATION_COALESCE_WINDOW,
+    NOTIFICATION_REFILL_INTERVAL,
+    NOTIFICATION_URGENCY,
+)
+from focus_mode_app.core.subprocess_env import clean_env, which
 
-def _clean_subprocess_env() -> dict:
-    """Return an environment free of PyInstaller/AppImage library overrides.
+try:
+    from jeepney import DBusAddress, MessageType, new_method_call
+    from jeepney.io.threading import open_dbus_router
 
-    Identical logic to restore._clean_env_for_restore() — duplicated here to
-    avoid a cross-module dependency between notifications and restore.
+    _NOTIFICATIONS = DBusAddress(
+        "/org/freedesktop/Notifications",
+        bus_name="org.freedesktop.Notifications",
+        interface="org.freedesktop.Notifications",
+    )
+except ImportError:
+    open_dbus_router = None
+
+APP_NAME = "Focus Mode App"
+
+_URGENCY_LEVELS = {"low": 0, "normal": 1, "critical": 2}
+
+# Seconds to wait for the notification server to answer a Notify call
+_DBUS_TIMEOUT = 2.0
+
+# Seconds before reconnecting to the session bus after a failure
+_DBUS_RETRY_AFTER = 30.0
+
+
+class _Notification:
+    """A desktop notification waiting to be delivered.
+
+    Attributes:
+        title (str): The title of the notification.
+        message (str): The body text.
+        icon (str): The name of the system icon.
+        tag (Optional[str]): Notifications with the same tag replace each other.
+        category (str): Rate-limiting category, with its own token bucket.
+        coalesce (bool): Repeated events are held for the coalescing window
+            and shown once with their count; otherwise the latest pending
+            notification simply replaces the previous one.
     """
-    env = os.environ.copy()
-    if "APPIMAGE" in env:
-        orig = env.pop("LD_LIBRARY_PATH_ORIG", None)
-        if orig:
-            env["LD_LIBRARY_PATH"] = orig
+
+    __slots__ = ("title", "message", "icon", "tag", "category", "coalesce")
+
+    def __init__(
+        self,
+        title: str,
+        message: str,
+        icon: str,
+        tag: Optional[str],
+        category: Optional[str] = None,
+        coalesce: bool = False,
+    ) -> None:
+        self.title = title
+        self.message = message
+        self.icon = icon
+        self.tag = tag
+        self.category = category or tag or "general"
+        self.coalesce = coalesce
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """The identity used to merge pending notifications."""
+        return (self.category, self.tag or self.title)
+
+
+class _Pending:
+    """A queued notification and the events merged into it."""
+
+    __slots__ = ("notification", "count", "since", "due")
+
+    def __init__(self, notification: _Notification, now: float, due: float) -> None:
+        self.notification = notification
+        self.count = 1
+        self.since = now
+        self.due = due
+
+
+class _TokenBucket:
+    """Allows `burst` deliveries at once, then one every `refill` seconds."""
+
+    __slots__ = ("burst", "refill", "tokens", "updated")
+
+    def __init__(self, burst: int, refill: float, now: float) -> None:
+        self.burst = max(1, burst)
+        self.refill = refill
+        self.tokens = float(self.burst)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is available.
+        """
+        if self.refill > 0:
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) / self.refill
+            )
         else:
-            env.pop("LD_LIBRARY_PATH", None)
-    for var in (
-        "APPDIR",
-        "APPIMAGE",
-        "APPIMAGE_EXTRACT_AND_RUN",
-        "TCL_LIBRARY",
-        "TK_LIBRARY",
-    ):
-        env.pop(var, None)
-    return env
+            self.tokens = self.burst
+        self.updated = now
 
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) * self.refill
 
-def send_desktop_notification(
-    title: str, message: str, icon: str = "dialog-information"
-) -> None:
-    """Send a desktop notification using notify-send (standard Linux tool).
+
+class DBusNotifier:
+    """Sends notifications through org.freedesktop.Notifications.
+
+    The session-bus connection is opened on first use and kept open; after
+    a failure it is reopened at most every `_DBUS_RETRY_AFTER` seconds.
+    Only used from the notification worker thread.
+    """
+
+    def __init__(self) -> None:
+        self._router: Any = None
+        self._retry_at = 0.0
+        # Notification ID last shown for each tag, passed as replaces_id
+        self._ids: Dict[str, int] = {}
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether the D-Bus backend can be used at all (jeepney installed)."""
+        return open_dbus_router is not None
+
+    def _connect(self) -> Any:
+        """Return the session-bus router, opening it if needed."""
+        if self._router is not None:
+            return self._router
+        if open_dbus_router is None or time.monotonic() < self._retry_at:
+            return None
+        try:
+            self._router = open_dbus_router(bus="SESSION")
+        except Exception as e:
+            print(f"[WARNING] Session bus non disponibile: {e}")
+            self._retry_at = time.monotonic() + _DBUS_RETRY_AFTER
+            return None
+        return self._router
+
+    def notify(self, notification: _Notification) -> bool:
+        """Show a notification, replacing the previous one with the same tag.
+
+        Args:
+            notification (_Notification): The notification to show.
+
+        Returns:
+            bool: True if the notification server accepted it.
+        """
+        router = self._connect()
+        if router is None:
+            return False
+
+        replaces_id = self._ids.get(notification.tag, 0) if notification.tag else 0
+        hints = {"urgency": ("y", _URGENCY_LEVELS.get(NOTIFICATION_URGENCY, 1))}
+        message = new_method_call(
+            _NOTIFICATIONS,
+            "Notify",
+            "susssasa{sv}i",
+            (
+                APP_NAME,
+                replaces_id,
+                notification.icon,
+                notification.title,
+                notification.message,
+                [],
+                hints,
+                -1,
+            ),
+        )
+
+        try:
+            reply = router.send_and_get_reply(message, timeout=_DBUS_TIMEOUT)
+        except Exception as e:
+            print(f"[WARNING] Notifica D-Bus fallita: {e}")
+            self.close()
+            self._retry_at = time.monotonic() + _DBUS_RETRY_AFTER
+            return False
+
+        if reply.header.message_type == MessageType.error:
+            print(f"[WARNING] Notifica D-Bus rifiutata: {reply.body}")
+            return False
+
+        if notification.tag:
+            self._ids[notification.tag] = reply.body[0]
+        return True
+
+    def close(self) -> None:
+        """Close the session-bus connection."""
+        router, self._router = self._router, None
+        if router is not None:
+            try:
+                router.close()
+            except Exception:
+                pass
+
+
+def _notify_send(notification: _Notification) -> bool:
+    """Show a notification by spawning notify-send.
 
     Args:
-        title (str): The title of the notification.
-        message (str): The body text of the notification.
-        icon (str, optional): The name of the system icon to display. Defaults to "dialog-information".
+        notification (_Notification): The notification to show.
+
+    Returns:
+        bool: True if notify-send ran successfully.
     """
+    notify_send = which("notify-send")
+    if notify_send is None:
+        print(
+            f"[WARNING] Notification failed: notify-send not found ({notification.title})"
+        )
+        return False
+
     try:
-        subprocess.run(
+        result = subprocess.run(
             [
-                "notify-send",
-                "--urgency=normal",
-                "--app-name=Focus Mode App",
-                f"--icon={icon}",
-                title,
-                message,
+                notify_send,
+                f"--urgency={NOTIFICATION_URGENCY}",
+                f"--app-name={APP_NAME}",
+                f"--icon={notification.icon}",
+                notification.title,
+                notification.message,
             ],
-            env=_clean_subprocess_env(),
+            env=clean_env(),
             timeout=5,
             check=False,
         )
-        print(f"[INFO] Notification sent: {title}")
     except Exception as e:
         print(f"[WARNING] Notification failed: {e}")
+        return False
+    return result.returncode == 0
+
+
+class NotificationDispatcher:
+    """Rate-limits, coalesces and delivers notifications on one background thread.
+
+    Every category has its own token bucket. A notification that finds no
+    token waits in the queue, where later notifications with the same key
+    merge into it. Coalesced events (e.g. the kills of one app) are held for
+    the coalescing window and shown once: "Blocked discord x7 in last 10s".
+
+    The dispatcher also throttles arbitrary callbacks with `throttle()`, used
+    for the Home Assistant state pushes.
+    """
+
+    def __init__(
+        self,
+        backend: str = NOTIFICATION_BACKEND,
+        window: float = NOTIFICATION_COALESCE_WINDOW,
+        burst: int = NOTIFICATION_BURST,
+        refill: float = NOTIFICATION_REFILL_INTERVAL,
+    ) -> None:
+        """Create the dispatcher; its thread starts with the first notification.
+
+        Args:
+            backend (str, optional): "auto", "dbus" or "notify-send".
+            window (float, optional): Coalescing window in seconds.
+            burst (int, optional): Token bucket size of each category.
+            refill (float, optional): Seconds for a category to regain a token.
+        """
+        self.backend = backend
+        self.window = window
+        self.burst = burst
+        self.refill = refill
+        self.dbus = DBusNotifier()
+        self._cond = threading.Condition()
+        self._pending: Dict[Tuple[str, str], _Pending] = {}
+        self._buckets: Dict[str, _TokenBucket] = {}
+        # throttle(): end of the current window and the call waiting for it
+        self._windows: Dict[str, float] = {}
+        self._calls: Dict[str, Tuple[Callable[[], None], float]] = {}
+        self._busy = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self) -> None:
+        """Start the worker thread if needed (call with the condition held)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="notifications", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, notification: _Notification) -> None:
+        """Queue a notification; returns immediately.
+
+        Args:
+            notification (_Notification): The notification to deliver.
+        """
+        now = time.monotonic()
+        with self._cond:
+            pending = self._pending.get(notification.key)
+            if pending is not None:
+                pending.count += 1
+                pending.notification = notification
+            else:
+                due = now + self.window if notification.coalesce else now
+                self._pending[notification.key] = _Pending(notification, now, due)
+            self._ensure_thread()
+            self._cond.notify()
+
+    def throttle(self, key: str, call: Callable[[], None], window: float) -> None:
+        """Run `call` at most once per `window` seconds for the same key.
+
+        The first call runs right away on the caller's thread; calls made
+        during the window are merged into one, run by the worker when the
+        window ends.
+
+        Args:
+            key (str): Identifies the calls to merge.
+            call (Callable[[], None]): The callback; it should not block.
+            window (float): Minimum seconds between two runs.
+        """
+        now = time.monotonic()
+        with self._cond:
+            if now >= self._windows.get(key, 0.0):
+                self._windows[key] = now + window
+                run_now = True
+            else:
+                self._calls[key] = (call, window)
+                run_now = False
+                self._ensure_thread()
+                self._cond.notify()
+        if run_now:
+            call()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Deliver every queued notification now, ignoring windows and buckets.
+
+        Args:
+            timeout (Optional[float], optional): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the queue was emptied in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            for pending in self._pending.values():
+                pending.due = 0.0
+            for key in self._calls:
+                self._windows[key] = 0.0
+            self._buckets.clear()
+            self._cond.notify()
+
+            while self._pending or self._calls or self._busy:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self) -> None:
+        """Deliver what is queued, then stop the thread and close the bus."""
+        self.flush(timeout=_DBUS_TIMEOUT + 5)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self.dbus.close()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        """Deliver notifications as their windows end and tokens allow."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    ready, calls, wake_at = self._take_ready(time.monotonic())
+                    if ready or calls:
+                        self._busy = True
+                        break
+                    timeout = None
+                    if wake_at is not None:
+                        timeout = max(0.0, wake_at - time.monotonic())
+                    self._cond.wait(timeout)
+
+            try:
+                for call in calls:
+                    try:
+                        call()
+                    except Exception as e:
+                        print(f"[ERROR] Invio differito fallito: {e}")
+                for pending in ready:
+                    self.deliver(self._summarize(pending))
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _take_ready(
+        self, now: float
+    ) -> Tuple[List[_Pending], List[Callable[[], None]], Optional[float]]:
+        """Remove what is due from the queue (call with the condition held).
+
+        Returns:
+            Tuple[List[_Pending], List[Callable[[], None]], Optional[float]]:
+            The notifications to deliver, the throttled calls to run and the
+            time of the next check, None if the queue is empty.
+        """
+        ready: List[_Pending] = []
+        wake_at: Optional[float] = None
+
+        for key, pending in list(self._pending.items()):
+            if pending.due > now:
+                wake_at = min(wake_at or pending.due, pending.due)
+                continue
+
+            category = pending.notification.category
+            bucket = self._buckets.get(category)
+            if bucket is None:
+                bucket = self._buckets[category] = _TokenBucket(
+                    self.burst, self.refill, now
+                )
+            wait = bucket.take(now)
+            if wait:
+                pending.due = now + wait
+                wake_at = min(wake_at or pending.due, pending.due)
+                continue
+
+            del self._pending[key]
+            ready.append(pending)
+
+        calls: List[Callable[[], None]] = []
+        for key, (call, window) in list(self._calls.items()):
+            end = self._windows.get(key, 0.0)
+            if end > now:
+                wake_at = min(wake_at or end, end)
+                continue
+            del self._calls[key]
+            # The merged call opens a new window
+            self._windows[key] = now + window
+            calls.append(call)
+
+        return ready, calls, wake_at
+
+    def _summarize(self, pending: _Pending) -> _Notification:
+        """Return the notification to show for a queue entry."""
+        notification = pending.notification
+        if not notification.coalesce or pending.count == 1:
+            return notification
+
+        elapsed = max(self.window, time.monotonic() - pending.since)
+        return _Notification(
+            f"{notification.title} x{pending.count} in last {round(elapsed, 1):g}s",
+            notification.message,
+            notification.icon,
+            notification.tag,
+            notification.category,
+            notification.coalesce,
+        )
+
+    def deliver(self, notification: _Notification) -> bool:
+        """Show a notification with the configured backend, right away.
+
+        Args:
+            notification (_Notification): The notification to show.
+
+        Returns:
+            bool: True if a backend accepted it.
+        """
+        if self.backend != "notify-send":
+            if self.dbus.available() and self.dbus.notify(notification):
+                print(f"[INFO] Notification sent: {notification.title}")
+                return True
+            if self.backend == "dbus":
+                if not self.dbus.available():
+                    print("[WARNING] Notification failed: jeepney not installed")
+                return False
+
+        if _notify_send(notification):
+            print(f"[INFO] Notification sent: {notification.title}")
+            return True
+        return False
+
+
+dispatcher = NotificationDispatcher()
+atexit.register(dispatcher.stop)
+
+
+def send_desktop_notification(
+    title: str,
+    message: str,
+    icon: str = "dialog-information",
+    tag: Optional[str] = None,
+) -> None:
+    """Send a desktop notification without waiting for it to be shown.
+
+    Args:
+        title (str): The title of the notification.
+        message (str): The body text of the notification.
+        icon (str, optional): The name of the system icon to display. Defaults to "dialog-information".
+        tag (Optional[str], optional): Notifications with the same tag replace
+            each other instead of stacking up; the tag is also the
+            rate-limiting category.
+    """
+    dispatcher.submit(_Notification(title, message, icon, tag))
+
+
+def notify_blocked(app_name: str) -> None:
+    """Notify the user that a blocked app was stopped.
+
+    Repeated blocks of the same app within NOTIFICATION_COALESCE_WINDOW are
+    shown as a single notification, e.g. "Blocked discord x7 in last 10s".
+
+    Args:
+        app_name (str): The blocklist rule that matched.
+    """
+    dispatcher.submit(
+        _Notification(
+            f"Blocked {app_name}",
+            "Focus Mode is active.",
+            "dialog-warning",
+            tag=f"blocked:{app_name}",
+            category="blocked",
+            coalesce=True,
+        )
+    )
 
 
 def notify_restore_complete(count: int, gui_instance: Optional[Any] = None) -> None:
@@ -80,7 +567,7 @@ def notify_restore_complete(count: int, gui_instance: Optional[Any] = None) -> N
     else:
         # GUI is closed -> triggers desktop notification
         send_desktop_notification(
-            "Restore Complete", message, "application-x-executable"
+            "Restore Complete", message, "application-x-executable", tag="restore"
         )
         print(f"[INFO] {message} (notification)")
 
@@ -91,11 +578,16 @@ def notify_restore_disabled() -> None:
         "Auto-Restore Disabled",
         "Apps will NOT be restored when disabling blocking",
         "dialog-warning",
+        tag="restore",
     )
 
 
 __all__ = [
+    "DBusNotifier",
+    "NotificationDispatcher",
+    "dispatcher",
     "send_desktop_notification",
+    "notify_blocked",
     "notify_restore_complete",
     "notify_restore_disabled",
 ]
@@ -0,0 +1,199 @@
+"""
+core/proc_events.py
+Sorgente di eventi exec dei processi tramite il netlink proc connector di Linux.
+Permette al blocker di controllare solo i PID appena avviati invece di
+scansionare periodicamente l'intera tabella dei processi.
+Richiede CAP_NET_ADMIN: se non disponibile il blocker resta in polling.
+"""
+
+import errno
+import os
+import select
+import socket
+import struct
+from typing import Any, List, Optional, Set
+
+# linux/netlink.h, linux/connector.h, linux/cn_proc.h
+NETLINK_CONNECTOR = 11
+NLMSG_DONE = 3
+NLMSG_ERROR = 2
+NLMSG_OVERRUN = 4
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_EXEC = 0x00000002
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_CN_MSG = struct.Struct("=IIIIHH")
+_PROC_EVENT_HDR = struct.Struct("=IIQ")
+_EXEC_EVENT = struct.Struct("=II")
+
+_RECV_BUFSIZE = 65536
+
+
+def _build_mcast_message(op: int) -> bytes:
+    """Build the netlink datagram that (un)subscribes from process events.
+
+    Args:
+        op (int): PROC_CN_MCAST_LISTEN or PROC_CN_MCAST_IGNORE.
+
+    Returns:
+        bytes: The complete nlmsghdr + cn_msg + op payload.
+    """
+    payload = struct.pack("=I", op)
+    cn_msg = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+    header = _NLMSGHDR.pack(_NLMSGHDR.size + len(cn_msg), NLMSG_DONE, 0, 0, os.getpid())
+    return header + cn_msg
+
+
+def _parse_exec_events(data: bytes) -> List[int]:
+    """Extract the TGIDs of PROC_EVENT_EXEC events from a netlink datagram.
+
+    Args:
+        data (bytes): Raw datagram received from the connector socket.
+
+    Returns:
+        List[int]: Thread group ids (process PIDs) that just called exec().
+
+    Raises:
+        OverflowError: If the kernel reports dropped messages (NLMSG_OVERRUN).
+    """
+    pids: List[int] = []
+    offset = 0
+
+    while offset + _NLMSGHDR.size <= len(data):
+        msg_len, msg_type, _, _, _ = _NLMSGHDR.unpack_from(data, offset)
+        if msg_len < _NLMSGHDR.size:
+            break
+
+        if msg_type == NLMSG_OVERRUN:
+            raise OverflowError("proc connector overrun")
+
+        if msg_type == NLMSG_DONE:
+            event_offset = offset + _NLMSGHDR.size + _CN_MSG.size
+            if event_offset + _PROC_EVENT_HDR.size + _EXEC_EVENT.size <= len(data):
+                what, _, _ = _PROC_EVENT_HDR.unpack_from(data, event_offset)
+                if what == PROC_EVENT_EXEC:
+                    _, tgid = _EXEC_EVENT.unpack_from(
+                        data, event_offset + _PROC_EVENT_HDR.size
+                    )
+                    pids.append(tgid)
+
+        # Messages are 4-byte aligned (NLMSG_ALIGN)
+        offset += (msg_len + 3) & ~3
+
+    return pids
+
+
+class ProcExecListener:
+    """Subscription to exec() events of every process on the system.
+
+    Use `ProcExecListener.open()`: it returns None when the kernel lacks the
+    proc connector or the process is not privileged enough to subscribe.
+    """
+
+    def __init__(self, sock: socket.socket) -> None:
+        """Wrap an already subscribed netlink connector socket.
+
+        Args:
+            sock (socket.socket): Bound NETLINK_CONNECTOR socket.
+        """
+        self._sock = sock
+
+    @classmethod
+    def open(cls) -> Optional["ProcExecListener"]:
+        """Open the netlink socket and subscribe to process events.
+
+        Returns:
+            Optional[ProcExecListener]: The listener, or None if unavailable.
+        """
+        if not hasattr(socket, "AF_NETLINK"):
+            return None
+
+        sock: Optional[socket.socket] = None
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR
+            )
+            sock.bind((os.getpid(), CN_IDX_PROC))
+            sock.send(_build_mcast_message(PROC_CN_MCAST_LISTEN))
+
+            # The kernel acknowledges the subscription with an error message
+            # only when it is refused (e.g. missing CAP_NET_ADMIN).
+            ready, _, _ = select.select([sock], [], [], 0.2)
+            if ready:
+                data = sock.recv(_RECV_BUFSIZE, socket.MSG_PEEK)
+                msg_type = _NLMSGHDR.unpack_from(data, 0)[1] if data else 0
+                if msg_type == NLMSG_ERROR:
+                    (error,) = struct.unpack_from("=i", data, _NLMSGHDR.size)
+                    if error != 0:
+                        raise PermissionError(-error, os.strerror(-error))
+
+            sock.setblocking(False)
+            print("[INFO] Proc connector attivo: rilevamento processi a eventi")
+            return cls(sock)
+
+        except OSError as e:
+            print(f"[INFO] Proc connector non disponibile ({e}), uso il polling")
+            if sock is not None:
+                sock.close()
+            return None
+
+    def fileno(self) -> int:
+        """Return the socket descriptor, so the listener can be used with select()."""
+        return self._sock.fileno()
+
+    def read_exec_pids(
+        self, timeout: float, wakeup: Optional[Any] = None
+    ) -> Optional[Set[int]]:
+        """Wait up to `timeout` seconds and return the PIDs that called exec().
+
+        Args:
+            timeout (float): Maximum time to wait for the first event.
+            wakeup (Optional[Any], optional): Object with a fileno() that ends the
+                wait early when it becomes readable (e.g. a WakeupSignal).
+
+        Returns:
+            Optional[Set[int]]: The PIDs seen (possibly empty on timeout), or None
+            if events were lost and the caller should fall back to a full scan.
+        """
+        watched = [self._sock] if wakeup is None else [self._sock, wakeup]
+        ready, _, _ = select.select(watched, [], [], timeout)
+        if self._sock not in ready:
+            return set()
+
+        pids: Set[int] = set()
+        overrun = False
+
+        while True:
+            try:
+                data = self._sock.recv(_RECV_BUFSIZE)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    break
+                # The receive queue overflowed and events were dropped
+                overrun = True
+                continue
+
+            try:
+                pids.update(_parse_exec_events(data))
+            except OverflowError:
+                overrun = True
+
+        return None if overrun else pids
+
+    def close(self) -> None:
+        """Unsubscribe from process events and close the socket."""
+        try:
+            self._sock.send(_build_mcast_message(PROC_CN_MCAST_IGNORE))
+        except OSError:
+            pass
+        self._sock.close()
+
+
+__all__ = [
+    "ProcExecListener",
+]
@@ -0,0 +1,212 @@
+"""
+core/procfs.py
+Lettore minimale di /proc per il percorso critico del blocker.
+Evita la costruzione di un oggetto psutil.Process per ogni PID: elenca /proc con
+os.scandir e legge stat, comm e cmdline con una sola os.readv ciascuno in
+buffer riutilizzati; exe e cgroup vengono letti solo se qualche regola li usa.
+psutil viene usato solo per i processi da killare.
+"""
+
+import os
+from typing import Iterator, List, Optional
+
+PROC_ROOT = "/proc"
+
+# comm is at most 16 bytes (TASK_COMM_LEN); stat fits comfortably in 1 KiB
+_SMALL_BUFSIZE = 1024
+_CMDLINE_BUFSIZE = 32 * 1024
+
+# The kernel truncates comm to 15 characters
+_COMM_MAXLEN = 15
+
+
+def is_available() -> bool:
+    """Check whether a Linux procfs is mounted and readable.
+
+    Returns:
+        bool: True if /proc/self/stat can be read.
+    """
+    return os.path.exists(os.path.join(PROC_ROOT, "self", "stat"))
+
+
+class ProcfsReader:
+    """Reads process attributes straight from /proc into reusable buffers.
+
+    Every read method returns None when the process exited or the file is not
+    readable, so callers can simply skip that PID. Not thread-safe: each thread
+    must use its own reader.
+    """
+
+    def __init__(self) -> None:
+        """Allocate the reusable read buffers."""
+        self._small = bytearray(_SMALL_BUFSIZE)
+        self._cmdline = bytearray(_CMDLINE_BUFSIZE)
+
+    @staticmethod
+    def iter_pids() -> Iterator[int]:
+        """Yield the PID of every process listed in /proc.
+
+        Yields:
+            int: A process identifier.
+        """
+        with os.scandir(PROC_ROOT) as it:
+            for entry in it:
+                if entry.name.isdigit():
+                    yield int(entry.name)
+
+    def _read(self, path: str, buf: bytearray, grow: bool = False) -> Optional[bytes]:
+        """Read a whole /proc file into `buf`, growing it if allowed.
+
+        Args:
+            path (str): The file to read.
+            buf (bytearray): The reusable destination buffer.
+            grow (bool, optional): Enlarge the buffer when the file does not fit.
+
+        Returns:
+            Optional[bytes]: The file content, or None if it cannot be read.
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return None
+
+        try:
+            size = os.readv(fd, [buf])
+            while grow and size == len(buf):
+                buf.extend(bytes(len(buf)))
+                with memoryview(buf) as view:
+                    chunk = os.readv(fd, [view[size:]])
+                if chunk == 0:
+                    break
+                size += chunk
+
+            with memoryview(buf) as view:
+                return view[:size].tobytes()
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+
+    def read_starttime(self, pid: int) -> Optional[int]:
+        """Return the process start time, in clock ticks since boot.
+
+        Together with the PID it uniquely identifies a process.
+
+        Args:
+            pid (int): The process identifier.
+
+        Returns:
+            Optional[int]: Field 22 of /proc/<pid>/stat, or None if unavailable.
+        """
+        data = self._read(f"{PROC_ROOT}/{pid}/stat", self._small)
+        if not data:
+            return None
+
+        # comm (field 2) may contain spaces and parentheses: parse after the last ")"
+        fields = data[data.rfind(b")") + 2 :].split()
+        try:
+            return int(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+    def read_comm(self, pid: int) -> Optional[str]:
+        """Return the process name (comm), truncated to 15 characters by the kernel.
+
+        Args:
+            pid (int): The process identifier.
+
+        Returns:
+            Optional[str]: The name, or None if unavailable.
+        """
+        data = self._read(f"{PROC_ROOT}/{pid}/comm", self._small)
+        if data is None:
+            return None
+        return data.rstrip(b"\n").decode("utf-8", "surrogateescape")
+
+    def read_cmdline(self, pid: int) -> List[str]:
+        """Return the process launch arguments.
+
+        Args:
+            pid (int): The process identifier.
+
+        Returns:
+            List[str]: The arguments; empty for kernel threads or when unreadable.
+        """
+        data = self._read(f"{PROC_ROOT}/{pid}/cmdline", self._cmdline, grow=True)
+        if not data:
+            return []
+
+        # Processes that rewrite their title (setproctitle) may use spaces
+        sep = b"\0" if b"\0" in data else b" "
+        args = data.rstrip(sep).split(sep)
+        return [arg.decode("utf-8", "surrogateescape") for arg in args]
+
+    @staticmethod
+    def read_exe(pid: int) -> Optional[str]:
+        """Return the path of the process executable.
+
+        Args:
+            pid (int): The process identifier.
+
+        Returns:
+            Optional[str]: The resolved path, or None for kernel threads or
+            when the link is not readable (other users' processes).
+        """
+        try:
+            return os.readlink(f"{PROC_ROOT}/{pid}/exe")
+        except OSError:
+            return None
+
+    @staticmethod
+    def full_name(comm: str, cmdline: List[str]) -> str:
+        """Expand a truncated comm using argv[0], the same way psutil does.
+
+        Args:
+            comm (str): The name read from /proc/<pid>/comm.
+            cmdline (List[str]): The process launch arguments.
+
+        Returns:
+            str: The untruncated name when it can be recovered, else `comm`.
+        """
+        if len(comm) >= _COMM_MAXLEN and cmdline:
+            exe_name = os.path.basename(cmdline[0])
+            if exe_name.startswith(comm):
+                return exe_name
+        return comm
+
+
+def read_cgroup(pid: int) -> Optional[str]:
+    """Return the cgroup path of a process.
+
+    The unified (v2) hierarchy is preferred; on hybrid systems the systemd
+    v1 hierarchy carries the same path.
+
+    Args:
+        pid (int): The process identifier.
+
+    Returns:
+        Optional[str]: The path, e.g. "/user.slice/.../app-....scope", or None.
+    """
+    try:
+        with open(f"{PROC_ROOT}/{pid}/cgroup", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    fallback = None
+    for line in data.decode("utf-8", "surrogateescape").splitlines():
+        hierarchy, _, rest = line.partition(":")
+        controllers, _, path = rest.partition(":")
+        if hierarchy == "0" and not controllers:
+            return path
+        if controllers == "name=systemd":
+            fallback = path
+    return fallback
+
+
+__all__ = [
+    "PROC_ROOT",
+    "ProcfsReader",
+    "is_available",
+    "read_cgroup",
+]
@@ -1,125 +1,781 @@
 """
 core/restore.py
 Application restoration mechanics without xdotool (Wayland-safe).
+Le app vengono rilanciate da uno scheduler in background: gruppi ordinati per
+priorità (un gruppo parte quando il precedente è pronto), al massimo
+RESTORE_MAX_PARALLEL avvii in parallelo, e un'app libera il suo posto appena
+è pronta (finestra comparsa o processo vivo da RESTORE_READY_TIMEOUT secondi)
+invece di aspettare un intervallo fisso. L'avanzamento è notificato con eventi.
+Ogni app viene poi sorvegliata per RESTORE_GRACE_PERIOD secondi: l'uscita dei
+processi è raccolta tramite pidfd con un unico selector, le app che crashano
+vengono rilanciate con backoff esponenziale e il risultato è un report per app.
 """
 
 import os
+import selectors
 import subprocess
+import threading
 import time
-from typing import Dict, Tuple, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import Callable, Dict, Tuple, Any, List, Optional, Set
 
-from focus_mode_app.core.session import session_tracker
+import psutil
 
+from focus_mode_app.config import (
+    RESTORE_GRACE_PERIOD,
+    RESTORE_INTERVAL,
+    RESTORE_MAX_PARALLEL,
+    RESTORE_MAX_RETRIES,
+    RESTORE_READY_TIMEOUT,
+    RESTORE_RETRY_BACKOFF,
+)
+from focus_mode_app.core.session import app_key, session_tracker
+from focus_mode_app.core.subprocess_env import clean_env, which
 
-def _clean_env_for_restore() -> dict:
-    """Return an environment suitable for restored apps.
+# How often a launched app is checked for readiness (seconds)
+_READY_POLL = 0.2
 
-    When running as a PyInstaller AppImage, LD_LIBRARY_PATH is polluted
-    with the bundled _internal/ paths.  PyInstaller saves the original
-    value as LD_LIBRARY_PATH_ORIG — but only if LD_LIBRARY_PATH was
-    already set before launch.  On systems where it was unset (common on
-    Arch), PyInstaller sets LD_LIBRARY_PATH fresh with no _ORIG counterpart.
+# How often the window list is refreshed while apps are starting (seconds)
+_WINDOW_POLL = 0.5
 
-    The correct strategy when APPIMAGE is in the environment:
-      - If LD_LIBRARY_PATH_ORIG exists → restore it.
-      - If not → remove LD_LIBRARY_PATH entirely (PyInstaller set it from
-        scratch; the system default for child processes is "no value").
+
+def _launch(app_state: Dict[str, Any]) -> Optional[subprocess.Popen]:
+    """Start a killed application again in a new session.
+
+    Args:
+        app_state (Dict[str, Any]): The tracked state dictionary of the killed app.
+
+    Returns:
+        Optional[subprocess.Popen]: The launched process, or None if the state
+        has no command to run.
     """
-    env = os.environ.copy()
+    exe: str | None = app_state.get("exe")
+    cmdline: List[str] = app_state.get("cmdline", [])
+    cwd: str | None = app_state.get("cwd")
+
+    if not exe and not cmdline:
+        return None
 
-    if "APPIMAGE" in env:
-        orig_ldpath = env.pop("LD_LIBRARY_PATH_ORIG", None)
-        if orig_ldpath:
-            env["LD_LIBRARY_PATH"] = orig_ldpath
-        else:
-            env.pop("LD_LIBRARY_PATH", None)
+    cmd = cmdline if cmdline else [exe]
 
-    for var in (
-        "APPDIR",
-        "APPIMAGE",
-        "APPIMAGE_EXTRACT_AND_RUN",
-        "TCL_LIBRARY",
-        "TK_LIBRARY",
-    ):
-        env.pop(var, None)
+    print(f"[INFO] Restoring: {app_state.get('name', 'Unknown')}")
 
-    return env
+    return subprocess.Popen(
+        cmd,
+        # Resolved from the PATH table instead of by execvpe(); argv[0] is kept
+        executable=which(cmd[0]),
+        cwd=cwd,
+        env=clean_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
 
 
 def restore_app(app_state: Dict[str, Any]) -> Tuple[bool, str]:
     """Restore an application without window positioning.
 
+    The process is started and not waited for; see `RestoreScheduler` for
+    restores that wait for the app to be ready.
+
     Args:
         app_state (Dict[str, Any]): The tracked state dictionary of the killed app.
 
     Returns:
         Tuple[bool, str]: A tuple containing a boolean success flag and the application name.
     """
+    app_name: str = app_state.get("name", "Unknown")
+    try:
+        return (_launch(app_state) is not None, app_name)
+    except Exception as e:
+        print(f"[ERROR] Restore {app_name}: {e}")
+        return (False, app_name)
+
+
+def _window_pids() -> Optional[Set[int]]:
+    """Return the PIDs owning a top-level window, or None if unknown.
+
+    Only available on X11 with wmctrl installed; on Wayland there is no
+    portable way to list the windows of other clients.
+    """
+    if not os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"):
+        return None
+    wmctrl = which("wmctrl")
+    if wmctrl is None:
+        return None
     try:
-        exe: str | None = app_state.get("exe")
-        cmdline: List[str] = app_state.get("cmdline", [])
-        cwd: str | None = app_state.get("cwd")
-        app_name: str = app_state.get("name", "Unknown")
-
-        if not exe and not cmdline:
-            return (False, app_name)
-
-        cmd = cmdline if cmdline else [exe]
-
-        print(f"[INFO] Restoring: {app_name}")
-
-        # Start the process in a new session
-        subprocess.Popen(
-            cmd,
-            cwd=cwd,
-            env=_clean_env_for_restore(),
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True,
+        output = subprocess.run(
+            [wmctrl, "-lp"], capture_output=True, text=True, timeout=1
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    pids: Set[int] = set()
+    for line in output.splitlines():
+        fields = line.split(None, 3)
+        if len(fields) >= 3 and fields[2].isdigit():
+            pids.add(int(fields[2]))
+    return pids
+
+
+class _WindowPoller:
+    """Lists the top-level windows for every app waiting to be ready.
+
+    The apps of a wave share one window list, refreshed at most every
+    `interval` seconds: one wmctrl per round instead of one per app.
+    """
+
+    def __init__(self, interval: float = _WINDOW_POLL) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pids: Optional[Set[int]] = None
+        self._polled_at = float("-inf")
+
+    def pids(self) -> Optional[Set[int]]:
+        """Return the PIDs owning a window, as of the last round."""
+        with self._lock:
+            if time.monotonic() - self._polled_at >= self.interval:
+                self._pids = _window_pids()
+                self._polled_at = time.monotonic()
+            return self._pids
+
+    def has_window(self, pid: int) -> bool:
+        """Check whether a process, or one of its children, has a window."""
+        windows = self.pids()
+        if not windows:
+            return False
+        if pid in windows:
+            return True
+        try:
+            children = psutil.Process(pid).children(recursive=True)
+        except psutil.Error:
+            return False
+        return any(child.pid in windows for child in children)
+
+
+def _open_pidfd(proc: subprocess.Popen) -> Optional[int]:
+    """Open a pidfd on a launched child, or return None if unsupported.
+
+    The child is not reaped before its exit code is collected, so its PID
+    cannot be recycled in between.
+    """
+    try:
+        return os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        return None
+
+
+def _close_pidfd(pidfd: Optional[int]) -> None:
+    """Close a pidfd opened by `_open_pidfd`."""
+    if pidfd is not None:
+        try:
+            os.close(pidfd)
+        except OSError:
+            pass
+
+
+class _Watched:
+    """A ready app whose exit is watched until the end of its grace period."""
+
+    __slots__ = ("proc", "pidfd", "deadline", "callback")
+
+    def __init__(
+        self,
+        proc: subprocess.Popen,
+        pidfd: Optional[int],
+        deadline: float,
+        callback: Callable[[Optional[int]], None],
+    ) -> None:
+        self.proc = proc
+        self.pidfd = pidfd
+        self.deadline = deadline
+        self.callback = callback
+
+
+class _ExitWatcher:
+    """Collects the exit codes of the ready apps without blocking the launches.
+
+    A single thread waits on the pidfds of every watched app with one
+    selector: a pidfd becomes readable when its process exits. Apps without
+    a pidfd (old kernels) are polled every `_READY_POLL` seconds instead.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watched: List[_Watched] = []
+        self._thread: Optional[threading.Thread] = None
+        self._wake_r, self._wake_w = os.pipe()
+
+    def watch(
+        self,
+        proc: subprocess.Popen,
+        pidfd: Optional[int],
+        deadline: float,
+        callback: Callable[[Optional[int]], None],
+    ) -> None:
+        """Watch a process until it exits or `deadline` passes.
+
+        Args:
+            proc (subprocess.Popen): The launched app.
+            pidfd (Optional[int]): Its pidfd, closed by the watcher.
+            deadline (float): time.monotonic() at which the watch ends.
+            callback (Callable[[Optional[int]], None]): Called on the watcher
+                thread with the exit code, or None if still running at the deadline.
+        """
+        with self._lock:
+            self._watched.append(_Watched(proc, pidfd, deadline, callback))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="restore-watcher", daemon=True
+                )
+                self._thread.start()
+                return
+        os.write(self._wake_w, b"\0")
+
+    def close(self) -> None:
+        """Release the wake-up pipe; call once nothing is watched anymore."""
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        """Wait for exits and deadlines until nothing is left to watch."""
+        while True:
+            with self._lock:
+                watched = list(self._watched)
+                if not watched:
+                    self._thread = None
+                    return
+
+            timeout = min(w.deadline for w in watched) - time.monotonic()
+            if any(w.pidfd is None for w in watched):
+                timeout = min(timeout, _READY_POLL)
+
+            if timeout > 0:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(self._wake_r, selectors.EVENT_READ)
+                    for w in watched:
+                        if w.pidfd is not None:
+                            selector.register(w.pidfd, selectors.EVENT_READ)
+                    for key, _ in selector.select(timeout):
+                        if key.fd == self._wake_r:
+                            os.read(self._wake_r, 512)
+
+            self._collect(watched)
+
+    def _collect(self, watched: List[_Watched]) -> None:
+        """Report the apps that exited or reached the end of their grace period."""
+        now = time.monotonic()
+        for w in watched:
+            code = w.proc.poll()
+            if code is None and now < w.deadline:
+                continue
+            with self._lock:
+                self._watched.remove(w)
+            _close_pidfd(w.pidfd)
+            try:
+                w.callback(code)
+            except Exception as e:
+                print(f"[ERROR] Restore watcher: {e}")
+
+
+class AppRestoreReport:
+    """The outcome of the restore of a single app.
+
+    Attributes:
+        name (str): The application name.
+        status (str): "pending", "started" (launched, grace period running),
+            "alive" (survived its grace period), "crashed" (kept exiting with
+            an error code) or "failed" (could not be launched).
+        attempts (int): Number of launches.
+        pid (Optional[int]): PID of the last launch.
+        exit_code (Optional[int]): Exit code of the last launch, if it exited.
+        started_at (Optional[float]): Wall-clock time of the first launch.
+        time_to_ready (Optional[float]): Seconds from the last launch to ready.
+        message (str): Details, e.g. how readiness was decided.
+    """
+
+    __slots__ = (
+        "name",
+        "status",
+        "attempts",
+        "pid",
+        "exit_code",
+        "started_at",
+        "time_to_ready",
+        "message",
+    )
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.status = "pending"
+        self.attempts = 0
+        self.pid: Optional[int] = None
+        self.exit_code: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.time_to_ready: Optional[float] = None
+        self.message = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as a plain, JSON-serializable dict."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"AppRestoreReport({self.name!r}, {self.status!r}, attempts={self.attempts})"
+
+
+class RestoreEvent:
+    """A progress event of a restore.
+
+    Attributes:
+        kind (str): "launched", "ready", "retry", "alive", "crashed", "failed"
+            or "finished".
+        name (str): The application name; empty for "finished".
+        pid (Optional[int]): The PID of the launched process, if any.
+        message (str): Details, e.g. the reason of a failure.
+        done (int): Apps alive, crashed or failed so far.
+        total (int): Apps to restore.
+        restored (int): Apps alive so far.
+    """
+
+    __slots__ = ("kind", "name", "pid", "message", "done", "total", "restored")
+
+    def __init__(
+        self,
+        kind: str,
+        name: str = "",
+        pid: Optional[int] = None,
+        message: str = "",
+        done: int = 0,
+        total: int = 0,
+        restored: int = 0,
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.pid = pid
+        self.message = message
+        self.done = done
+        self.total = total
+        self.restored = restored
+
+    def __repr__(self) -> str:
+        return (
+            f"RestoreEvent({self.kind!r}, {self.name!r}, done={self.done}/{self.total})"
         )
 
-        return (True, app_name)
 
-    except Exception as e:
-        print(f"[ERROR] Restore {app_state.get('name')}: {e}")
-        return (False, app_state.get("name", "Unknown"))
+class RestoreScheduler:
+    """Restores a batch of killed apps, in parallel and by priority.
 
+    Apps are grouped by their restore priority (highest first): a group is
+    launched only when every app of the previous group is ready or has
+    failed. Inside a group at most `max_parallel` apps are starting at once,
+    and two launches are at least `interval` seconds apart.
 
-def restore_all_apps() -> int:
-    """Restore all applications that were killed during the active session.
+    A ready app frees its slot but is watched until `grace_period` seconds
+    after its launch: if it exits with an error code it is relaunched, up to
+    `max_retries` times with an exponential backoff.
+    """
+
+    def __init__(
+        self,
+        apps: List[Dict[str, Any]],
+        max_parallel: int = RESTORE_MAX_PARALLEL,
+        interval: float = RESTORE_INTERVAL,
+        ready_timeout: float = RESTORE_READY_TIMEOUT,
+        on_event: Optional[Callable[[RestoreEvent], None]] = None,
+        grace_period: float = RESTORE_GRACE_PERIOD,
+        max_retries: int = RESTORE_MAX_RETRIES,
+        retry_backoff: float = RESTORE_RETRY_BACKOFF,
+    ) -> None:
+        """Create a scheduler.
+
+        Args:
+            apps (List[Dict[str, Any]]): The captured states of the killed apps.
+            max_parallel (int, optional): Maximum apps starting at the same time.
+            interval (float, optional): Minimum seconds between two launches.
+            ready_timeout (float, optional): Seconds an app must stay alive to
+                be ready when no window is detected first.
+            on_event (Optional[Callable[[RestoreEvent], None]], optional):
+                Called on the scheduler threads for every progress event.
+            grace_period (float, optional): Seconds after launch an app must
+                survive to count as restored.
+            max_retries (int, optional): Relaunches of an app that crashed.
+            retry_backoff (float, optional): Delay before the first relaunch,
+                doubled on every further retry.
+        """
+        self.apps = apps
+        self.max_parallel = max(1, max_parallel)
+        self.interval = interval
+        self.ready_timeout = ready_timeout
+        self.grace_period = max(grace_period, ready_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.on_event = on_event
+        self.restored = 0
+        self.done = 0
+        self._reports: Dict[int, AppRestoreReport] = {
+            id(app_state): AppRestoreReport(app_state.get("name", "Unknown"))
+            for app_state in apps
+        }
+        self._lock = threading.Lock()
+        self._next_launch = 0.0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._watcher = _ExitWatcher()
+        self._windows = _WindowPoller()
+        self._settled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._finished = threading.Event()
+
+    @property
+    def total(self) -> int:
+        """Number of apps to restore."""
+        return len(self.apps)
+
+    def report(self) -> List[AppRestoreReport]:
+        """Return the restore report of every app, in kill order.
+
+        Returns:
+            List[AppRestoreReport]: One report per app; final once `wait()`
+            has returned True.
+        """
+        return [self._reports[id(app_state)] for app_state in self.apps]
+
+    def waves(self) -> List[List[Dict[str, Any]]]:
+        """Group the apps by priority, highest first, keeping the kill order.
+
+        Returns:
+            List[List[Dict[str, Any]]]: The groups, in launch order.
+        """
+
+        def priority(app_state: Dict[str, Any]) -> int:
+            # Priorities are set per blocklist rule, not per process name
+            return session_tracker.restore_priority(app_key(app_state))
+
+        ordered = sorted(self.apps, key=priority, reverse=True)
+        return [list(group) for _, group in groupby(ordered, key=priority)]
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def start(self) -> "RestoreScheduler":
+        """Run the restore on a background thread and return immediately.
+
+        Returns:
+            RestoreScheduler: self, to wait on it or read its progress.
+        """
+        self._thread = threading.Thread(
+            target=self.run, name="restore-scheduler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the restore to finish.
 
-    Iterates through the session tracker's queue, restores them, and then clears the session.
+        Args:
+            timeout (Optional[float], optional): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the restore has finished.
+        """
+        return self._finished.wait(timeout)
+
+    def run(self) -> int:
+        """Restore every app, blocking until the last grace period has ended.
+
+        Returns:
+            int: The number of applications successfully restored.
+        """
+        if not self.apps:
+            self._settled.set()
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_parallel, thread_name_prefix="restore"
+        )
+        try:
+            for wave in self.waves():
+                # list() waits for the whole group to be ready before the next one
+                list(self._pool.map(self._restore_one, wave))
+            # Relaunches of crashed apps still need the pool
+            self._settled.wait()
+        finally:
+            self._pool.shutdown(wait=True)
+            self._watcher.close()
+            self._emit(RestoreEvent("finished"))
+            self._finished.set()
+        return self.restored
+
+    def _restore_one(self, app_state: Dict[str, Any], delay: float = 0.0) -> None:
+        """Launch one app until it is ready or out of retries (runs on a pool thread).
+
+        Args:
+            app_state (Dict[str, Any]): The captured state of the app.
+            delay (float, optional): Seconds to wait before the first launch.
+        """
+        report = self._reports[id(app_state)]
+
+        while True:
+            if delay > 0:
+                time.sleep(delay)
+            self._throttle()
+
+            report.attempts += 1
+            try:
+                proc = _launch(app_state)
+            except Exception as e:
+                print(f"[ERROR] Restore {report.name}: {e}")
+                self._settle(report, "failed", str(e))
+                return
+
+            if proc is None:
+                self._settle(report, "failed", "nessun comando da eseguire")
+                return
+
+            launched_at = time.monotonic()
+            if report.started_at is None:
+                report.started_at = time.time()
+            report.status = "started"
+            report.pid = proc.pid
+            report.exit_code = None
+            self._emit(RestoreEvent("launched", report.name, proc.pid))
+
+            pidfd = _open_pidfd(proc)
+            code, message = self._wait_ready(proc, pidfd)
+
+            if code is None or code == 0:
+                report.time_to_ready = time.monotonic() - launched_at
+                report.message = message
+                self._emit(RestoreEvent("ready", report.name, proc.pid, message))
+                if code == 0:
+                    _close_pidfd(pidfd)
+                    self._on_exit(app_state, 0)
+                else:
+                    self._watcher.watch(
+                        proc,
+                        pidfd,
+                        launched_at + self.grace_period,
+                        lambda code: self._on_exit(app_state, code),
+                    )
+                return
+
+            _close_pidfd(pidfd)
+            delay = self._crashed(report, code)
+            if delay is None:
+                return
+
+    def _on_exit(self, app_state: Dict[str, Any], code: Optional[int]) -> None:
+        """Handle the end of the grace period of a ready app (watcher thread).
+
+        Args:
+            app_state (Dict[str, Any]): The captured state of the app.
+            code (Optional[int]): The exit code, None if the app is still running.
+        """
+        report = self._reports[id(app_state)]
+        if code is None:
+            self._settle(report, "alive", report.message)
+            return
+        if code == 0:
+            # Launchers of single-instance apps exit 0 after handing off
+            report.exit_code = 0
+            self._settle(report, "alive", "passato all'istanza esistente")
+            return
+
+        delay = self._crashed(report, code)
+        if delay is not None and self._pool is not None:
+            self._pool.submit(self._restore_one, app_state, delay)
+
+    def _crashed(self, report: AppRestoreReport, code: int) -> Optional[float]:
+        """Record a crash and decide whether to relaunch the app.
+
+        Returns:
+            Optional[float]: Seconds to wait before the relaunch, or None if
+            the app is out of retries (it is then reported as crashed).
+        """
+        report.exit_code = code
+        message = f"uscito con codice {code}"
+        if report.attempts > self.max_retries:
+            self._settle(report, "crashed", message)
+            return None
+
+        delay = self.retry_backoff * 2 ** (report.attempts - 1)
+        self._emit(
+            RestoreEvent(
+                "retry",
+                report.name,
+                report.pid,
+                f"{message}, nuovo avvio tra {delay:g}s",
+            )
+        )
+        return delay
+
+    def _throttle(self) -> None:
+        """Keep two launches at least `interval` seconds apart."""
+        with self._lock:
+            now = time.monotonic()
+            launch_at = max(now, self._next_launch)
+            self._next_launch = launch_at + self.interval
+        if launch_at > now:
+            time.sleep(launch_at - now)
+
+    def _wait_ready(
+        self, proc: subprocess.Popen, pidfd: Optional[int]
+    ) -> Tuple[Optional[int], str]:
+        """Wait until a launched app has a window or has stayed alive long enough.
+
+        Between two window checks the pidfd is waited on, so an exit is seen
+        immediately.
+
+        Returns:
+            Tuple[Optional[int], str]: The exit code if the app exited (None
+            if it is ready and running), and how it was decided.
+        """
+        deadline = time.monotonic() + self.ready_timeout
+        while True:
+            code = proc.poll()
+            if code is not None:
+                if code == 0:
+                    return (0, "passato all'istanza esistente")
+                return (code, f"uscito con codice {code}")
+            if self._windows.has_window(proc.pid):
+                return (None, "finestra aperta")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return (None, "in esecuzione")
+
+            step = min(_READY_POLL, remaining)
+            if pidfd is not None:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(pidfd, selectors.EVENT_READ)
+                    selector.select(step)
+            else:
+                time.sleep(step)
+
+    def _settle(self, report: AppRestoreReport, status: str, message: str) -> None:
+        """Record the final outcome of an app and emit its event."""
+        report.status = status
+        report.message = message
+        with self._lock:
+            self.done += 1
+            if status == "alive":
+                self.restored += 1
+            settled = self.done >= self.total
+        self._emit(RestoreEvent(status, report.name, report.pid, message))
+        if settled:
+            self._settled.set()
+
+    def _emit(self, event: RestoreEvent) -> None:
+        """Fill in the progress counters and pass an event to `on_event`."""
+        with self._lock:
+            event.done = self.done
+            event.total = self.total
+            event.restored = self.restored
+
+        if event.kind in ("failed", "crashed"):
+            print(f"[WARNING] Restore {event.name} fallito: {event.message}")
+        elif event.kind == "retry":
+            print(f"[WARNING] Restore {event.name}: {event.message}")
+        elif event.kind == "ready":
+            print(f"[DEBUG] Restore {event.name} pronto ({event.message})")
+
+        if self.on_event is not None:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f"[ERROR] Restore event handler: {e}")
+
+
+_current: Optional[RestoreScheduler] = None
+_current_lock = threading.Lock()
+
+
+def start_restore(
+    on_event: Optional[Callable[[RestoreEvent], None]] = None,
+) -> Optional[RestoreScheduler]:
+    """Restore the apps killed in the session without blocking the caller.
+
+    Once every app has survived its grace period or failed, the restored apps
+    are removed from the session; apps killed during the restore are kept for
+    the next one. If a restore is already running, no new one is started.
+
+    Args:
+        on_event (Optional[Callable[[RestoreEvent], None]], optional): Called
+            on the scheduler threads for every progress event; the last one is
+            "finished".
 
     Returns:
-        int: The number of applications successfully restored.
+        Optional[RestoreScheduler]: The running scheduler, or None if there
+        was nothing to restore or a restore is already running.
     """
-    apps = session_tracker.get_killed_apps()
+    global _current
 
-    if not apps:
-        print("[INFO] No apps to restore")
-        return 0
+    with _current_lock:
+        if _current is not None and not _current.wait(0):
+            print("[INFO] Restore già in corso")
+            return None
+
+        apps = list(session_tracker.get_killed_apps())
+        if not apps:
+            print("[INFO] No apps to restore")
+            return None
+
+        print(f"[INFO] Restoring {len(apps)} apps...")
+
+        def handle(event: RestoreEvent) -> None:
+            if event.kind == "finished":
+                print(f"[INFO] Restored {event.restored}/{event.total} apps")
+                # Only the apps handed to this restore: kills recorded
+                # meanwhile (blocking turned back on) are kept
+                session_tracker.discard_killed_apps(apps)
+            if on_event is not None:
+                on_event(event)
+
+        _current = RestoreScheduler(apps, on_event=handle).start()
+        return _current
 
-    print(f"[INFO] Restoring {len(apps)} apps...")
 
-    restored_count = 0
-    restored_names = []
+def wait_for_restore(timeout: Optional[float] = None) -> bool:
+    """Wait for the restore started by `start_restore`, if any.
 
-    for app_state in apps:
-        success, app_name = restore_app(app_state)
-        if success:
-            restored_count += 1
-            restored_names.append(app_name)
-            time.sleep(0.3)  # Delay between app restores
+    Short-lived callers (the CLI) must wait before exiting, or the restore
+    threads die with the process.
 
-    print(f"[INFO] Restored {restored_count}/{len(apps)} apps")
+    Args:
+        timeout (Optional[float], optional): Maximum seconds to wait.
+
+    Returns:
+        bool: True if no restore is running anymore.
+    """
+    with _current_lock:
+        current = _current
+    return current is None or current.wait(timeout)
 
-    # Clear the session after restoration attempt
-    session_tracker.clear_session()
 
-    return restored_count
+def restore_all_apps() -> int:
+    """Restore all applications that were killed during the active session.
+
+    Blocking version of `start_restore`, for the CLI.
+
+    Returns:
+        int: The number of applications successfully restored.
+    """
+    scheduler = start_restore()
+    if scheduler is None:
+        return 0
+    scheduler.wait()
+    return scheduler.restored
 
 
 __all__ = [
+    "AppRestoreReport",
+    "RestoreEvent",
+    "RestoreScheduler",
     "restore_app",
+    "start_restore",
+    "wait_for_restore",
     "restore_all_apps",
 ]
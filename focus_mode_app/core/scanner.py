@@ -0,0 +1,336 @@
+"""
+core/scanner.py
+Motore di scansione della tabella dei processi per il blocker.
+Legge la tabella dei processi una sola volta per ciclo e mantiene una cache dei
+verdetti indicizzata per (pid, create_time): nome e cmdline vengono letti solo
+per i processi nuovi rispetto alla scansione precedente.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from focus_mode_app.core import cgroups, procfs
+from focus_mode_app.core.matcher import BlocklistMatcher
+
+ProcessKey = Tuple[int, float]
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class ProcessVerdict:
+    """Cached match result for a single process.
+
+    Attributes:
+        pid (int): Process identifier.
+        start (float): Process start time; with `pid` it forms the cache key.
+        app_rule (Optional[str]): The process rule (any type but "webapp")
+            matching the process, if any.
+        webapp_rules (Tuple[str, ...]): The "webapp" rules found in the cmdline.
+        captured (bool): True once the session state has been captured, so that
+            repeated kills of the same process are not tracked twice.
+        cgroup (Optional[str]): The cgroup path, read once when the process is
+            first seen (only if the scanner or a rule needs it).
+    """
+
+    __slots__ = (
+        "pid",
+        "start",
+        "app_rule",
+        "webapp_rules",
+        "captured",
+        "cgroup",
+        "_proc",
+    )
+
+    def __init__(
+        self,
+        pid: int,
+        start: float,
+        app_rule: Optional[str],
+        webapp_rules: Tuple[str, ...],
+        proc: Optional[psutil.Process] = None,
+        cgroup: Optional[str] = None,
+    ) -> None:
+        self.pid = pid
+        self.start = start
+        self.app_rule = app_rule
+        self.webapp_rules = webapp_rules
+        self.captured = False
+        self.cgroup = cgroup
+        self._proc = proc
+
+    @property
+    def key(self) -> ProcessKey:
+        """The (pid, start) pair identifying this process."""
+        return (self.pid, self.start)
+
+    @property
+    def identity(self) -> Optional[cgroups.AppIdentity]:
+        """The app this process belongs to, derived from its cgroup."""
+        return cgroups.identify(self.cgroup) if self.cgroup else None
+
+    @property
+    def matched(self) -> bool:
+        """True if at least one blocklist rule matches this process."""
+        return self.app_rule is not None or bool(self.webapp_rules)
+
+    @property
+    def proc(self) -> psutil.Process:
+        """The psutil handle of the process, created on first use.
+
+        On the /proc fast path `start` is in clock ticks since boot; the handle
+        is checked against it so a recycled PID is never signalled.
+
+        Raises:
+            psutil.NoSuchProcess: If the process exited or its PID was reused.
+        """
+        if self._proc is None:
+            proc = psutil.Process(self.pid)
+            expected = psutil.boot_time() + self.start / _CLOCK_TICKS
+            if abs(proc.create_time() - expected) > 1.0 / _CLOCK_TICKS:
+                raise psutil.NoSuchProcess(self.pid)
+            self._proc = proc
+        return self._proc
+
+
+class ProcessScanner:
+    """Incremental process table scanner with a per-process verdict cache.
+
+    Processes are identified by (pid, create_time), so a recycled PID is never
+    confused with the process that previously owned it. Entries of processes
+    that are gone are dropped on every full scan, keeping the cache bounded by
+    the size of the process table.
+
+    With `use_procfs` the table is read straight from /proc (see
+    `core/procfs.py`) and psutil handles are only created for matches.
+    With `read_cgroups` the cgroup of every new process is recorded too, so
+    that matches can be mapped to their app scope (see `core/cgroups.py`).
+    """
+
+    def __init__(
+        self,
+        exclude_pid: Optional[int] = None,
+        use_procfs: bool = False,
+        read_cgroups: bool = False,
+    ) -> None:
+        """Create an empty scanner.
+
+        Args:
+            exclude_pid (Optional[int], optional): PID that must never match.
+                Defaults to the current process.
+            use_procfs (bool, optional): Use the raw /proc reader when available.
+                Defaults to False (psutil).
+            read_cgroups (bool, optional): Record the cgroup of every new process,
+                not only when an "appid" rule needs it. Defaults to False.
+        """
+        self._exclude_pid = os.getpid() if exclude_pid is None else exclude_pid
+        self._read_cgroups = read_cgroups
+        self._verdicts: Dict[ProcessKey, ProcessVerdict] = {}
+        self._matcher: Optional[BlocklistMatcher] = None
+        self._reader: Optional[procfs.ProcfsReader] = (
+            procfs.ProcfsReader() if use_procfs and procfs.is_available() else None
+        )
+
+    @property
+    def tracked_matches(self) -> int:
+        """Number of live processes currently known to match a rule."""
+        return sum(1 for verdict in self._verdicts.values() if verdict.matched)
+
+    def reset(self) -> None:
+        """Drop every cached verdict."""
+        self._verdicts.clear()
+
+    def forget(self, verdict: ProcessVerdict) -> None:
+        """Drop the cached verdict of a process that exited or was recycled.
+
+        Args:
+            verdict (ProcessVerdict): The verdict to remove.
+        """
+        self._verdicts.pop(verdict.key, None)
+
+    def scan(
+        self, matcher: BlocklistMatcher, pids: Optional[Iterable[int]] = None
+    ) -> List[ProcessVerdict]:
+        """Return the verdicts of every process matching the blocklist.
+
+        Args:
+            matcher (BlocklistMatcher): The compiled blocklist. A different
+                matcher than on the previous scan invalidates the whole cache.
+            pids (Optional[Iterable[int]], optional): Restrict the scan to these
+                PIDs, which are always re-read because they just called exec().
+                Defaults to a full scan of the process table.
+
+        Returns:
+            List[ProcessVerdict]: Verdicts with at least one matching rule.
+        """
+        if matcher is not self._matcher:
+            self._verdicts.clear()
+            self._matcher = matcher
+
+        if self._reader is not None:
+            if pids is None:
+                return self._full_scan_procfs(matcher, self._reader)
+            return self._partial_scan_procfs(matcher, self._reader, pids)
+
+        if pids is None:
+            return self._full_scan(matcher)
+        return self._partial_scan(matcher, pids)
+
+    def _full_scan(self, matcher: BlocklistMatcher) -> List[ProcessVerdict]:
+        verdicts: Dict[ProcessKey, ProcessVerdict] = {}
+
+        for proc in psutil.process_iter():
+            try:
+                pid = proc.pid
+                if pid == self._exclude_pid:
+                    continue
+
+                key = (pid, proc.create_time())
+                verdict = self._verdicts.get(key)
+                if verdict is None:
+                    verdict = self._classify(matcher, proc)
+
+                verdicts[key] = verdict
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+        # Replacing the dict drops the verdicts of processes that are gone
+        self._verdicts = verdicts
+        return [verdict for verdict in verdicts.values() if verdict.matched]
+
+    def _partial_scan(
+        self, matcher: BlocklistMatcher, pids: Iterable[int]
+    ) -> List[ProcessVerdict]:
+        matches: List[ProcessVerdict] = []
+
+        for pid in pids:
+            if pid == self._exclude_pid:
+                continue
+
+            try:
+                verdict = self._classify(matcher, psutil.Process(pid))
+                self._verdicts[verdict.key] = verdict
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+            if verdict.matched:
+                matches.append(verdict)
+
+        return matches
+
+    def _classify(
+        self, matcher: BlocklistMatcher, proc: psutil.Process
+    ) -> ProcessVerdict:
+        """Read name and cmdline of a new process and evaluate every rule once.
+
+        The executable path and the cgroup are read only when some rule needs them.
+        """
+        exe = cgroup = None
+        with proc.oneshot():
+            name = proc.name() or ""
+            try:
+                cmdline = proc.cmdline() or []
+            except psutil.AccessDenied:
+                cmdline = []
+            if matcher.needs_exe:
+                try:
+                    exe = proc.exe()
+                except psutil.AccessDenied:
+                    pass
+        if self._read_cgroups or matcher.needs_cgroup:
+            cgroup = procfs.read_cgroup(proc.pid)
+
+        return ProcessVerdict(
+            pid=proc.pid,
+            start=proc.create_time(),
+            app_rule=matcher.match_process(name, cmdline, exe, cgroup),
+            webapp_rules=tuple(matcher.match_webapps(cmdline)),
+            proc=proc,
+            cgroup=cgroup,
+        )
+
+    def _full_scan_procfs(
+        self, matcher: BlocklistMatcher, reader: procfs.ProcfsReader
+    ) -> List[ProcessVerdict]:
+        verdicts: Dict[ProcessKey, ProcessVerdict] = {}
+
+        for pid in reader.iter_pids():
+            if pid == self._exclude_pid:
+                continue
+
+            # Always re-read: a recycled PID must not inherit the old verdict
+            start = reader.read_starttime(pid)
+            if start is None:
+                continue
+
+            verdict = self._verdicts.get((pid, start))
+            if verdict is None:
+                verdict = self._classify_procfs(matcher, reader, pid, start)
+                if verdict is None:
+                    continue
+
+            verdicts[verdict.key] = verdict
+
+        self._verdicts = verdicts
+        return [verdict for verdict in verdicts.values() if verdict.matched]
+
+    def _partial_scan_procfs(
+        self,
+        matcher: BlocklistMatcher,
+        reader: procfs.ProcfsReader,
+        pids: Iterable[int],
+    ) -> List[ProcessVerdict]:
+        matches: List[ProcessVerdict] = []
+
+        for pid in pids:
+            if pid == self._exclude_pid:
+                continue
+
+            start = reader.read_starttime(pid)
+            if start is None:
+                continue
+
+            verdict = self._classify_procfs(matcher, reader, pid, start)
+            if verdict is None:
+                continue
+
+            self._verdicts[verdict.key] = verdict
+            if verdict.matched:
+                matches.append(verdict)
+
+        return matches
+
+    def _classify_procfs(
+        self,
+        matcher: BlocklistMatcher,
+        reader: procfs.ProcfsReader,
+        pid: int,
+        start: int,
+    ) -> Optional[ProcessVerdict]:
+        """Read comm and cmdline of a new process from /proc and evaluate every rule."""
+        comm = reader.read_comm(pid)
+        if comm is None:
+            return None
+
+        cmdline = reader.read_cmdline(pid)
+        name = reader.full_name(comm, cmdline)
+        exe = reader.read_exe(pid) if matcher.needs_exe else None
+        read_cgroup = self._read_cgroups or matcher.needs_cgroup
+        cgroup = procfs.read_cgroup(pid) if read_cgroup else None
+
+        return ProcessVerdict(
+            pid=pid,
+            start=start,
+            app_rule=matcher.match_process(name, cmdline, exe, cgroup),
+            webapp_rules=tuple(matcher.match_webapps(cmdline)),
+            cgroup=cgroup,
+        )
+
+
+__all__ = [
+    "ProcessKey",
+    "ProcessVerdict",
+    "ProcessScanner",
+]
@@ -0,0 +1,155 @@
+"""
+core/scheduler.py
+Intervallo adattivo e segnale di risveglio del loop di blocco.
+Dopo un kill l'intervallo viene ridotto per un certo tempo (gli utenti spesso
+riaprono subito l'app), mentre in assenza di match prolungata cresce in modo
+esponenziale fino al massimo configurato.
+"""
+
+import os
+import select
+import time
+from typing import Optional
+
+from focus_mode_app.config import (
+    BLOCKING_INTERVAL,
+    BLOCKING_INTERVAL_MIN,
+    BLOCKING_INTERVAL_MAX,
+    BLOCKING_BOOST_DURATION,
+    BLOCKING_IDLE_BACKOFF_AFTER,
+    BLOCKING_BACKOFF_FACTOR,
+)
+
+
+class AdaptiveInterval:
+    """Computes the sleep time between two blocking scans.
+
+    Attributes:
+        base (float): Interval used in the steady state.
+        minimum (float): Interval used right after a kill.
+        maximum (float): Upper bound of the idle back-off.
+        current (float): The interval returned by the last `update()`.
+    """
+
+    def __init__(
+        self,
+        base: float = BLOCKING_INTERVAL,
+        minimum: float = BLOCKING_INTERVAL_MIN,
+        maximum: float = BLOCKING_INTERVAL_MAX,
+        boost_duration: float = BLOCKING_BOOST_DURATION,
+        idle_after: float = BLOCKING_IDLE_BACKOFF_AFTER,
+        factor: float = BLOCKING_BACKOFF_FACTOR,
+    ) -> None:
+        """Create the scheduler in its steady state.
+
+        Args:
+            base (float, optional): Steady state interval, clamped to [minimum, maximum].
+            minimum (float, optional): Interval right after a kill.
+            maximum (float, optional): Maximum idle interval.
+            boost_duration (float, optional): Seconds the minimum interval is kept after a kill.
+            idle_after (float, optional): Seconds without matches before backing off.
+            factor (float, optional): Multiplier applied on each idle back-off step.
+        """
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.base = min(max(base, self.minimum), self.maximum)
+        self._boost_duration = boost_duration
+        self._idle_after = idle_after
+        self._factor = factor
+        self.reset()
+
+    def reset(self, now: Optional[float] = None) -> None:
+        """Return to the steady state, e.g. when blocking is (re)activated.
+
+        Args:
+            now (Optional[float], optional): Current monotonic time.
+        """
+        now = time.monotonic() if now is None else now
+        self._last_kill: Optional[float] = None
+        self._last_match = now
+        self.current = self.base
+
+    def update(self, killed: int, now: Optional[float] = None) -> float:
+        """Record the outcome of a scan and return how long to sleep.
+
+        Args:
+            killed (int): Number of processes killed by the scan.
+            now (Optional[float], optional): Current monotonic time.
+
+        Returns:
+            float: Seconds to wait before the next scan.
+        """
+        now = time.monotonic() if now is None else now
+
+        if killed > 0:
+            self._last_kill = now
+            self._last_match = now
+
+        if self._last_kill is not None and now - self._last_kill < self._boost_duration:
+            self.current = self.minimum
+        elif now - self._last_match >= self._idle_after:
+            self.current = min(
+                max(self.current, self.base) * self._factor, self.maximum
+            )
+        else:
+            self.current = self.base
+
+        return self.current
+
+
+class WakeupSignal:
+    """Event-like wake-up flag that can also be watched with select().
+
+    Backed by a non-blocking pipe, so the blocking loop can wait on it together
+    with other descriptors (e.g. the proc connector socket).
+    """
+
+    def __init__(self) -> None:
+        """Create the underlying pipe."""
+        self._read_fd, self._write_fd = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+
+    def fileno(self) -> int:
+        """Return the descriptor that becomes readable when the signal is set."""
+        return self._read_fd
+
+    def set(self) -> None:
+        """Wake up the waiting thread. Safe to call from any thread."""
+        try:
+            os.write(self._write_fd, b"\0")
+        except BlockingIOError:
+            # The pipe is full: a wake-up is already pending
+            pass
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the signal is set or the timeout expires.
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait; None waits forever.
+
+        Returns:
+            bool: True if the signal was set, False on timeout.
+        """
+        ready, _, _ = select.select([self._read_fd], [], [], timeout)
+        return bool(ready)
+
+    def consume(self) -> bool:
+        """Clear every pending wake-up.
+
+        Returns:
+            bool: True if at least one wake-up was pending.
+        """
+        woken = False
+        while True:
+            try:
+                if not os.read(self._read_fd, 512):
+                    break
+                woken = True
+            except BlockingIOError:
+                break
+        return woken
+
+
+__all__ = [
+    "AdaptiveInterval",
+    "WakeupSignal",
+]
@@ -4,20 +4,138 @@ Application tracking for restore on Wayland/X11.
 Without xdotool - basic tracking only.
 """
 
+import contextlib
+import fcntl
 import json
+import queue
+import threading
 import time
-from typing import List, Dict, Optional, Any
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
 import psutil
 import os
 
-from focus_mode_app.config import SESSION_FILE, RESTORE_CONFIG_FILE
+from focus_mode_app.config import (
+    SESSION_FILE,
+    SESSION_JOURNAL_FILE,
+    RESTORE_CONFIG_FILE,
+    SESSION_CAPTURE_QUEUE_SIZE,
+    SESSION_JOURNAL_COMPACT_AFTER,
+    JSON_WRITE_COALESCE_WINDOW,
+)
+from focus_mode_app.core.atomic_io import read_json, write_json_atomic
+from focus_mode_app.core.sqlite_store import SQLiteStore, get_store
+
+
+def app_key(app_state: Dict[str, Any]) -> str:
+    """Return the restore list key of a captured application state.
+
+    Several blocklist rules can kill processes with the same name (e.g. two
+    webapps running in "chrome"), so killed apps are keyed by the rule that
+    matched. States saved before the rule was recorded fall back to the
+    process name.
+
+    Args:
+        app_state (Dict[str, Any]): The captured state dictionary.
+
+    Returns:
+        str: The blocklist rule name, or the process name.
+    """
+    return app_state.get("rule") or app_state.get("name", "")
+
+
+def _replace_app(
+    apps: List[Dict[str, Any]], app_name: str, app_state: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Return `apps` with `app_state` replacing any previous state of the same app.
+
+    Args:
+        apps (List[Dict[str, Any]]): The current killed apps.
+        app_name (str): The restore list key of the application.
+        app_state (Dict[str, Any]): The captured state dictionary.
+
+    Returns:
+        List[Dict[str, Any]]: A new list; `apps` is not modified.
+    """
+    return [a for a in apps if app_key(a) != app_name] + [app_state]
+
+
+def _write_snapshot(apps: List[Dict[str, Any]]) -> None:
+    """Atomically replace SESSION_FILE with `apps`.
+
+    Args:
+        apps (List[Dict[str, Any]]): The killed apps to save.
+    """
+    write_json_atomic(SESSION_FILE, apps, indent=2, backup=False)
+
+
+def _read_session_files() -> Tuple[List[Dict[str, Any]], int]:
+    """Read the JSON session snapshot and replay the journal on top of it.
+
+    A torn line (crash in the middle of an append) is skipped.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: The killed apps and the number of
+        journal records replayed.
+    """
+    apps: List[Dict[str, Any]] = []
+    if SESSION_FILE.exists():
+        with open(SESSION_FILE, "r") as f:
+            apps = json.load(f)
+
+    replayed = 0
+    if SESSION_JOURNAL_FILE.exists():
+        with open(SESSION_JOURNAL_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Records appended after a torn line are still valid
+                    print("[WARNING] Skipping a torn session journal line")
+                    continue
+                state = record["state"]
+                state.setdefault("rule", record["app"])
+                apps = _replace_app(apps, record["app"], state)
+                replayed += 1
+
+    return apps, replayed
+
+
+@contextlib.contextmanager
+def _shared_journal_lock() -> Iterator[None]:
+    """Hold a shared flock on the journal, so no process compacts meanwhile."""
+    try:
+        journal = open(SESSION_JOURNAL_FILE, "r", encoding="utf-8")
+    except FileNotFoundError:
+        yield
+        return
+
+    with journal:
+        fcntl.flock(journal.fileno(), fcntl.LOCK_SH)
+        yield
 
 
 class SessionTracker:
     """Tracks applications killed during the active session.
 
     Manages the persistent list of applications eligible for restoration and
-    tracks the active session's killed instances.
+    tracks the active session's killed instances. Killed apps reported through
+    `record_killed_app` are persisted by a background worker, so the blocker
+    never waits for the disk.
+
+    On disk the session is a JSON snapshot (SESSION_FILE) plus an append-only
+    JSON Lines journal (SESSION_JOURNAL_FILE) of the apps killed since; the
+    journal is folded into the snapshot on compaction. With the SQLite backend
+    restore list and killed apps are rows of the shared database instead.
     """
 
     def __init__(self) -> None:
@@ -25,17 +143,45 @@ class SessionTracker:
         self.killed_apps: List[Dict[str, Any]] = []
         self.restore_enabled: bool = False
         self.restore_list: Dict[str, Dict[str, Any]] = {}
+        self._pending: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(
+            maxsize=SESSION_CAPTURE_QUEUE_SIZE
+        )
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._journal_lock = threading.RLock()
+        self._journal: Optional[TextIO] = None
+        self._journal_records = 0
+        self._journal_dirty = False
         self.load_restore_config()
 
     def load_restore_config(self) -> None:
         """Load the list of applications configured for auto-restore from disk."""
+        store = get_store()
+        if store is None:
+            self._load_restore_config_json()
+            return
+
+        try:
+            if not store.is_migrated("restore_list"):
+                self._load_restore_config_json()
+                store.replace_restore_list(self.restore_list, commit=False)
+                store.mark_migrated("restore_list")
+                store.commit()
+
+            self.restore_list = store.load_restore_list()
+            print(f"[INFO] Restore config loaded: {len(self.restore_list)} apps")
+        except Exception as e:
+            print(f"[ERROR] Load restore config: {e}")
+            self.restore_list = {}
+
+    def _load_restore_config_json(self) -> None:
+        """Load the auto-restore list from RESTORE_CONFIG_FILE."""
         if not RESTORE_CONFIG_FILE.exists():
             self.restore_list = {}
             return
 
         try:
-            with open(RESTORE_CONFIG_FILE, "r") as f:
-                data = json.load(f)
+            data = read_json(RESTORE_CONFIG_FILE)
             self.restore_list = data
             print(f"[INFO] Restore config loaded: {len(data)} apps")
         except Exception as e:
@@ -45,22 +191,46 @@ class SessionTracker:
     def save_restore_config(self) -> None:
         """Save the current restore configuration to disk."""
         try:
-            RESTORE_CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(RESTORE_CONFIG_FILE, "w") as f:
-                json.dump(self.restore_list, f, indent=2)
+            store = get_store()
+            if store is not None:
+                store.replace_restore_list(self.restore_list)
+                return
+
+            write_json_atomic(
+                RESTORE_CONFIG_FILE,
+                self.restore_list,
+                indent=2,
+                coalesce=JSON_WRITE_COALESCE_WINDOW,
+            )
         except Exception as e:
             print(f"[ERROR] Save restore config: {e}")
 
-    def add_to_restore(self, app_name: str) -> None:
+    def add_to_restore(self, app_name: str, priority: int = 0) -> None:
         """Add an application to the auto-restore list.
 
         Args:
             app_name (str): The name of the application to be restored.
+            priority (int, optional): Apps with a higher priority are restored
+                (and ready) before the others are launched. Defaults to 0.
         """
-        self.restore_list[app_name] = {"enabled": True, "added_at": time.time()}
-        self.save_restore_config()
+        entry: Dict[str, Any] = {"enabled": True, "added_at": time.time()}
+        if priority:
+            entry["priority"] = priority
+        self.restore_list[app_name] = entry
+        self._save_restore_entry(app_name)
         print(f"[INFO] Added {app_name} to restore list")
 
+    def restore_priority(self, app_name: str) -> int:
+        """Return the restore priority of an application.
+
+        Args:
+            app_name (str): The name of the application.
+
+        Returns:
+            int: The priority set with `add_to_restore`, 0 if none.
+        """
+        return int(self.restore_list.get(app_name, {}).get("priority", 0))
+
     def remove_from_restore(self, app_name: str) -> None:
         """Remove an application from the auto-restore list.
 
@@ -69,12 +239,34 @@ class SessionTracker:
         """
         if app_name in self.restore_list:
             del self.restore_list[app_name]
-            self.save_restore_config()
+            self._save_restore_entry(app_name)
             print(f"[INFO] Removed {app_name} from restore list")
 
+    def _save_restore_entry(self, app_name: str) -> None:
+        """Persist the change of a single restore list entry.
+
+        Args:
+            app_name (str): The application added or removed.
+        """
+        store = get_store()
+        if store is None:
+            self.save_restore_config()
+            return
+
+        try:
+            if app_name in self.restore_list:
+                store.set_restore_entry(app_name, self.restore_list[app_name])
+            else:
+                store.delete_restore_entry(app_name)
+        except Exception as e:
+            print(f"[ERROR] Save restore config: {e}")
+
     def capture_app_state(self, proc: psutil.Process) -> Optional[Dict[str, Any]]:
         """Capture the state of an application without xdotool (Wayland-compatible).
 
+        Called on the blocker thread right before the kill: the attributes are
+        read inside a single `proc.oneshot()` so the snapshot stays cheap.
+
         Args:
             proc (psutil.Process): The psutil Process instance of the application.
 
@@ -82,72 +274,334 @@ class SessionTracker:
             Optional[Dict[str, Any]]: A dictionary containing the process state, or None if it fails.
         """
         try:
-            app_state = {
-                "pid": proc.pid,
-                "name": proc.name(),
-                "exe": proc.exe(),
-                "cmdline": proc.cmdline(),
-                "cwd": proc.cwd() if hasattr(proc, "cwd") else None,
-                "timestamp": time.time(),
-                "user": os.getenv("USER"),
-            }
+            with proc.oneshot():
+                app_state = {
+                    "pid": proc.pid,
+                    "name": proc.name(),
+                    "exe": proc.exe(),
+                    "cmdline": proc.cmdline(),
+                    "cwd": proc.cwd() if hasattr(proc, "cwd") else None,
+                    "timestamp": time.time(),
+                    "user": os.getenv("USER"),
+                }
             return app_state
 
         except Exception as e:
             print(f"[ERROR] Capture state: {e}")
             return None
 
-    def add_killed_app(self, app_name: str, app_state: Dict[str, Any]) -> None:
+    def add_killed_app(
+        self, app_name: str, app_state: Dict[str, Any], sync: bool = True
+    ) -> None:
         """Add a killed application to the current session IF it is in the restore list.
 
+        The app is appended to the session journal instead of rewriting the
+        whole session file.
+
         Args:
-            app_name (str): The name of the application.
-            app_state (Dict[str, Any]): The captured state dictionary.
+            app_name (str): The blocklist rule that matched, the restore list key.
+            app_state (Dict[str, Any]): The captured state dictionary; the rule
+                is recorded in it as "rule".
+            sync (bool, optional): fsync the journal right away. The session
+                worker passes False and syncs once per batch.
         """
         if app_name not in self.restore_list:
             # Not in restore list, ignore
             return
 
-        # Remove duplicates of the same app
-        self.killed_apps = [a for a in self.killed_apps if a.get("name") != app_name]
+        app_state = dict(app_state, rule=app_name)
+        store = get_store()
+        with self._journal_lock:
+            if store is None:
+                self._prepare_journal()
+            # The list is swapped in one step so readers on other threads never
+            # see it half updated
+            self.killed_apps = _replace_app(self.killed_apps, app_name, app_state)
+            if store is not None:
+                try:
+                    store.save_killed_app(app_name, app_state, commit=sync)
+                except Exception as e:
+                    print(f"[ERROR] Save session: {e}")
+            else:
+                self._append_journal({"app": app_name, "state": app_state})
+                if sync:
+                    self._sync_journal()
 
-        # Add
-        self.killed_apps.append(app_state)
-        self.save_session()
         print(f"[DEBUG] Tracked kill: {app_name}")
 
-    def save_session(self) -> None:
-        """Save the current session data (killed apps) to disk."""
+    def record_killed_app(self, app_name: str, app_state: Dict[str, Any]) -> None:
+        """Queue a killed application for the background session worker.
+
+        Same as `add_killed_app`, but the list update and the disk write happen
+        on the worker thread. When the queue is full the app is recorded
+        synchronously instead of being dropped.
+
+        Args:
+            app_name (str): The name of the application.
+            app_state (Dict[str, Any]): The captured state dictionary.
+        """
+        self._ensure_worker()
+        try:
+            self._pending.put_nowait((app_name, app_state))
+        except queue.Full:
+            print("[WARNING] Session queue full, saving synchronously")
+            self.add_killed_app(app_name, app_state)
+
+    def flush(self) -> None:
+        """Wait until every queued killed app has been recorded and saved."""
+        if self._worker is not None and threading.current_thread() is not self._worker:
+            self._pending.join()
+
+    def _ensure_worker(self) -> None:
+        """Start the session worker thread on first use."""
+        if self._worker is not None:
+            return
+
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run_worker, name="session-worker", daemon=True
+                )
+                self._worker.start()
+
+    def _run_worker(self) -> None:
+        """Record queued killed apps, with a single fsync per burst."""
+        while True:
+            batch = [self._pending.get()]
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                for app_name, app_state in batch:
+                    self.add_killed_app(app_name, app_state, sync=False)
+                self._sync_journal()
+            except Exception as e:
+                print(f"[ERROR] Session worker: {e}")
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def _prepare_journal(self) -> None:
+        """Compact the journal when it is not open yet or has grown too long.
+
+        The first kill of a process compacts first, so the journal always
+        extends the snapshot of the current session, like the full rewrite did.
+        A journal deleted by another process (`clear_session`) is reopened.
+        """
+        if (
+            self._journal is not None
+            and self._journal_records < SESSION_JOURNAL_COMPACT_AFTER
+            and os.fstat(self._journal.fileno()).st_nlink > 0
+        ):
+            return
         try:
-            SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(SESSION_FILE, "w") as f:
-                json.dump(self.killed_apps, f, indent=2)
+            self._compact()
         except Exception as e:
             print(f"[ERROR] Save session: {e}")
 
+    def _append_journal(self, record: Dict[str, Any]) -> None:
+        """Append one record to the journal (flushed to the OS, not yet fsynced).
+
+        Args:
+            record (Dict[str, Any]): The record to append.
+        """
+        if self._journal is None:
+            return
+        try:
+            # Shared lock: another process cannot compact in the middle
+            fcntl.flock(self._journal.fileno(), fcntl.LOCK_SH)
+            try:
+                self._journal.write(json.dumps(record) + "\n")
+                self._journal.flush()
+            finally:
+                fcntl.flock(self._journal.fileno(), fcntl.LOCK_UN)
+            self._journal_records += 1
+            self._journal_dirty = True
+        except Exception as e:
+            print(f"[ERROR] Save session: {e}")
+
+    def _sync_journal(self) -> None:
+        """fsync the journal (or commit the database) if records were appended."""
+        store = get_store()
+        if store is not None:
+            try:
+                store.commit()
+            except Exception as e:
+                print(f"[ERROR] Save session: {e}")
+            return
+
+        with self._journal_lock:
+            if self._journal is None or not self._journal_dirty:
+                return
+            try:
+                os.fsync(self._journal.fileno())
+                self._journal_dirty = False
+            except OSError as e:
+                print(f"[ERROR] Sync session journal: {e}")
+
+    def _close_journal(self) -> None:
+        """Close the journal file handle, if open."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _compact(self, keep: Optional[Callable[[Dict[str, Any]], bool]] = None) -> None:
+        """Fold the journal into an atomically written SESSION_FILE snapshot.
+
+        The GUI and the CLI may append to the same journal: it is opened in
+        append mode and compacted under an exclusive flock, rebuilding the
+        snapshot from the files (which hold the records of every process)
+        rather than from this process' view.
+
+        The snapshot is replaced before the journal is truncated: a crash in
+        between only leaves records that replay to the same state.
+
+        Args:
+            keep (Optional[Callable[[Dict[str, Any]], bool]], optional): Filter
+                of the killed apps written to the snapshot; all by default.
+        """
+        if self._journal is None or os.fstat(self._journal.fileno()).st_nlink == 0:
+            self._close_journal()
+            self._journal = open(SESSION_JOURNAL_FILE, "a", encoding="utf-8")
+
+        fd = self._journal.fileno()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            apps, _ = _read_session_files()
+            if keep is not None:
+                apps = [app_state for app_state in apps if keep(app_state)]
+            self.killed_apps = apps
+            _write_snapshot(apps)
+            os.ftruncate(fd, 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+        self._journal_records = 0
+        self._journal_dirty = False
+
+    def save_session(self) -> None:
+        """Save the current session data (killed apps) to disk."""
+        with self._journal_lock:
+            try:
+                store = get_store()
+                if store is not None:
+                    store.clear_killed_apps(commit=False)
+                    for app_state in self.killed_apps:
+                        store.save_killed_app(
+                            app_key(app_state), app_state, commit=False
+                        )
+                    store.commit()
+                    return
+
+                self._compact()
+            except Exception as e:
+                print(f"[ERROR] Save session: {e}")
+
     def load_session(self) -> List[Dict[str, Any]]:
         """Load the previous session data from disk.
 
+        Reads the last snapshot and replays the journal on top of it. A torn
+        line (crash in the middle of an append) is skipped. Loading never
+        writes: the journal may be open in another process (the GUI while the
+        CLI runs), and only the process appending to it compacts it.
+
         Returns:
             List[Dict[str, Any]]: The list of captured application states.
         """
-        if not SESSION_FILE.exists():
+        store = get_store()
+        if store is not None:
+            return self._load_session_store(store)
+
+        if not SESSION_FILE.exists() and not SESSION_JOURNAL_FILE.exists():
             return []
 
+        with self._journal_lock:
+            try:
+                with _shared_journal_lock():
+                    self.killed_apps, _ = _read_session_files()
+
+                print(f"[INFO] Session loaded: {len(self.killed_apps)} apps")
+                return self.killed_apps
+            except Exception as e:
+                print(f"[ERROR] Load session: {e}")
+                return []
+
+    def _load_session_store(self, store: SQLiteStore) -> List[Dict[str, Any]]:
+        """Load the killed apps from the database, importing the JSON session once.
+
+        Args:
+            store (SQLiteStore): The shared database.
+
+        Returns:
+            List[Dict[str, Any]]: The list of captured application states.
+        """
         try:
-            with open(SESSION_FILE, "r") as f:
-                self.killed_apps = json.load(f)
+            if not store.is_migrated("session"):
+                apps, _ = _read_session_files()
+                for app_state in apps:
+                    store.save_killed_app(app_key(app_state), app_state, commit=False)
+                store.mark_migrated("session")
+                store.commit()
+
+            self.killed_apps = store.load_killed_apps()
             print(f"[INFO] Session loaded: {len(self.killed_apps)} apps")
             return self.killed_apps
         except Exception as e:
             print(f"[ERROR] Load session: {e}")
             return []
 
+    def discard_killed_apps(self, apps: Iterable[Dict[str, Any]]) -> None:
+        """Forget killed apps that have been restored.
+
+        Only the given states are removed: an app killed again meanwhile (e.g.
+        blocking turned back on during the restore) keeps its newer state.
+
+        Args:
+            apps (Iterable[Dict[str, Any]]): The states handed to the restore.
+        """
+        done = {app_key(app_state): app_state for app_state in apps}
+
+        def keep(app_state: Dict[str, Any]) -> bool:
+            return done.get(app_key(app_state)) != app_state
+
+        self.flush()
+        with self._journal_lock:
+            try:
+                store = get_store()
+                if store is None:
+                    self._compact(keep)
+                    return
+
+                for key, app_state in done.items():
+                    store.delete_killed_app(key, app_state, commit=False)
+                store.commit()
+                self.killed_apps = store.load_killed_apps()
+            except Exception as e:
+                print(f"[ERROR] Save session: {e}")
+
     def clear_session(self) -> None:
-        """Clear the current session data from memory and delete the file."""
-        self.killed_apps = []
-        if SESSION_FILE.exists():
-            SESSION_FILE.unlink()
+        """Clear the current session data from memory and delete the files."""
+        self.flush()
+        with self._journal_lock:
+            self.killed_apps = []
+            self._close_journal()
+            for path in (SESSION_JOURNAL_FILE, SESSION_FILE):
+                if path.exists():
+                    path.unlink()
+
+            store = get_store()
+            if store is not None:
+                try:
+                    store.clear_killed_apps()
+                except Exception as e:
+                    print(f"[ERROR] Clear session: {e}")
         print("[INFO] Session cleared")
 
     def get_killed_apps(self) -> List[Dict[str, Any]]:
@@ -156,6 +610,7 @@ class SessionTracker:
         Returns:
             List[Dict[str, Any]]: List of captured application states.
         """
+        self.flush()
         return self.killed_apps
 
 
@@ -0,0 +1,385 @@
+"""
+core/sqlite_store.py
+Backend SQLite opzionale per blocklist, lista di restore e sessione.
+Attivo con STORAGE_BACKEND = "sqlite": un unico database in modalità WAL con
+indici su (name, type) e modifiche multi-elemento in una sola transazione.
+Le API pubbliche restano quelle di core/storage.py e core/session.py; al primo
+avvio i dati vengono migrati automaticamente dai file JSON esistenti.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from focus_mode_app.config import STORAGE_BACKEND, SQLITE_DB_FILE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocked_items (
+    id   INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    UNIQUE (name, type)
+);
+CREATE TABLE IF NOT EXISTS restore_list (
+    name     TEXT PRIMARY KEY,
+    enabled  INTEGER NOT NULL DEFAULT 1,
+    added_at REAL,
+    priority INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS killed_apps (
+    seq   INTEGER PRIMARY KEY AUTOINCREMENT,
+    name  TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteStore:
+    """Single-connection SQLite store shared by every thread.
+
+    All statements are serialized by a lock; each public method is one
+    transaction unless `commit=False` is passed, in which case the changes
+    are committed by the next `commit()`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (or create) the database and its schema.
+
+        Args:
+            path (Path): The database file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last transactions on power loss,
+        # never the consistency of the database
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._upgrade_schema()
+        self._conn.commit()
+
+    def _upgrade_schema(self) -> None:
+        """Add the columns introduced after a database was created."""
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(restore_list)")
+        }
+        if "priority" not in columns:
+            self._conn.execute(
+                "ALTER TABLE restore_list ADD COLUMN priority INTEGER NOT NULL DEFAULT 0"
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def commit(self) -> None:
+        """Commit the changes made with `commit=False`."""
+        with self._lock:
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Migration bookkeeping
+    # ------------------------------------------------------------------
+
+    def is_migrated(self, store: str) -> bool:
+        """Check whether a JSON store has already been imported.
+
+        Args:
+            store (str): Store identifier (e.g. "blocked_items").
+
+        Returns:
+            bool: True once `mark_migrated(store)` has been called.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM meta WHERE key = ?", (f"migrated:{store}",)
+            ).fetchone()
+        return row is not None
+
+    def mark_migrated(self, store: str) -> None:
+        """Record that a JSON store has been imported (part of the open transaction).
+
+        Args:
+            store (str): Store identifier.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')",
+                (f"migrated:{store}",),
+            )
+
+    # ------------------------------------------------------------------
+    # Blocklist
+    # ------------------------------------------------------------------
+
+    def load_blocked_items(self) -> List[Dict[str, str]]:
+        """Return the blocklist in insertion order.
+
+        Returns:
+            List[Dict[str, str]]: Items as {"name": ..., "type": ...}.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, type FROM blocked_items ORDER BY id"
+            ).fetchall()
+        return [{"name": name, "type": item_type} for name, item_type in rows]
+
+    def has_blocked_item(self, name: str, item_type: str) -> bool:
+        """Indexed lookup of a single item.
+
+        Args:
+            name (str): Item name.
+            item_type (str): "app" or "webapp".
+
+        Returns:
+            bool: True if the item is in the blocklist.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM blocked_items WHERE name = ? AND type = ?",
+                (name, item_type),
+            ).fetchone()
+        return row is not None
+
+    def add_blocked_items(
+        self, items: Iterable[Tuple[str, str]], commit: bool = True
+    ) -> int:
+        """Insert several items at once, ignoring the ones already present.
+
+        Args:
+            items (Iterable[Tuple[str, str]]): (name, type) pairs.
+            commit (bool, optional): Commit the transaction.
+
+        Returns:
+            int: The number of items actually inserted.
+        """
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO blocked_items (name, type) VALUES (?, ?)",
+                items,
+            )
+            if commit:
+                self._conn.commit()
+            return self._conn.total_changes - before
+
+    def remove_blocked_items(
+        self, items: Iterable[Tuple[str, str]], commit: bool = True
+    ) -> int:
+        """Delete several items at once.
+
+        Args:
+            items (Iterable[Tuple[str, str]]): (name, type) pairs.
+            commit (bool, optional): Commit the transaction.
+
+        Returns:
+            int: The number of items actually deleted.
+        """
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "DELETE FROM blocked_items WHERE name = ? AND type = ?", items
+            )
+            if commit:
+                self._conn.commit()
+            return self._conn.total_changes - before
+
+    def replace_blocked_items(
+        self, items: Iterable[Dict[str, str]], commit: bool = True
+    ) -> None:
+        """Replace the whole blocklist in a single transaction.
+
+        Args:
+            items (Iterable[Dict[str, str]]): The new blocklist.
+            commit (bool, optional): Commit the transaction.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM blocked_items")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO blocked_items (name, type) VALUES (?, ?)",
+                [(item["name"], item["type"]) for item in items],
+            )
+            if commit:
+                self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Restore list
+    # ------------------------------------------------------------------
+
+    def load_restore_list(self) -> Dict[str, Dict[str, Any]]:
+        """Return the apps configured for auto-restore.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: name -> {"enabled": ..., "added_at": ...},
+            plus "priority" when it is not 0.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, enabled, added_at, priority FROM restore_list "
+                "ORDER BY rowid"
+            ).fetchall()
+
+        restore_list: Dict[str, Dict[str, Any]] = {}
+        for name, enabled, added_at, priority in rows:
+            entry: Dict[str, Any] = {"enabled": bool(enabled), "added_at": added_at}
+            if priority:
+                entry["priority"] = priority
+            restore_list[name] = entry
+        return restore_list
+
+    def set_restore_entry(
+        self, name: str, entry: Dict[str, Any], commit: bool = True
+    ) -> None:
+        """Insert or update a single restore list entry.
+
+        Args:
+            name (str): The application name.
+            entry (Dict[str, Any]): {"enabled": ..., "added_at": ..., "priority": ...}.
+            commit (bool, optional): Commit the transaction.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO restore_list (name, enabled, added_at, priority) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    name,
+                    int(bool(entry.get("enabled", True))),
+                    entry.get("added_at"),
+                    int(entry.get("priority", 0)),
+                ),
+            )
+            if commit:
+                self._conn.commit()
+
+    def delete_restore_entry(self, name: str, commit: bool = True) -> None:
+        """Remove a single restore list entry.
+
+        Args:
+            name (str): The application name.
+            commit (bool, optional): Commit the transaction.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM restore_list WHERE name = ?", (name,))
+            if commit:
+                self._conn.commit()
+
+    def replace_restore_list(
+        self, restore_list: Dict[str, Dict[str, Any]], commit: bool = True
+    ) -> None:
+        """Replace the whole restore list in a single transaction.
+
+        Args:
+            restore_list (Dict[str, Dict[str, Any]]): The new restore list.
+            commit (bool, optional): Commit the transaction.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM restore_list")
+            for name, entry in restore_list.items():
+                self.set_restore_entry(name, entry, commit=False)
+            if commit:
+                self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Session (killed apps)
+    # ------------------------------------------------------------------
+
+    def load_killed_apps(self) -> List[Dict[str, Any]]:
+        """Return the captured states of the apps killed in the session.
+
+        Returns:
+            List[Dict[str, Any]]: States ordered from the oldest kill.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state FROM killed_apps ORDER BY seq"
+            ).fetchall()
+        return [json.loads(state) for (state,) in rows]
+
+    def save_killed_app(
+        self, app_name: str, app_state: Dict[str, Any], commit: bool = True
+    ) -> None:
+        """Record a killed app, replacing any previous state of the same app.
+
+        Args:
+            app_name (str): The name of the application.
+            app_state (Dict[str, Any]): The captured state dictionary.
+            commit (bool, optional): Commit the transaction.
+        """
+        with self._lock:
+            # Delete + insert moves the app to the end, like the JSON session
+            self._conn.execute("DELETE FROM killed_apps WHERE name = ?", (app_name,))
+            self._conn.execute(
+                "INSERT INTO killed_apps (name, state) VALUES (?, ?)",
+                (app_name, json.dumps(app_state)),
+            )
+            if commit:
+                self._conn.commit()
+
+    def delete_killed_app(
+        self, app_name: str, app_state: Dict[str, Any], commit: bool = True
+    ) -> None:
+        """Forget a killed app, unless a newer state has replaced `app_state`.
+
+        Args:
+            app_name (str): The name of the application.
+            app_state (Dict[str, Any]): The state to forget.
+            commit (bool, optional): Commit the transaction.
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM killed_apps WHERE name = ? AND state = ?",
+                (app_name, json.dumps(app_state)),
+            )
+            if commit:
+                self._conn.commit()
+
+    def clear_killed_apps(self, commit: bool = True) -> None:
+        """Forget every killed app of the session.
+
+        Args:
+            commit (bool, optional): Commit the transaction.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM killed_apps")
+            if commit:
+                self._conn.commit()
+
+
+_store: Optional[SQLiteStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> Optional[SQLiteStore]:
+    """Return the shared SQLite store, or None with the JSON backend.
+
+    Returns:
+        Optional[SQLiteStore]: The store, opened on first use.
+    """
+    global _store
+
+    if STORAGE_BACKEND != "sqlite":
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SQLiteStore(SQLITE_DB_FILE)
+                print(f"[INFO] Storage SQLite: {SQLITE_DB_FILE}")
+    return _store
+
+
+__all__ = [
+    "SQLiteStore",
+    "get_store",
+]
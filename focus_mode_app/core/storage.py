@@ -2,16 +2,24 @@
 core/storage.py
 Gestione del salvataggio e caricamento dei dati (lista app/webapp bloccate).
 Include migrazione automatica dal vecchio formato.
+Con STORAGE_BACKEND = "sqlite" i dati risiedono nel database di
+core/sqlite_store.py, importati automaticamente dal file JSON al primo avvio.
 """
 
 import json
-from typing import List, Dict
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from focus_mode_app.config import get_data_file_path
+from focus_mode_app.config import get_data_file_path, JSON_WRITE_COALESCE_WINDOW
+from focus_mode_app.core.atomic_io import read_json, write_json_atomic
+from focus_mode_app.core.blocklist import BlockEntry, BlockList
+from focus_mode_app.core.matcher import validate_rule
+from focus_mode_app.core.sqlite_store import get_store
 
-# Lista globale degli elementi bloccati
-# Ogni elemento è un dict: {"name": "...", "type": "app" | "webapp"}
-blocked_items: List[Dict[str, str]] = []
+# Lista globale degli elementi bloccati, indicizzata per (name, type)
+# Ogni elemento si legge come un dict: {"name": "...", "type": "app" | "webapp"}
+# Viene sempre modificata sul posto: chi la importa vede il contenuto aggiornato
+blocked_items = BlockList()
 
 
 # ============================================================================
@@ -22,14 +30,31 @@ blocked_items: List[Dict[str, str]] = []
 def save_blocked_items() -> bool:
     """Save the list of blocked items to the JSON configuration file.
 
+    The file is replaced atomically, keeping the previous version as .bak;
+    saves closer than `JSON_WRITE_COALESCE_WINDOW` are merged into one write.
+
     Returns:
         bool: True if the save was successful, False otherwise.
     """
+    store = get_store()
+    if store is not None:
+        try:
+            store.replace_blocked_items(blocked_items.to_dicts())
+            print(f"[INFO] Lista salvata in {store.path}")
+            return True
+        except sqlite3.Error as e:
+            print(f"[ERROR] Errore durante il salvataggio: {e}")
+            return False
+
     data_file = get_data_file_path()
 
     try:
-        with open(data_file, "w", encoding="utf-8") as f:
-            json.dump(blocked_items, f, indent=4, ensure_ascii=False)
+        write_json_atomic(
+            data_file,
+            blocked_items.to_dicts(),
+            indent=4,
+            coalesce=JSON_WRITE_COALESCE_WINDOW,
+        )
 
         print(f"[INFO] Lista salvata in {data_file}")
         return True
@@ -49,46 +74,75 @@ def save_blocked_items() -> bool:
 
 
 def load_blocked_items() -> bool:
-    """Load the list of blocked items from the JSON configuration file.
+    """Load the list of blocked items from the configured storage backend.
+
+    Automatically handles migration if the legacy JSON format is detected,
+    and imports the JSON file into the SQLite database on its first use.
+
+    Returns:
+        bool: True if the load was successful, False otherwise.
+    """
+    store = get_store()
+    if store is None:
+        return _load_from_json()
+
+    try:
+        if not store.is_migrated("blocked_items"):
+            print("[INFO] Importazione della blocklist JSON nel database...")
+            if not _load_from_json():
+                # Keep the JSON file as the source of truth until it is readable
+                return False
+            store.replace_blocked_items(blocked_items.to_dicts(), commit=False)
+            store.mark_migrated("blocked_items")
+            store.commit()
+
+        blocked_items.replace_all(store.load_blocked_items())
+        print(f"[INFO] Elementi bloccati caricati: {len(blocked_items)}")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"[ERROR] Errore durante il caricamento dal database: {e}")
+        blocked_items.clear()
+        return False
+
 
-    Automatically handles migration if the legacy JSON format is detected.
+def _load_from_json() -> bool:
+    """Load the list of blocked items from the JSON configuration file.
 
     Returns:
         bool: True if the load was successful, False otherwise.
     """
-    global blocked_items
     data_file = get_data_file_path()
 
     if not data_file.exists():
         print(f"[INFO] File di configurazione non trovato: {data_file}")
         print("[INFO] Verrà creato automaticamente al primo salvataggio")
-        blocked_items = []
+        blocked_items.clear()
         return True
 
     try:
-        with open(data_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(data_file)
 
         # Controlla se è il vecchio formato (dict con "apps_native" e "webapp_elements")
         if isinstance(data, dict) and (
             "apps_native" in data or "webapp_elements" in data
         ):
             print("[INFO] Rilevato vecchio formato, migrazione in corso...")
-            blocked_items = migrate_old_format(data)
+            blocked_items.replace_all(migrate_old_format(data))
             # Salva subito nel nuovo formato
             save_blocked_items()
             print("[INFO] Migrazione completata!")
 
         # Nuovo formato (lista di dict)
         elif isinstance(data, list):
-            blocked_items = data
+            blocked_items.replace_all(data)
             print(f"[INFO] Lista caricata da {data_file}")
 
         else:
             print(
                 "[WARNING] Formato file non riconosciuto, inizializzazione lista vuota"
             )
-            blocked_items = []
+            blocked_items.clear()
 
         print(f"[INFO] Elementi bloccati caricati: {len(blocked_items)}")
         return True
@@ -96,12 +150,12 @@ def load_blocked_items() -> bool:
     except json.JSONDecodeError as e:
         print(f"[ERROR] File JSON corrotto: {e}")
         print("[INFO] Inizializzazione lista vuota")
-        blocked_items = []
+        blocked_items.clear()
         return False
 
     except Exception as e:
         print(f"[ERROR] Errore durante il caricamento: {e}")
-        blocked_items = []
+        blocked_items.clear()
         return False
 
 
@@ -156,29 +210,38 @@ def add_blocked_item(name: str, item_type: str) -> bool:
 
     Args:
         name (str): Name of the application or URL of the web application.
-        item_type (str): The type of item, strictly "app" or "webapp".
+        item_type (str): The rule type, one of `RULE_TYPES` ("app", "webapp",
+            "comm", "glob", "regex", "exe", "appid", "argv").
 
     Returns:
-        bool: True if successfully added, False if invalid type or already exists.
+        bool: True if successfully added, False if invalid rule or already exists.
     """
-    if item_type not in ["app", "webapp"]:
-        print(f"[WARNING] Tipo non valido: {item_type}")
+    error = validate_rule(name, item_type)
+    if error is not None:
+        print(f"[WARNING] {error}")
         return False
 
-    # Controlla duplicati
-    for item in blocked_items:
-        if item["name"] == name and item["type"] == item_type:
-            print(f"[WARNING] Elemento già presente: {name} ({item_type})")
-            return False
-
-    # Aggiungi nuovo elemento
-    new_item = {"name": name, "type": item_type}
-    blocked_items.append(new_item)
+    # Aggiunge il nuovo elemento (controllo duplicati sull'indice)
+    if not blocked_items.add(name, item_type):
+        print(f"[WARNING] Elemento già presente: {name} ({item_type})")
+        return False
 
-    # Salva automaticamente
-    save_blocked_items()
+    # Salva automaticamente (sul database basta inserire la riga)
+    store = get_store()
+    if store is not None:
+        try:
+            store.add_blocked_items([(name, item_type)])
+        except sqlite3.Error as e:
+            print(f"[ERROR] Errore durante il salvataggio: {e}")
+    else:
+        save_blocked_items()
     print(f"[INFO] Aggiunto: {name} ({item_type})")
 
+    # Applica subito il nuovo elemento se il blocco è attivo
+    from focus_mode_app.core.blocker import request_scan
+
+    request_scan()
+
     return True
 
 
@@ -192,15 +255,157 @@ def remove_blocked_item(index: int) -> bool:
         bool: True if removed successfully, False if the index is out of bounds.
     """
     if 0 <= index < len(blocked_items):
-        removed_item = blocked_items.pop(index)
-        save_blocked_items()
-        print(f"[INFO] Rimosso: {removed_item['name']} ({removed_item['type']})")
+        _persist_removal(blocked_items.pop(index))
         return True
     else:
         print(f"[WARNING] Indice non valido: {index}")
         return False
 
 
+def remove_blocked_item_by_name(name: str, item_type: Optional[str] = None) -> bool:
+    """Remove an item from the blocklist by its name.
+
+    Args:
+        name (str): The exact name of the item.
+        item_type (Optional[str], optional): The rule type; None removes the
+            first item with that name, trying "app" first.
+
+    Returns:
+        bool: True if removed successfully, False if no item has that name.
+    """
+    entry = blocked_items.find(name, item_type)
+    if entry is None or blocked_items.discard(entry.name, entry.type) is None:
+        print(f"[WARNING] Elemento non trovato: {name}")
+        return False
+
+    _persist_removal(entry)
+    return True
+
+
+def _persist_removal(removed_item: BlockEntry) -> None:
+    """Save the blocklist after `removed_item` has been taken out of it."""
+    store = get_store()
+    if store is not None:
+        try:
+            store.remove_blocked_items([removed_item.key])
+        except sqlite3.Error as e:
+            print(f"[ERROR] Errore durante il salvataggio: {e}")
+    else:
+        save_blocked_items()
+    print(f"[INFO] Rimosso: {removed_item.name} ({removed_item.type})")
+
+
+# ============================================================================
+# OPERAZIONI MULTI-ELEMENTO
+# ============================================================================
+
+
+def _valid_entries(items: Iterable[Dict[str, str]]) -> Iterator[BlockEntry]:
+    """Yield the items as BlockEntry, skipping the malformed ones."""
+    for item in items:
+        name = str(item.get("name", "")).strip()
+        item_type = str(item.get("type", ""))
+        error = validate_rule(name, item_type)
+        if error is not None:
+            print(f"[WARNING] Elemento non valido ignorato ({error}): {item}")
+            continue
+        yield BlockEntry(name, item_type)
+
+
+def add_many(items: Iterable[Dict[str, str]]) -> int:
+    """Add several items to the blocklist, persisting them once.
+
+    Items already in the list and malformed items are skipped.
+
+    Args:
+        items (Iterable[Dict[str, str]]): Items as {"name": ..., "type": ...}.
+
+    Returns:
+        int: The number of items actually added.
+    """
+    return apply_batch(items, ())[0]
+
+
+def remove_many(items: Iterable[Dict[str, str]]) -> int:
+    """Remove several items from the blocklist, persisting the change once.
+
+    Args:
+        items (Iterable[Dict[str, str]]): Items as {"name": ..., "type": ...}.
+
+    Returns:
+        int: The number of items actually removed.
+    """
+    return apply_batch((), items)[1]
+
+
+def apply_batch(
+    add: Iterable[Dict[str, str]], remove: Iterable[Dict[str, str]]
+) -> Tuple[int, int]:
+    """Remove and add items in a single step, persisting the change once.
+
+    Removals are applied first. The blocklist changes under its lock and the
+    disk is written once (one transaction with SQLite), so a crash never
+    leaves a half-applied batch.
+
+    Args:
+        add (Iterable[Dict[str, str]]): Items to add; present and malformed
+            items are skipped.
+        remove (Iterable[Dict[str, str]]): Items to remove.
+
+    Returns:
+        Tuple[int, int]: The number of items actually added and removed.
+    """
+    added, removed = blocked_items.apply_batch(
+        _valid_entries(add), _valid_entries(remove)
+    )
+    if not added and not removed:
+        return 0, 0
+
+    store = get_store()
+    if store is not None:
+        try:
+            store.remove_blocked_items([entry.key for entry in removed], commit=False)
+            store.add_blocked_items([entry.key for entry in added], commit=False)
+            store.commit()
+        except sqlite3.Error as e:
+            print(f"[ERROR] Errore durante il salvataggio: {e}")
+    else:
+        save_blocked_items()
+
+    if removed:
+        print(f"[INFO] Rimossi {len(removed)} elementi")
+    if added:
+        print(f"[INFO] Aggiunti {len(added)} elementi")
+
+        from focus_mode_app.core.blocker import request_scan
+
+        request_scan()
+
+    return len(added), len(removed)
+
+
+def replace_all(items: Iterable[Dict[str, str]]) -> int:
+    """Replace the whole blocklist, persisting it once.
+
+    Malformed items and duplicates are skipped.
+
+    Args:
+        items (Iterable[Dict[str, str]]): The new blocklist.
+
+    Returns:
+        int: The number of items in the new blocklist.
+    """
+    blocked_items.replace_all(_valid_entries(items))
+    save_blocked_items()
+    print(f"[INFO] Lista sostituita: {len(blocked_items)} elementi")
+
+    from focus_mode_app.core.blocker import request_scan
+
+    request_scan()
+
+    return len(blocked_items)
+
+
 def get_blocked_items() -> List[Dict[str, str]]:
     """Return a copy of the complete blocklist.
 
@@ -216,7 +421,7 @@ def get_blocked_apps() -> List[str]:
     Returns:
         List[str]: A list of native application names.
     """
-    return [item["name"] for item in blocked_items if item["type"] == "app"]
+    return list(blocked_items.names("app"))
 
 
 def get_blocked_webapps() -> List[str]:
@@ -225,13 +430,12 @@ def get_blocked_webapps() -> List[str]:
     Returns:
         List[str]: A list of web usage URLs or string identifiers.
     """
-    return [item["name"] for item in blocked_items if item["type"] == "webapp"]
+    return list(blocked_items.names("webapp"))
 
 
 def clear_blocked_items() -> None:
     """Completely clear the list of blocked items and save to disk."""
-    global blocked_items
-    blocked_items = []
+    blocked_items.clear()
     save_blocked_items()
     print("[INFO] Lista elementi bloccati svuotata")
 
@@ -246,6 +450,11 @@ __all__ = [
     "load_blocked_items",
     "add_blocked_item",
     "remove_blocked_item",
+    "remove_blocked_item_by_name",
+    "add_many",
+    "remove_many",
+    "apply_batch",
+    "replace_all",
     "get_blocked_items",
     "get_blocked_apps",
     "get_blocked_webapps",
@@ -0,0 +1,148 @@
+"""
+core/subprocess_env.py
+Ambiente dei processi avviati dall'applicazione (app ripristinate, notify-send).
+Quando l'app gira come AppImage/PyInstaller l'ambiente contiene override delle
+librerie che non devono arrivare ai processi figli: l'ambiente ripulito viene
+costruito una volta sola e ricostruito solo se os.environ cambia.
+Insieme all'ambiente viene mantenuta una tabella di lookup nel PATH per gli
+eseguibili lanciati spesso, così non serve cercarli a ogni avvio.
+"""
+
+import os
+import shutil
+import threading
+from typing import Dict, Optional
+
+# Variables set by the AppImage runtime and PyInstaller for our own process
+_BUNDLE_VARS = (
+    "APPDIR",
+    "APPIMAGE",
+    "APPIMAGE_EXTRACT_AND_RUN",
+    "TCL_LIBRARY",
+    "TK_LIBRARY",
+)
+
+# Executables resolved as soon as the environment is built
+COMMON_EXECUTABLES = ("notify-send", "wmctrl", "xdg-open", "flatpak", "snap")
+
+_lock = threading.Lock()
+_source: Optional[Dict] = None
+_env: Dict[str, str] = {}
+_paths: Dict[str, Optional[str]] = {}
+
+
+def _current_source() -> Dict:
+    """Return the raw mapping behind os.environ, compared to detect changes."""
+    # os.environ keeps its content in the private _data dict: comparing it is
+    # a single C-level dict comparison, without copying the environment
+    return getattr(os.environ, "_data", os.environ)
+
+
+def _build_env() -> Dict[str, str]:
+    """Return an environment free of PyInstaller/AppImage library overrides.
+
+    When running as a PyInstaller AppImage, LD_LIBRARY_PATH is polluted
+    with the bundled _internal/ paths.  PyInstaller saves the original
+    value as LD_LIBRARY_PATH_ORIG — but only if LD_LIBRARY_PATH was
+    already set before launch.  On systems where it was unset (common on
+    Arch), PyInstaller sets LD_LIBRARY_PATH fresh with no _ORIG counterpart.
+
+    The correct strategy when APPIMAGE is in the environment:
+      - If LD_LIBRARY_PATH_ORIG exists → restore it.
+      - If not → remove LD_LIBRARY_PATH entirely (PyInstaller set it from
+        scratch; the system default for child processes is "no value").
+    """
+    env = os.environ.copy()
+
+    if "APPIMAGE" in env:
+        orig_ldpath = env.pop("LD_LIBRARY_PATH_ORIG", None)
+        if orig_ldpath:
+            env["LD_LIBRARY_PATH"] = orig_ldpath
+        else:
+            env.pop("LD_LIBRARY_PATH", None)
+
+    for var in _BUNDLE_VARS:
+        env.pop(var, None)
+
+    return env
+
+
+def _refresh() -> None:
+    """Rebuild the environment and the PATH table if os.environ changed."""
+    global _source, _env, _paths
+
+    source = _current_source()
+    if _source is not None and source == _source:
+        return
+
+    with _lock:
+        source = _current_source()
+        if _source is not None and source == _source:
+            return
+
+        env = _build_env()
+        search_path = env.get("PATH", os.defpath)
+        paths = {
+            name: shutil.which(name, path=search_path) for name in COMMON_EXECUTABLES
+        }
+
+        _env = env
+        _paths = paths
+        # Stored last: readers that see the new source also see the new tables
+        _source = dict(source)
+
+
+def clean_env() -> Dict[str, str]:
+    """Return the environment for child processes.
+
+    The dictionary is shared and only rebuilt when os.environ changes:
+    callers must not modify it.
+
+    Returns:
+        Dict[str, str]: os.environ without the bundle's library overrides.
+    """
+    _refresh()
+    return _env
+
+
+def which(name: str) -> Optional[str]:
+    """Look up an executable in the PATH of the child environment.
+
+    Results, including misses, are cached until the environment changes.
+
+    Args:
+        name (str): The executable name; a path is returned unchanged.
+
+    Returns:
+        Optional[str]: The absolute path, or None if not found.
+    """
+    if os.sep in name:
+        return name
+
+    _refresh()
+    paths = _paths
+    try:
+        return paths[name]
+    except KeyError:
+        pass
+
+    path = shutil.which(name, path=_env.get("PATH", os.defpath))
+    with _lock:
+        if _paths is paths:
+            _paths[name] = path
+    return path
+
+
+def invalidate() -> None:
+    """Force the next call to rebuild the environment and the PATH table."""
+    global _source
+    with _lock:
+        _source = None
+
+
+__all__ = [
+    "COMMON_EXECUTABLES",
+    "clean_env",
+    "which",
+    "invalidate",
+]
@@ -6,6 +6,7 @@ Integrates the auto-restore management panel.
 Integrates the focus lock timer and target time to prevent premature deactivation.
 """
 
+from typing import Optional
 from tkinter import messagebox
 import ttkbootstrap as ttk
 
@@ -81,6 +82,8 @@ class AppGui(ttk.Window):
                     self.on_remote_unlock()
                 elif action == "set_restore":
                     self.on_remote_set_restore(msg["enabled"])
+                elif action == "refresh_items":
+                    self.refresh_list()
                 self.api_queue.task_done()
                 _did_act = True
         except queue.Empty:
@@ -486,13 +489,20 @@ class AppGui(ttk.Window):
         push_current_state()
 
     def _notify_if_bg(
-        self, title: str, message: str, icon: str = "dialog-information"
+        self,
+        title: str,
+        message: str,
+        icon: str = "dialog-information",
+        tag: Optional[str] = None,
     ) -> None:
-        """Send a desktop notification only when the GUI window is not visible."""
+        """Send a desktop notification only when the GUI window is not visible.
+
+        Notifications with the same `tag` replace each other.
+        """
         if self.state() in ("iconic", "withdrawn"):
             from focus_mode_app.core.notifications import send_desktop_notification
 
-            send_desktop_notification(title, message, icon)
+            send_desktop_notification(title, message, icon, tag=tag)
 
     def toggle_blocking(self) -> None:
         """Toggle the block and update the interface.
@@ -509,10 +519,15 @@ class AppGui(ttk.Window):
         toggle_blocking()
         if is_blocking_active():
             self._notify_if_bg(
-                "Focus Mode attivato", "Il blocco delle app è attivo.", "dialog-warning"
+                "Focus Mode attivato",
+                "Il blocco delle app è attivo.",
+                "dialog-warning",
+                tag="blocking",
             )
         else:
-            self._notify_if_bg("Focus Mode disattivato", "Il blocco è stato rimosso.")
+            self._notify_if_bg(
+                "Focus Mode disattivato", "Il blocco è stato rimosso.", tag="blocking"
+            )
         self.update_toggle_button()
         update_tray_menu()
         self._push_ha_state()
@@ -540,11 +555,13 @@ class AppGui(ttk.Window):
                     "Focus Mode attivato da Home Assistant",
                     "Il blocco delle app è stato attivato.",
                     "dialog-warning",
+                    tag="blocking",
                 )
             else:
                 self._notify_if_bg(
                     "Focus Mode disattivato da Home Assistant",
                     "Il blocco è stato rimosso.",
+                    tag="blocking",
                 )
         self.update_toggle_button()
         update_tray_menu()
@@ -562,6 +579,7 @@ class AppGui(ttk.Window):
                 "Blocco timer attivato da Home Assistant",
                 f"Non puoi disattivare il Focus Mode per {minutes} minuti.",
                 "dialog-warning",
+                tag="lock",
             )
         elif mode == "target":
             _focus_lock.set_target_time_lock(msg["hour"], msg["minute"])
@@ -569,6 +587,7 @@ class AppGui(ttk.Window):
                 "Blocco orario attivato da Home Assistant",
                 f"Non puoi disattivare fino alle {msg['hour']:02d}:{msg['minute']:02d}.",
                 "dialog-warning",
+                tag="lock",
             )
         elif mode == "ha":
             _focus_lock.set_ha_lock()
@@ -576,6 +595,7 @@ class AppGui(ttk.Window):
                 "Blocco HA attivato da Home Assistant",
                 "Solo Home Assistant può rimuovere questo blocco.",
                 "dialog-warning",
+                tag="lock",
             )
 
         if not is_blocking_active():
@@ -592,6 +612,7 @@ class AppGui(ttk.Window):
         self._notify_if_bg(
             "Blocco rimosso da Home Assistant",
             "Puoi ora disattivare il Focus Mode dalla GUI.",
+            tag="lock",
         )
         self.toggle_btn.config(state="normal")
         self.btn_activate_lock.config(state="normal")
@@ -114,6 +114,9 @@ def main() -> None:
     load_config()
     load_blocked_items()
     session_tracker.load_restore_config()
+    # Apps killed before a crash are replayed from the journal, so they are
+    # still restored when the block ends
+    session_tracker.load_session()
 
     _app_instance = AppGui()
 
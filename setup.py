@@ -70,6 +70,7 @@ setup(
             "flake8>=6.0.0",
         ],
         "gui": ["PyQt6>=6.0.0"],
+        "dbus": ["jeepney>=0.8"],
     },
     # Include extra files
     include_package_data=True,
@@ -108,3 +108,42 @@ def test_toggle_blocker_queues_message():
     api_action_queue.task_done()
 
     assert api_action_queue.empty() is True
+
+
+@patch("focus_mode_app.api.server.notify_state_change")
+def test_batch_items_persists_once(mock_notify):
+    """POST /api/items:batch applies every edit with a single save."""
+    from focus_mode_app.core import storage
+    from focus_mode_app.core.blocklist import BlockList
+
+    items = BlockList([{"name": "discord", "type": "app"}])
+    with (
+        patch.object(storage, "blocked_items", items),
+        patch("focus_mode_app.api.server.blocked_items", items),
+        patch.object(storage, "save_blocked_items") as mock_save,
+        patch("focus_mode_app.core.blocker.request_scan"),
+    ):
+        response = client.post(
+            "/api/items:batch",
+            json={
+                "add": [{"name": f"site{i}.com", "type": "webapp"} for i in range(50)],
+                "remove": [{"name": "discord", "type": "app"}],
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["added"] == 50
+        assert response.json()["removed"] == 1
+        assert response.json()["total"] == 50
+        # Removals and additions are written together
+        assert mock_save.call_count == 1
+        assert api_action_queue.get_nowait() == {"action": "refresh_items"}
+
+        response = client.post(
+            "/api/items:batch",
+            json={
+                "replace": [{"name": "slack", "type": "app"}],
+                "add": [{"name": "x.com", "type": "webapp"}],
+            },
+        )
+        assert response.status_code == 422
@@ -0,0 +1,519 @@
+"""
+tests/test_blocker.py
+Unit tests for the process blocker scan engine.
+Process table access is mocked: no real process is ever killed.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from focus_mode_app.core import blocker, storage
+
+
+def _fake_proc(pid: int, name: str, cmdline: list, create_time: float = 1.0):
+    proc = MagicMock()
+    proc.pid = pid
+    proc.create_time.return_value = create_time
+    proc.name.return_value = name
+    proc.cmdline.return_value = cmdline
+    proc.parent.return_value = None
+    proc.children.return_value = []
+    return proc
+
+
+@pytest.fixture()
+def blocklist():
+    """Install a temporary blocklist and an active blocker."""
+    original_items = storage.blocked_items.copy()
+    original_active = blocker.blocking_active
+
+    storage.blocked_items.clear()
+    storage.blocked_items.extend(
+        [
+            {"name": "discord", "type": "app"},
+            {"name": "telegram", "type": "app"},
+            {"name": "web.whatsapp.com", "type": "webapp"},
+        ]
+    )
+    blocker.blocking_active = True
+
+    from focus_mode_app.core.scanner import ProcessScanner
+
+    with (
+        patch("focus_mode_app.core.session.session_tracker") as tracker,
+        patch("focus_mode_app.core.notifications.notify_blocked"),
+        patch.object(blocker, "_scanner", ProcessScanner(exclude_pid=1)),
+        # Mocked processes must never reach a real PID through a pidfd
+        patch("focus_mode_app.core.killer._pidfd_supported", False),
+        patch(
+            "focus_mode_app.core.killer.psutil.wait_procs",
+            side_effect=lambda procs, timeout: (list(procs), []),
+        ),
+    ):
+        tracker.capture_app_state.return_value = None
+        yield
+
+    storage.blocked_items.clear()
+    storage.blocked_items.extend(original_items)
+    blocker.blocking_active = original_active
+    blocker.cleanup_killed_pids()
+
+
+def test_kill_all_scans_process_table_once(blocklist):
+    """Every rule is evaluated against a single process_iter pass."""
+    procs = [
+        _fake_proc(101, "Discord", ["/opt/discord/Discord"]),
+        _fake_proc(102, "bash", ["bash"]),
+        _fake_proc(103, "chrome", ["chrome", "--app=https://web.whatsapp.com"]),
+        _fake_proc(104, "chrome", ["chrome", "--app=https://web.whatsapp.com/x"]),
+    ]
+
+    with (
+        patch(
+            "focus_mode_app.core.scanner.psutil.process_iter", return_value=procs
+        ) as mock_iter,
+        patch.object(blocker, "WEBAPP_TREE_KILL", False),
+    ):
+        killed = blocker.kill_all_blocked_items()
+
+    assert mock_iter.call_count == 1
+    assert killed == 2
+    procs[0].terminate.assert_called_once()
+    procs[1].terminate.assert_not_called()
+    procs[2].terminate.assert_called_once()
+    # Only the first matching process per webapp entry is killed on each pass
+    procs[3].terminate.assert_not_called()
+
+
+def test_kill_all_is_noop_when_inactive(blocklist):
+    """Nothing is scanned while blocking is disabled."""
+    blocker.blocking_active = False
+
+    with patch("focus_mode_app.core.scanner.psutil.process_iter") as mock_iter:
+        assert blocker.kill_all_blocked_items() == 0
+
+    mock_iter.assert_not_called()
+
+
+def test_matcher_is_rebuilt_only_when_blocklist_changes():
+    """The compiled index is reused until the (name, type) pairs change."""
+    from focus_mode_app.core.matcher import get_matcher
+
+    items = [{"name": "code", "type": "app"}, {"name": "codex", "type": "app"}]
+    first = get_matcher(items)
+
+    assert get_matcher(list(items)) is first
+    assert first.match_app("Codex-Helper") == "codex"
+    assert first.match_app("vscode") == "code"
+    assert first.match_app("bash") is None
+
+    items.append({"name": "youtube.com", "type": "webapp"})
+    second = get_matcher(items)
+
+    assert second is not first
+    assert second.match_webapps(["chrome", "--app=https://youtube.com"]) == [
+        "youtube.com"
+    ]
+
+
+def test_parse_exec_events_extracts_tgid():
+    """PROC_EVENT_EXEC datagrams yield the exec'd process TGID; others are ignored."""
+    import struct
+
+    from focus_mode_app.core import proc_events as pe
+
+    def datagram(what: int, tgid: int) -> bytes:
+        event = struct.pack("=IIQ", what, 0, 0) + struct.pack("=II", tgid + 1, tgid)
+        cn_msg = struct.pack(
+            "=IIIIHH", pe.CN_IDX_PROC, pe.CN_VAL_PROC, 0, 0, len(event), 0
+        )
+        body = cn_msg + event
+        return struct.pack("=IHHII", 16 + len(body), pe.NLMSG_DONE, 0, 0, 0) + body
+
+    assert pe._parse_exec_events(datagram(pe.PROC_EVENT_EXEC, 4242)) == [4242]
+    assert pe._parse_exec_events(datagram(0x1, 4242)) == []  # PROC_EVENT_FORK
+
+
+def test_verdict_cache_reads_only_new_processes(blocklist):
+    """Known (pid, create_time) pairs reuse their verdict; PID reuse is re-read."""
+    from focus_mode_app.core.matcher import get_matcher
+    from focus_mode_app.core.scanner import ProcessScanner
+
+    scanner = ProcessScanner(exclude_pid=1)
+    matcher = get_matcher(storage.blocked_items)
+    discord = _fake_proc(200, "discord", ["discord"])
+    shell = _fake_proc(201, "bash", ["bash"])
+
+    with patch("focus_mode_app.core.scanner.psutil.process_iter") as mock_iter:
+        mock_iter.return_value = [discord, shell]
+        assert [v.pid for v in scanner.scan(matcher)] == [200]
+        assert [v.pid for v in scanner.scan(matcher)] == [200]
+
+        assert discord.name.call_count == 1
+        assert shell.name.call_count == 1
+
+        # Same PID, different start time: a new process that must be re-read
+        recycled = _fake_proc(201, "telegram", ["telegram"], create_time=2.0)
+        mock_iter.return_value = [discord, recycled]
+        assert sorted(v.pid for v in scanner.scan(matcher)) == [200, 201]
+
+        # A different blocklist invalidates every cached verdict
+        scanner.scan(get_matcher([{"name": "firefox", "type": "app"}]))
+        assert discord.name.call_count == 2
+
+    assert scanner.tracked_matches == 0
+
+
+def test_procfs_scanner_reads_raw_proc(tmp_path):
+    """The /proc fast path parses stat, comm and cmdline without psutil."""
+    from focus_mode_app.core import procfs
+    from focus_mode_app.core.matcher import get_matcher
+    from focus_mode_app.core.scanner import ProcessScanner
+
+    def fake_process(pid: int, comm: str, cmdline: bytes, start: int = 4242) -> None:
+        proc_dir = tmp_path / str(pid)
+        proc_dir.mkdir(exist_ok=True)
+        # comm with spaces and parentheses must not break field parsing
+        stat = f"{pid} ({comm}) S 1 {pid} {pid} 0 -1 0 " + "0 " * 12 + f"{start} 0"
+        (proc_dir / "stat").write_text(stat)
+        (proc_dir / "comm").write_text(comm + "\n")
+        (proc_dir / "cmdline").write_bytes(cmdline)
+
+    fake_process(300, "Discord (main)", b"/opt/discord/Discord\0--flag\0")
+    fake_process(301, "chrome", b"chrome\0--app=https://web.whatsapp.com\0")
+    fake_process(302, "bash", b"bash\0")
+    (tmp_path / "self").mkdir()
+    (tmp_path / "self" / "stat").write_text("1 (x) S")
+
+    matcher = get_matcher(
+        [
+            {"name": "discord", "type": "app"},
+            {"name": "web.whatsapp.com", "type": "webapp"},
+        ]
+    )
+
+    with (
+        patch.object(procfs, "PROC_ROOT", str(tmp_path)),
+        patch("focus_mode_app.core.scanner.psutil") as mock_psutil,
+    ):
+        scanner = ProcessScanner(exclude_pid=1, use_procfs=True)
+        matches = {v.pid: v for v in scanner.scan(matcher)}
+
+        assert procfs.ProcfsReader().read_starttime(300) == 4242
+        mock_psutil.Process.assert_not_called()
+
+        assert sorted(matches) == [300, 301]
+        assert matches[300].app_rule == "discord"
+        assert matches[301].webapp_rules == ("web.whatsapp.com",)
+
+        # PID 302 is recycled by a blocked app: its old benign verdict is dropped
+        fake_process(302, "Discord", b"/opt/discord/Discord\0", start=5000)
+        assert sorted(v.pid for v in scanner.scan(matcher)) == [300, 301, 302]
+
+
+def test_adaptive_interval_boosts_after_kill_and_backs_off_when_idle():
+    """Kills tighten the interval; long idle periods grow it up to the maximum."""
+    from focus_mode_app.core.scheduler import AdaptiveInterval
+
+    interval = AdaptiveInterval(
+        base=2, minimum=0.5, maximum=10, boost_duration=30, idle_after=60, factor=2
+    )
+    interval.reset(now=0)
+
+    assert interval.update(0, now=10) == 2
+    assert interval.update(1, now=20) == 0.5
+    assert interval.update(0, now=49) == 0.5
+    assert interval.update(0, now=51) == 2
+
+    # 60s after the last kill the interval doubles on every idle scan
+    assert interval.update(0, now=80) == 4
+    assert interval.update(0, now=84) == 8
+    assert interval.update(0, now=92) == 10
+
+    interval.reset(now=100)
+    assert interval.current == 2
+
+
+def test_wakeup_signal_interrupts_wait_from_another_thread():
+    """A wake-up set by another thread ends the wait well before the timeout."""
+    import threading
+    import time
+
+    from focus_mode_app.core.scheduler import WakeupSignal
+
+    wakeup = WakeupSignal()
+    assert wakeup.wait(0) is False
+
+    threading.Timer(0.05, wakeup.set).start()
+    started = time.monotonic()
+    assert wakeup.wait(5) is True
+    assert time.monotonic() - started < 1
+
+    assert wakeup.consume() is True
+    assert wakeup.consume() is False
+
+
+def test_webapp_tree_kill_targets_root_and_descendants(blocklist):
+    """A matching renderer resolves to the app root, killed with all its children."""
+    url = "--app=https://web.whatsapp.com"
+    browser = _fake_proc(399, "chrome", ["chrome"])
+    root = _fake_proc(400, "chrome", ["chrome", url])
+    renderer = _fake_proc(401, "chrome", ["chrome", "--type=renderer", url])
+    gpu = _fake_proc(402, "chrome", ["chrome", "--type=gpu-process"])
+
+    root.parent.return_value = browser
+    renderer.parent.return_value = root
+    root.children.return_value = [renderer, gpu]
+
+    with (
+        patch(
+            "focus_mode_app.core.scanner.psutil.process_iter",
+            return_value=[browser, renderer],
+        ),
+        patch(
+            "focus_mode_app.core.killer.psutil.wait_procs",
+            side_effect=lambda procs, timeout: (list(procs), []),
+        ) as mock_wait,
+    ):
+        killed = blocker.kill_all_blocked_items()
+
+    assert killed == 3
+    for proc in (root, renderer, gpu):
+        proc.terminate.assert_called_once()
+    browser.terminate.assert_not_called()
+    mock_wait.assert_called_once()
+    assert len(mock_wait.call_args[0][0]) == 3
+
+
+def test_terminate_escalates_survivors_to_sigkill():
+    """SIGTERM goes to the whole batch; only survivors get SIGKILL, once per attempt."""
+    from focus_mode_app.core.killer import terminate_processes
+
+    polite = _fake_proc(501, "app", ["app"])
+    stubborn = _fake_proc(502, "app", ["app"])
+    rounds = []
+
+    def fake_wait(procs, timeout):
+        rounds.append([proc.pid for proc in procs])
+        gone = [proc for proc in procs if proc is polite]
+        return gone, [proc for proc in procs if proc is not polite]
+
+    with (
+        patch("focus_mode_app.core.killer._pidfd_supported", False),
+        patch("focus_mode_app.core.killer.psutil.wait_procs", side_effect=fake_wait),
+    ):
+        gone, alive = terminate_processes([polite, stubborn], timeout=0.1, attempts=3)
+
+    assert gone == [polite]
+    assert alive == [stubborn]
+    assert rounds == [[501, 502], [502], [502]]
+    polite.terminate.assert_called_once()
+    polite.kill.assert_not_called()
+    stubborn.terminate.assert_called_once()
+    assert stubborn.kill.call_count == 2
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "pidfd_open") or not hasattr(signal, "pidfd_send_signal"),
+    reason="pidfd not supported",
+)
+def test_pidfd_pipeline_escalates_on_real_processes():
+    """A child ignoring SIGTERM is SIGKILLed; a cooperative one exits on SIGTERM."""
+    import psutil
+
+    from focus_mode_app.core import killer
+
+    script = (
+        "import signal, sys, time\n"
+        "if sys.argv[1] == 'stubborn':\n"
+        "    signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(30)\n"
+    )
+    children = [
+        subprocess.Popen(
+            [sys.executable, "-c", script, mode], stdout=subprocess.PIPE, text=True
+        )
+        for mode in ("polite", "stubborn")
+    ]
+    try:
+        for child in children:
+            assert child.stdout.readline().strip() == "ready"
+        procs = [psutil.Process(child.pid) for child in children]
+
+        with patch.object(killer, "_pidfd_supported", True):
+            gone, alive = killer.terminate_processes(procs, timeout=2, attempts=2)
+
+        assert alive == []
+        assert {proc.pid for proc in gone} == {child.pid for child in children}
+        assert children[0].wait(timeout=2) == -signal.SIGTERM
+        assert children[1].wait(timeout=2) == -signal.SIGKILL
+    finally:
+        for child in children:
+            if child.poll() is None:
+                child.kill()
+            child.wait()
+            child.stdout.close()
+
+
+def test_precise_rule_types_avoid_substring_overmatching():
+    """comm/glob/regex/exe/appid/argv rules only hit the processes they describe."""
+    from focus_mode_app.core.matcher import BlocklistMatcher, validate_rule
+
+    matcher = BlocklistMatcher(
+        [
+            {"name": "code", "type": "comm"},
+            {"name": "steam*", "type": "glob"},
+            {"name": r"^tele(gram|port)$", "type": "regex"},
+            {"name": "/opt/games/", "type": "exe"},
+            {"name": "com.discordapp.Discord", "type": "appid"},
+            {"name": "1:*minecraft*.jar", "type": "argv"},
+        ]
+    )
+    scope = (
+        "/user.slice/user-1000.slice/user@1000.service/app.slice/"
+        "app-flatpak-com.discordapp.Discord-4242.scope"
+    )
+
+    assert matcher.needs_exe and matcher.needs_cgroup
+    assert matcher.match_process("code", []) == "code"
+    assert matcher.match_process("vscode-helper", []) is None
+    assert matcher.match_process("codec-daemon", []) is None
+    assert matcher.match_process("SteamWebHelper", []) == "steam*"
+    assert matcher.match_process("telegram", []) == r"^tele(gram|port)$"
+    assert matcher.match_process("telegram-cli", []) is None
+    assert matcher.match_process("x", [], exe="/opt/games/doom") == "/opt/games/"
+    assert matcher.match_process("Discord", [], cgroup=scope) == (
+        "com.discordapp.Discord"
+    )
+    assert matcher.match_process("java", ["java", "minecraft-1.20.jar"]) == (
+        "1:*minecraft*.jar"
+    )
+    assert matcher.match_process("java", ["java", "-jar", "minecraft.jar"]) is None
+
+    assert validate_rule("[", "regex") is not None
+    assert validate_rule("relative/bin", "exe") is not None
+    assert validate_rule("minecraft", "argv") is not None
+    assert validate_rule("discord", "nonsense") is not None
+
+
+def test_sandboxed_app_scope_is_terminated_then_swept(tmp_path):
+    """A Flatpak match terminates its whole scope, then cgroup.kill sweeps it."""
+    from focus_mode_app.core import cgroups
+    from focus_mode_app.core.scanner import ProcessVerdict
+
+    flatpak = (
+        "/user.slice/user-1000.slice/user@1000.service/app.slice/"
+        "app-flatpak-com.discordapp.Discord-4242.scope"
+    )
+    terminal = "/user.slice/app-gnome-org.gnome.Terminal-77.scope"
+    for cgroup in (flatpak, terminal):
+        scope = tmp_path / cgroup.lstrip("/")
+        scope.mkdir(parents=True)
+        (scope / "cgroup.procs").write_text("300\n301\n302\n")
+        (scope / "cgroup.kill").write_text("")
+    flatpak_dir = tmp_path / flatpak.lstrip("/")
+
+    identity = cgroups.identify(flatpak)
+    assert (identity.kind, identity.app_id) == ("flatpak", "com.discordapp.Discord")
+    assert cgroups.identify("/x/snap.spotify.spotify-1234.scope").app_id == "spotify"
+
+    discord = ProcessVerdict(300, 1.0, "discord", (), proc=MagicMock(), cgroup=flatpak)
+    shell_tool = ProcessVerdict(500, 1.0, "htop", (), proc=MagicMock(), cgroup=terminal)
+
+    with (
+        patch.object(blocker, "CGROUP_SCOPE_KILL", True),
+        patch.object(cgroups, "CGROUP_ROOT", tmp_path),
+        patch.object(
+            blocker.psutil, "Process", side_effect=lambda pid: MagicMock(pid=pid)
+        ),
+    ):
+        scopes, remaining, targets = blocker._collect_scope_targets(
+            [discord, shell_tool]
+        )
+
+        # Every process of the scope gets SIGTERM first: nothing is killed yet
+        assert [proc.pid for proc in targets] == [300, 301, 302]
+        assert remaining == [shell_tool]
+        assert (flatpak_dir / "cgroup.kill").read_text() == ""
+
+        # A child forked during shutdown is caught by the sweep
+        (flatpak_dir / "cgroup.procs").write_text("303\n")
+        assert blocker._sweep_scopes(scopes) == 1
+        assert (flatpak_dir / "cgroup.kill").read_text() == "1"
+        assert (tmp_path / terminal.lstrip("/") / "cgroup.kill").read_text() == ""
+
+        # An empty scope is left alone
+        (flatpak_dir / "cgroup.procs").write_text("")
+        (flatpak_dir / "cgroup.kill").write_text("")
+        assert blocker._sweep_scopes(scopes) == 0
+        assert (flatpak_dir / "cgroup.kill").read_text() == ""
+
+
+def _wait_for_status(proc, stopped: bool, timeout: float = 2.0) -> bool:
+    """Signals are delivered asynchronously: poll the process state for a while."""
+    import time
+
+    import psutil
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if (proc.status() == psutil.STATUS_STOPPED) == stopped:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_freezer_stops_and_resumes_without_delegated_cgroups():
+    """Without a writable cgroup tree the freezer falls back to SIGSTOP/SIGCONT."""
+    import psutil
+
+    from focus_mode_app.core.freezer import Freezer
+
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        proc = psutil.Process(child.pid)
+        freezer = Freezer()
+        with patch.object(freezer, "_base_dir", return_value=None):
+            assert freezer.freeze("python", [proc]) == 1
+            # Already frozen: not counted again
+            assert freezer.freeze("python", [proc]) == 0
+            assert _wait_for_status(proc, stopped=True)
+
+            assert freezer.thaw_all() == 1
+        assert _wait_for_status(proc, stopped=False)
+        assert not freezer.is_frozen(child.pid)
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_freezer_freezes_an_app_scope_in_place(tmp_path):
+    """A sandboxed scope is frozen and thawed through its own cgroup.freeze."""
+    from focus_mode_app.core import cgroups
+    from focus_mode_app.core.freezer import Freezer
+
+    cgroup = "/user.slice/app-flatpak-com.discordapp.Discord-4242.scope"
+    scope = tmp_path / cgroup.lstrip("/")
+    scope.mkdir(parents=True)
+    (scope / "cgroup.procs").write_text(f"{os.getpid()}\n")
+    (scope / "cgroup.freeze").write_text("0")
+
+    freezer = Freezer()
+    with (
+        patch.object(cgroups, "CGROUP_ROOT", tmp_path),
+        patch.object(freezer, "_base_dir", return_value=None),
+    ):
+        assert freezer.freeze_scope("discord", cgroups.identify(cgroup)) == 1
+        assert (scope / "cgroup.freeze").read_text() == "1"
+        assert freezer.is_frozen(os.getpid())
+
+        assert freezer.thaw_all() == 1
+        assert (scope / "cgroup.freeze").read_text() == "0"
+        # The app's own scope is never removed
+        assert scope.is_dir()
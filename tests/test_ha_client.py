@@ -293,6 +293,47 @@ def test_push_current_state_calls_push_state():
     assert state_arg["restore_enabled"] is True
 
 
+# ── ha_config cache ────────────────────────────────────────────────────────────
+
+
+def test_ha_config_getters_use_cache_until_file_changes(tmp_path):
+    from focus_mode_app.core import ha_config
+
+    cfg_file = tmp_path / "ha_config.json"
+    with (
+        patch.object(ha_config, "HA_CONFIG_FILE", cfg_file),
+        patch.object(ha_config, "DATA_DIR", tmp_path),
+        patch.object(ha_config, "HA_CONFIG_RECHECK_INTERVAL", 0),
+    ):
+        ha_config.invalidate_ha_config()
+        ha_config.save_ha_config(
+            llat="tok", ha_url="http://ha.local:8123", webhook_id="wh"
+        )
+
+        with patch.object(
+            ha_config, "load_ha_config", wraps=ha_config.load_ha_config
+        ) as mock_load:
+            for _ in range(5):
+                assert ha_config.get_llat() == "tok"
+                assert (
+                    ha_config.get_state_event_url()
+                    == "http://ha.local:8123/api/webhook/wh"
+                )
+            assert mock_load.call_count == 1
+
+            # An external edit (new inode after an atomic replace) is picked up
+            data = json.loads(cfg_file.read_text())
+            data["llat"] = "changed"
+            tmp = tmp_path / "new.json"
+            tmp.write_text(json.dumps(data))
+            tmp.replace(cfg_file)
+
+            assert ha_config.get_llat() == "changed"
+            assert mock_load.call_count == 2
+
+    ha_config.invalidate_ha_config()
+
+
 # ── WebSocket session (mocked) ─────────────────────────────────────────────────
 
 
@@ -0,0 +1,118 @@
+"""
+tests/test_notifications.py
+Unit tests for the notification dispatcher and its backends.
+No notification is actually shown: notify-send and the session bus are replaced.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from focus_mode_app.core import notifications
+
+
+def test_notifications_are_delivered_off_the_calling_thread():
+    """The caller returns at once; without a bus the worker runs notify-send."""
+    worker = notifications.NotificationDispatcher(backend="auto")
+    release = threading.Event()
+    calls = []
+
+    def slow_run(cmd, **kwargs):
+        release.wait(5)
+        calls.append(cmd)
+        return SimpleNamespace(returncode=0)
+
+    with (
+        patch.object(worker.dbus, "available", return_value=False),
+        patch.object(notifications, "which", return_value="/usr/bin/notify-send"),
+        patch.object(notifications.subprocess, "run", side_effect=slow_run),
+    ):
+        worker.submit(notifications._Notification("Title", "Body", "icon", None))
+        assert calls == []
+
+        release.set()
+        assert worker.flush(5)
+        worker.stop()
+
+    assert calls[0][0] == "/usr/bin/notify-send"
+    assert calls[0][-2:] == ["Title", "Body"]
+
+
+def test_dbus_backend_reuses_the_connection_and_replaces_id():
+    """One bus connection for every notification; a tag reuses the server's ID."""
+    pytest.importorskip("jeepney")
+
+    class FakeRouter:
+        def __init__(self):
+            self.sent = []
+
+        def send_and_get_reply(self, message, timeout=None):
+            self.sent.append(message.body)
+            header = SimpleNamespace(
+                message_type=notifications.MessageType.method_return
+            )
+            return SimpleNamespace(header=header, body=(40 + len(self.sent),))
+
+        def close(self):
+            pass
+
+    router = FakeRouter()
+    with patch.object(
+        notifications, "open_dbus_router", return_value=router
+    ) as mock_open:
+        notifier = notifications.DBusNotifier()
+        for title in ("Focus Mode attivato", "Focus Mode disattivato"):
+            assert notifier.notify(
+                notifications._Notification(title, "", "icon", "blocking")
+            )
+        assert notifier.notify(notifications._Notification("Other", "", "icon", None))
+
+    assert mock_open.call_count == 1
+    # replaces_id is the second Notify argument
+    assert [body[1] for body in router.sent] == [0, 41, 0]
+
+
+def test_repeated_events_are_coalesced_and_rate_limited():
+    """Seven kills give one summary; a category without tokens waits for one."""
+    dispatcher = notifications.NotificationDispatcher(window=0.2, burst=2, refill=60)
+    shown = []
+
+    with (
+        patch.object(notifications, "dispatcher", dispatcher),
+        patch.object(
+            dispatcher, "deliver", side_effect=lambda n: shown.append(n.title)
+        ),
+    ):
+        for _ in range(7):
+            notifications.notify_blocked("discord")
+        for title in ("Lock 1", "Lock 2", "Lock 3"):
+            notifications.send_desktop_notification(title, "", tag=None)
+
+        time.sleep(0.5)
+        # The third "general" notification has no token yet
+        assert shown[:2] == ["Lock 1", "Lock 2"]
+        assert "Lock 3" not in shown
+        blocked = [t for t in shown if t.startswith("Blocked")]
+        assert len(blocked) == 1
+        assert blocked[0].startswith("Blocked discord x7 in last ")
+
+        assert dispatcher.flush(5)
+        assert shown[-1] == "Lock 3"
+        dispatcher.stop()
+
+
+def test_throttled_calls_are_merged_within_the_window():
+    """The first push runs at once; the ones in the window become a single push."""
+    dispatcher = notifications.NotificationDispatcher()
+    runs = []
+
+    for i in range(5):
+        dispatcher.throttle("ha_push", lambda i=i: runs.append(i), window=0.2)
+    assert runs == [0]
+
+    time.sleep(0.5)
+    assert runs == [0, 4]
+    dispatcher.stop()
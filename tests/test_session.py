@@ -0,0 +1,295 @@
+"""
+tests/test_session.py
+Unit tests for the session tracker used by auto-restore.
+Session and restore files are redirected to a temporary directory.
+"""
+
+import json
+import os
+import signal
+from unittest.mock import patch
+
+import pytest
+
+from focus_mode_app.core import session
+
+
+@pytest.fixture()
+def tracker(tmp_path):
+    """A SessionTracker writing to tmp_path, with "discord" in the restore list."""
+    with (
+        patch.object(session, "SESSION_FILE", tmp_path / "session_backup.json"),
+        patch.object(
+            session, "SESSION_JOURNAL_FILE", tmp_path / "session_journal.jsonl"
+        ),
+        patch.object(session, "RESTORE_CONFIG_FILE", tmp_path / "restore.json"),
+    ):
+        t = session.SessionTracker()
+        t.restore_list = {"discord": {"enabled": True, "added_at": 0}}
+        yield t
+
+
+def test_recorded_apps_are_persisted_by_the_worker(tracker):
+    """record_killed_app returns immediately; readers see the app after a flush."""
+    tracker.record_killed_app("discord", {"name": "discord", "pid": 1})
+    tracker.record_killed_app("discord", {"name": "discord", "pid": 2})
+    tracker.record_killed_app("slack", {"name": "slack", "pid": 3})
+
+    apps = tracker.get_killed_apps()
+
+    assert tracker._worker is not None
+    assert apps == [{"name": "discord", "pid": 2, "rule": "discord"}]
+
+    reloaded = session.SessionTracker()
+    assert reloaded.load_session() == apps
+
+
+def test_kills_are_appended_to_the_journal_and_replayed(tracker):
+    """Each kill appends one line; load_session replays it and ignores a torn tail."""
+    tracker.restore_list["slack"] = {"enabled": True, "added_at": 0}
+    tracker.add_killed_app("discord", {"name": "discord", "pid": 1})
+    tracker.add_killed_app("slack", {"name": "slack", "pid": 2})
+    tracker.add_killed_app("discord", {"name": "discord", "pid": 3})
+
+    # The first kill wrote an empty snapshot; the rest only went to the journal
+    assert json.loads(session.SESSION_FILE.read_text()) == []
+    lines = session.SESSION_JOURNAL_FILE.read_text().splitlines()
+    assert len(lines) == 3
+
+    # Simulate a crash in the middle of an append
+    with open(session.SESSION_JOURNAL_FILE, "a") as f:
+        f.write('{"app": "discord", "sta')
+
+    expected = [
+        {"name": "slack", "pid": 2, "rule": "slack"},
+        {"name": "discord", "pid": 3, "rule": "discord"},
+    ]
+    reloaded = session.SessionTracker()
+    assert reloaded.load_session() == expected
+
+    # Loading is read-only; the next kill compacts the journal into the snapshot
+    assert json.loads(session.SESSION_FILE.read_text()) == []
+    reloaded.restore_list = tracker.restore_list
+    reloaded.add_killed_app("slack", {"name": "slack", "pid": 4})
+    assert json.loads(session.SESSION_FILE.read_text()) == expected
+    assert len(session.SESSION_JOURNAL_FILE.read_text().splitlines()) == 1
+
+
+def test_journal_is_shared_between_processes(tracker):
+    """A CLI loading the session never corrupts the journal the GUI appends to."""
+    for name in ("a", "b", "c", "d"):
+        tracker.restore_list[name] = {"enabled": True, "added_at": 0}
+    tracker.add_killed_app("a", {"name": "a"})
+    tracker.add_killed_app("b", {"name": "b"})
+
+    cli = session.SessionTracker()
+    cli.restore_list = dict(tracker.restore_list)
+    assert [app["name"] for app in cli.load_session()] == ["a", "b"]
+
+    tracker.add_killed_app("c", {"name": "c"})
+    assert not session.SESSION_JOURNAL_FILE.read_bytes().startswith(b"\0")
+
+    # A second writer compacts under the lock; the first keeps appending at the end
+    cli.add_killed_app("d", {"name": "d"})
+    tracker.add_killed_app("a", {"name": "a", "pid": 2})
+
+    fresh = session.SessionTracker()
+    assert [app["name"] for app in fresh.load_session()] == ["b", "c", "d", "a"]
+    assert b"\0" not in session.SESSION_JOURNAL_FILE.read_bytes()
+
+    # A session cleared elsewhere is not resurrected by the next append
+    cli.clear_session()
+    tracker.add_killed_app("b", {"name": "b", "pid": 3})
+    assert [app["pid"] for app in fresh.load_session()] == [3]
+
+
+def test_killed_apps_are_keyed_by_rule_not_process_name(tracker, tmp_path):
+    """Two webapps killed in the same browser process name are both kept."""
+    from focus_mode_app.core import sqlite_store
+
+    tracker.restore_list["web.whatsapp.com"] = {"enabled": True, "added_at": 0}
+    tracker.restore_list["web.telegram.org"] = {"enabled": True, "added_at": 0}
+    tracker.add_killed_app("web.whatsapp.com", {"name": "chrome", "pid": 1})
+    tracker.add_killed_app("web.telegram.org", {"name": "chrome", "pid": 2})
+    tracker.add_killed_app("web.whatsapp.com", {"name": "chrome", "pid": 3})
+
+    expected = [
+        {"name": "chrome", "pid": 2, "rule": "web.telegram.org"},
+        {"name": "chrome", "pid": 3, "rule": "web.whatsapp.com"},
+    ]
+    assert tracker.get_killed_apps() == expected
+
+    # The same key is used when the session is migrated to and saved in SQLite
+    store = sqlite_store.SQLiteStore(tmp_path / "focus_mode.db")
+    with (
+        patch.object(sqlite_store, "STORAGE_BACKEND", "sqlite"),
+        patch.object(sqlite_store, "_store", store),
+    ):
+        assert session.SessionTracker().load_session() == expected
+        tracker.save_session()
+        assert store.load_killed_apps() == expected
+    store.close()
+
+
+def test_restore_discards_only_the_apps_it_was_handed(tracker, tmp_path):
+    """Kills recorded while a restore runs survive its end, in both backends."""
+    from focus_mode_app.core import sqlite_store
+
+    tracker.restore_list["slack"] = {"enabled": True, "added_at": 0}
+    tracker.add_killed_app("discord", {"name": "discord", "pid": 1})
+    tracker.add_killed_app("slack", {"name": "slack", "pid": 2})
+    handed = list(tracker.get_killed_apps())
+
+    # Blocking turned back on during the restore: discord is killed again
+    tracker.add_killed_app("discord", {"name": "discord", "pid": 3})
+    tracker.discard_killed_apps(handed)
+
+    expected = [{"name": "discord", "pid": 3, "rule": "discord"}]
+    assert tracker.get_killed_apps() == expected
+    assert session.SessionTracker().load_session() == expected
+
+    store = sqlite_store.SQLiteStore(tmp_path / "focus_mode.db")
+    with (
+        patch.object(sqlite_store, "STORAGE_BACKEND", "sqlite"),
+        patch.object(sqlite_store, "_store", store),
+    ):
+        tracker.add_killed_app("slack", {"name": "slack", "pid": 4})
+        handed = list(tracker.get_killed_apps())
+        tracker.add_killed_app("slack", {"name": "slack", "pid": 5})
+        tracker.discard_killed_apps(handed)
+
+        assert tracker.get_killed_apps() == [
+            {"name": "slack", "pid": 5, "rule": "slack"}
+        ]
+    store.close()
+
+
+def test_clear_session_waits_for_pending_records(tracker):
+    """A record still in the queue cannot reappear after the session is cleared."""
+    tracker.record_killed_app("discord", {"name": "discord", "pid": 1})
+    tracker.clear_session()
+
+    assert tracker.get_killed_apps() == []
+    assert not session.SESSION_FILE.exists()
+    assert not session.SESSION_JOURNAL_FILE.exists()
+
+
+def test_restore_priority_is_looked_up_by_rule_name(tracker):
+    """Waves follow the rule priority even when the process name differs."""
+    from focus_mode_app.core import restore
+
+    tracker.add_to_restore("vpn", priority=5)
+    tracker.add_killed_app("discord", {"name": "Discord", "cmdline": ["Discord"]})
+    tracker.add_killed_app("vpn", {"name": "openvpn-gui", "cmdline": ["openvpn-gui"]})
+
+    with patch.object(restore, "session_tracker", tracker):
+        scheduler = restore.RestoreScheduler(tracker.get_killed_apps())
+        assert [[a["name"] for a in wave] for wave in scheduler.waves()] == [
+            ["openvpn-gui"],
+            ["Discord"],
+        ]
+
+
+def test_starting_apps_share_one_window_list_per_round():
+    """Apps waiting for a window do not run one wmctrl each."""
+    from focus_mode_app.core import restore
+
+    poller = restore._WindowPoller(interval=60)
+    with patch.object(restore, "_window_pids", return_value={100}) as mock_list:
+        assert poller.has_window(100)
+        # Beyond pid_max: no such process, so no children to look at either
+        assert not any(poller.has_window(pid) for pid in (2**31 - 2, 2**31 - 1))
+        assert mock_list.call_count == 1
+
+        poller.interval = 0
+        poller.has_window(100)
+        assert mock_list.call_count == 2
+
+
+def test_restore_scheduler_launches_by_priority_and_retries_crashes(tracker, tmp_path):
+    """Higher priorities are ready first; crashes are retried and reported."""
+    import sys
+
+    from focus_mode_app.core import restore
+
+    tracker.add_to_restore("vpn", priority=5)
+    sleeper = [sys.executable, "-c", "import time; time.sleep(10)"]
+    # Crashes shortly after being ready the first time, then keeps running
+    flaky = (
+        "import os, sys, time\n"
+        f"marker = {str(tmp_path / 'flaky')!r}\n"
+        "if not os.path.exists(marker):\n"
+        "    open(marker, 'w').close(); time.sleep(0.3); sys.exit(1)\n"
+        "time.sleep(10)\n"
+    )
+    apps = [
+        {"name": "discord", "cmdline": sleeper},
+        {"name": "broken", "cmdline": [sys.executable, "-c", "raise SystemExit(3)"]},
+        {"name": "vpn", "cmdline": sleeper},
+        {"name": "flaky", "cmdline": [sys.executable, "-c", flaky]},
+        {"name": "empty", "cmdline": []},
+    ]
+    events = []
+
+    with patch.object(restore, "session_tracker", tracker):
+        scheduler = restore.RestoreScheduler(
+            apps,
+            max_parallel=2,
+            interval=0,
+            ready_timeout=0.2,
+            on_event=events.append,
+            grace_period=1.0,
+            max_retries=1,
+            retry_backoff=0.05,
+        )
+        assert [[a["name"] for a in wave] for wave in scheduler.waves()] == [
+            ["vpn"],
+            ["discord", "broken", "flaky", "empty"],
+        ]
+
+        scheduler.start()
+        assert scheduler.wait(15)
+
+    try:
+        kinds = [(e.kind, e.name) for e in events]
+        assert kinds[:2] == [("launched", "vpn"), ("ready", "vpn")]
+        assert kinds[-1] == ("finished", "")
+        assert (events[-1].restored, events[-1].total) == (3, 5)
+
+        report = {r.name: r for r in scheduler.report()}
+        assert report["vpn"].status == "alive"
+        assert report["vpn"].time_to_ready is not None
+        assert (report["broken"].status, report["broken"].attempts) == ("crashed", 2)
+        assert report["broken"].exit_code == 3
+        assert (report["flaky"].status, report["flaky"].attempts) == ("alive", 2)
+        assert ("retry", "flaky") in kinds
+        assert report["empty"].status == "failed"
+    finally:
+        for r in scheduler.report():
+            if r.status == "alive":
+                os.kill(r.pid, signal.SIGKILL)
+
+
+def test_subprocess_env_is_cached_until_the_environment_changes(monkeypatch, tmp_path):
+    """The cleaned environment is built once and rebuilt only after a change."""
+    from focus_mode_app.core import subprocess_env
+
+    tool = tmp_path / "focus-tool"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(0o755)
+
+    monkeypatch.setenv("APPIMAGE", "/tmp/focus.AppImage")
+    monkeypatch.setenv("LD_LIBRARY_PATH", "/tmp/_internal")
+    monkeypatch.setenv("LD_LIBRARY_PATH_ORIG", "/usr/local/lib")
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    env = subprocess_env.clean_env()
+    assert "APPIMAGE" not in env
+    assert env["LD_LIBRARY_PATH"] == "/usr/local/lib"
+    assert subprocess_env.clean_env() is env
+    assert subprocess_env.which("focus-tool") == str(tool)
+
+    monkeypatch.delenv("LD_LIBRARY_PATH_ORIG")
+    rebuilt = subprocess_env.clean_env()
+    assert rebuilt is not env
+    assert "LD_LIBRARY_PATH" not in rebuilt
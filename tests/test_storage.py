@@ -0,0 +1,202 @@
+"""
+tests/test_storage.py
+Unit tests for the blocklist and its stores: indexing, atomic writes, .bak
+recovery and coalescing.
+Every file is written to a temporary directory.
+"""
+
+import json
+from unittest.mock import patch
+
+from focus_mode_app.core import atomic_io, storage
+from focus_mode_app.core.blocklist import BlockList
+
+
+def test_blocklist_index_views_and_version():
+    """Lookups go through the index; views and versions follow every change."""
+    items = BlockList([{"name": "discord", "type": "app"}])
+    version = items.version
+
+    assert items.add("web.whatsapp.com", "webapp") is True
+    assert items.add("discord", "app") is False
+    assert items.version != version
+
+    # Reads never modify the list
+    version = items.version
+    assert items.names("app") == ["discord"]
+    assert items.names("webapp") == ["web.whatsapp.com"]
+    assert items.find("web.whatsapp.com").type == "webapp"
+    assert {"name": "discord", "type": "app"} in items
+    assert items.version == version
+
+    # The list-of-dicts API still works
+    items.append({"name": "slack", "type": "app"})
+    assert items[2]["name"] == "slack"
+    assert items.pop(0) == {"name": "discord", "type": "app"}
+    assert items.names("app") == ["slack"]
+    assert items.copy() == [
+        {"name": "web.whatsapp.com", "type": "webapp"},
+        {"name": "slack", "type": "app"},
+    ]
+    assert items == items.copy()
+
+
+def test_remove_by_name_uses_the_index(tmp_path):
+    """remove_blocked_item_by_name persists the removal of the named item."""
+    path = tmp_path / "blocked_apps.json"
+    with (
+        patch.object(storage, "get_data_file_path", return_value=path),
+        patch.object(storage, "blocked_items", BlockList()),
+        patch.object(storage, "JSON_WRITE_COALESCE_WINDOW", 0),
+        patch("focus_mode_app.core.blocker.request_scan"),
+    ):
+        storage.add_blocked_item("discord", "app")
+        storage.add_blocked_item("web.whatsapp.com", "webapp")
+
+        assert storage.remove_blocked_item_by_name("discord") is True
+        assert storage.remove_blocked_item_by_name("discord") is False
+        assert storage.get_blocked_apps() == []
+        assert json.loads(path.read_text()) == [
+            {"name": "web.whatsapp.com", "type": "webapp"}
+        ]
+
+
+def test_import_and_export_roundtrip(tmp_path, capsys):
+    """A text list is imported with one save and exported back as JSON."""
+    from focus_mode_app.cli import commands
+
+    source = tmp_path / "team.txt"
+    source.write_text(
+        "# shared list\nweb.whatsapp.com\n\ndiscord app\nweb.whatsapp.com\n"
+    )
+    exported = tmp_path / "export.json"
+
+    items = BlockList()
+    with (
+        patch.object(storage, "blocked_items", items),
+        patch.object(commands, "blocked_items", items),
+        patch.object(storage, "save_blocked_items") as mock_save,
+        patch("focus_mode_app.core.blocker.request_scan"),
+    ):
+        commands.cmd_import(str(source))
+        assert mock_save.call_count == 1
+        assert storage.get_blocked_webapps() == ["web.whatsapp.com"]
+        assert storage.get_blocked_apps() == ["discord"]
+
+        commands.cmd_export(str(exported))
+        assert json.loads(exported.read_text()) == items.copy()
+
+        # Replacing with the exported file changes nothing
+        commands.cmd_import(str(exported), replace=True)
+        assert items.copy() == json.loads(exported.read_text())
+
+
+def test_atomic_write_keeps_backup_and_recovers_corrupted_file(tmp_path):
+    """A corrupted store is restored from its .bak copy instead of being reset."""
+    path = tmp_path / "blocked_apps.json"
+
+    atomic_io.write_json_atomic(path, [{"name": "discord", "type": "app"}])
+    atomic_io.write_json_atomic(path, [{"name": "slack", "type": "app"}])
+
+    assert json.loads(atomic_io.backup_path(path).read_text()) == [
+        {"name": "discord", "type": "app"}
+    ]
+    # No temporary file is left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "blocked_apps.json",
+        "blocked_apps.json.bak",
+    ]
+
+    path.write_text('[{"name": "sla')
+    with (
+        patch.object(storage, "get_data_file_path", return_value=path),
+        patch.object(storage, "blocked_items", BlockList()),
+    ):
+        assert storage.load_blocked_items() is True
+        assert storage.blocked_items == [{"name": "discord", "type": "app"}]
+
+    # The main file was restored too
+    assert json.loads(path.read_text()) == [{"name": "discord", "type": "app"}]
+
+
+def test_atomic_write_keeps_file_permissions(tmp_path):
+    """Replacing a file keeps its mode; new files get the umask default."""
+    import os
+
+    path = tmp_path / "blocked_apps.json"
+    old_umask = os.umask(0o022)
+    try:
+        atomic_io.write_json_atomic(path, [])
+        assert path.stat().st_mode & 0o777 == 0o644
+
+        path.chmod(0o640)
+        atomic_io.write_json_atomic(path, [{"name": "discord", "type": "app"}])
+        assert path.stat().st_mode & 0o777 == 0o640
+
+        atomic_io.write_json_atomic(path, [], file_mode=0o600)
+        assert path.stat().st_mode & 0o777 == 0o600
+    finally:
+        os.umask(old_umask)
+
+
+def test_writes_within_the_window_are_coalesced(tmp_path):
+    """Only the first and the last of a burst of writes reach the disk."""
+    path = tmp_path / "restore_config.json"
+
+    with patch.object(
+        atomic_io, "write_text_atomic", wraps=atomic_io.write_text_atomic
+    ) as mock_write:
+        for i in range(10):
+            atomic_io.write_json_atomic(path, {"count": i}, coalesce=60)
+
+        assert mock_write.call_count == 1
+        assert json.loads(path.read_text()) == {"count": 0}
+
+        # Reading flushes the pending write first
+        assert atomic_io.read_json(path) == {"count": 9}
+        assert mock_write.call_count == 2
+
+
+def test_sqlite_backend_migrates_json_and_persists_edits(tmp_path):
+    """The first load imports the JSON files; later edits are single-row statements."""
+    from focus_mode_app.core import session, sqlite_store
+
+    data_file = tmp_path / "blocked_apps.json"
+    data_file.write_text(
+        json.dumps({"apps_native": ["discord"], "webapp_elements": []})
+    )
+    (tmp_path / "restore.json").write_text(
+        json.dumps({"discord": {"enabled": True, "added_at": 1.0}})
+    )
+
+    store = sqlite_store.SQLiteStore(tmp_path / "focus_mode.db")
+    with (
+        patch.object(sqlite_store, "STORAGE_BACKEND", "sqlite"),
+        patch.object(sqlite_store, "_store", store),
+        patch.object(storage, "get_data_file_path", return_value=data_file),
+        patch.object(storage, "blocked_items", BlockList()),
+        patch.object(session, "RESTORE_CONFIG_FILE", tmp_path / "restore.json"),
+        patch.object(session, "SESSION_FILE", tmp_path / "session_backup.json"),
+        patch.object(session, "SESSION_JOURNAL_FILE", tmp_path / "journal.jsonl"),
+    ):
+        assert storage.load_blocked_items() is True
+        assert storage.add_blocked_item("web.whatsapp.com", "webapp") is True
+        storage.remove_blocked_item(0)
+
+        tracker = session.SessionTracker()
+        tracker.add_killed_app("discord", {"name": "discord", "pid": 7})
+
+        # The JSON files are only read once: the database is the source of truth
+        data_file.unlink()
+        assert storage.load_blocked_items() is True
+        assert storage.blocked_items == [{"name": "web.whatsapp.com", "type": "webapp"}]
+        assert store.has_blocked_item("web.whatsapp.com", "webapp")
+
+        reloaded = session.SessionTracker()
+        assert reloaded.restore_list == {"discord": {"enabled": True, "added_at": 1.0}}
+        assert reloaded.load_session() == [
+            {"name": "discord", "pid": 7, "rule": "discord"}
+        ]
+        assert not (tmp_path / "journal.jsonl").exists()
+
+    store.close()